@@ -25,21 +25,34 @@
 # those of the authors and should not be interpreted as representing official
 # policies, either expressed or implied, of Matt Chaput.
 
+import re
+from functools import lru_cache
+from html import escape
 from textwrap import dedent
 
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name
-from pygments.formatters import HtmlFormatter
-from pygments.formatters.html import escape_html
-from pygments.style import Style
-from pygments.token import Keyword, Name, Comment, String, Error, \
-    Literal, Number, Operator, Other, Punctuation, Text, Generic, \
-    Whitespace
-from pygments.util import ClassNotFound
-
 from bookish import functions, util
 
 
+# Pygments is slow to import, so it is only imported by the functions below the
+# first time a code block is actually formatted, instead of whenever this
+# module is imported
+
+
+hl_lines_expr = re.compile(r"(\d+)(?:\s*-\s*(\d+))?")
+
+
+@lru_cache(maxsize=64)
+def _html_formatter(hl_lines=()):
+    # The formatter has no per-call state, so one instance per set of
+    # highlighted lines is shared by every call to format_string() instead of
+    # rebuilding its style tables for each block. nowrap=True leaves off the
+    # <div class="highlight"><pre> wrapper, since the caller supplies its own
+    # <pre> when it wants one
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter(nowrap=True, hl_lines=hl_lines)
+
+
 def jinja_format_code(block, lexername=None, pre=False, extras=None):
     from markupsafe import Markup
 
@@ -47,7 +60,15 @@ def jinja_format_code(block, lexername=None, pre=False, extras=None):
     return Markup(html)
 
 
+@lru_cache(maxsize=256)
 def lexer_for(name):
+    # Resolving a lexer by name scans Pygments' registry (and may import the
+    # lexer module), so the result -- including a miss -- is cached per name.
+    # The instance is shared, which is safe because highlight() keeps its
+    # tokenizing state in locals rather than on the lexer
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+
     try:
         lexer = get_lexer_by_name(name)
     except ClassNotFound:
@@ -55,6 +76,22 @@ def lexer_for(name):
     return lexer
 
 
+@lru_cache(maxsize=256)
+def parse_hl_lines(spec):
+    """
+    Takes a string such as ``"[1,2,5-7]"`` and returns a frozenset of the line
+    numbers it lists. A range such as ``5-7`` includes both ends.
+    """
+
+    lines = set()
+    for start, end in hl_lines_expr.findall(spec):
+        if end:
+            lines.update(range(int(start), int(end) + 1))
+        else:
+            lines.add(int(start))
+    return frozenset(lines)
+
+
 def format_block(block, lexername=None, lexer=None, pre=False, extras=None):
     attrs = block.get("attrs", {})
     source = functions.string(block.get("text", ""))
@@ -71,8 +108,7 @@ def format_block(block, lexername=None, lexer=None, pre=False, extras=None):
         look += " linenos"
 
     if "hl_lines" in attrs:
-        hl_lines = [int(n) for n
-                    in attrs["hl_lines"].strip("[]").split(",")]
+        hl_lines = parse_hl_lines(attrs["hl_lines"])
     else:
         hl_lines = None
 
@@ -81,14 +117,20 @@ def format_block(block, lexername=None, lexer=None, pre=False, extras=None):
 
 def format_string(source, lexername=None, lexer=None, look="",
                   hl_lines=None, pre=False):
+    from pygments import highlight
+
     source = dedent(source.strip("\r\n"))
     lexer = lexer or lexer_for(lexername)
     if lexer:
-        hi = highlight(source, lexer, HtmlFormatter())
-        hi = hi.removeprefix('<div class="highlight"><pre>')
-        hi = hi.removesuffix('</pre></div>\n')
+        formatter = _html_formatter(tuple(sorted(hl_lines or ())))
+        hi = highlight(source, lexer, formatter)
+    elif "<" in source or ">" in source or "&" in source:
+        # html.escape() is a few chained str.replace() calls, which is much
+        # faster than Pygments' translate()-based escape_html(). Quotes don't
+        # need escaping inside a <pre>
+        hi = escape(source, quote=False)
     else:
-        hi = escape_html(source)
+        hi = source
 
     if pre:
         hi = "<pre class='syntax %s'>%s</pre>" % (look, hi)
@@ -99,125 +141,153 @@ def format_string(source, lexername=None, lexer=None, look="",
 # Command line colors
 
 def code_chars(code):
-    return "\033[%sm" % str(code)
+    return "\033[%sm" % code
 
 
 class Ansi(object):
-    black = code_chars(30)
-    red = code_chars(31)
-    green = code_chars(32)
-    yellow = code_chars(33)
-    blue = code_chars(34)
-    magenta = code_chars(35)
-    cyan = code_chars(36)
-    white = code_chars(37)
-    reset = code_chars(39)
-
-    black_back = code_chars(40)
-    red_back = code_chars(41)
-    green_back = code_chars(42)
-    yellow_back = code_chars(43)
-    blue_back = code_chars(44)
-    magenta_back = code_chars(45)
-    cyan_back = code_chars(46)
-    white_back = code_chars(47)
-    reset_back = code_chars(49)
-
-    bright = code_chars(1)
-    dim = code_chars(2)
-    normal = code_chars(22)
-    reset_all = code_chars(0)
+    black = "\033[30m"
+    red = "\033[31m"
+    green = "\033[32m"
+    yellow = "\033[33m"
+    blue = "\033[34m"
+    magenta = "\033[35m"
+    cyan = "\033[36m"
+    white = "\033[37m"
+    reset = "\033[39m"
+
+    black_back = "\033[40m"
+    red_back = "\033[41m"
+    green_back = "\033[42m"
+    yellow_back = "\033[43m"
+    blue_back = "\033[44m"
+    magenta_back = "\033[45m"
+    cyan_back = "\033[46m"
+    white_back = "\033[47m"
+    reset_back = "\033[49m"
+
+    bright = "\033[1m"
+    dim = "\033[2m"
+    normal = "\033[22m"
+    reset_all = "\033[0m"
 
 
 def cstring(code, string):
-    return code + string + Ansi.reset_all
-
-
-class DraculaStyle(Style):
-    background_color = "#282a36"
-    default_style = ""
-
-    styles = {
-        Comment: "#6272a4",
-        Comment.Hashbang: "#6272a4",
-        Comment.Multiline: "#6272a4",
-        Comment.Preproc: "#ff79c6",
-        Comment.Single: "#6272a4",
-        Comment.Special: "#6272a4",
-
-        Generic: "#f8f8f2",
-        Generic.Deleted: "#8b080b",
-        Generic.Emph: "#f8f8f2 underline",
-        Generic.Error: "#f8f8f2",
-        Generic.Heading: "#f8f8f2 bold",
-        Generic.Inserted: "#f8f8f2 bold",
-        Generic.Output: "#44475a",
-        Generic.Prompt: "#f8f8f2",
-        Generic.Strong: "#f8f8f2",
-        Generic.Subheading: "#f8f8f2 bold",
-        Generic.Traceback: "#f8f8f2",
-
-        Error: "#f8f8f2",
-
-        Keyword: "#ff79c6",
-        Keyword.Constant: "#ff79c6",
-        Keyword.Declaration: "#8be9fd italic",
-        Keyword.Namespace: "#ff79c6",
-        Keyword.Pseudo: "#ff79c6",
-        Keyword.Reserved: "#ff79c6",
-        Keyword.Type: "#8be9fd",
-
-        Literal: "#f8f8f2",
-        Literal.Date: "#f8f8f2",
-
-        Name: "#f8f8f2",
-        Name.Attribute: "#50fa7b",
-        Name.Builtin: "#8be9fd italic",
-        Name.Builtin.Pseudo: "#f8f8f2",
-        Name.Class: "#50fa7b",
-        Name.Constant: "#f8f8f2",
-        Name.Decorator: "#f8f8f2",
-        Name.Entity: "#f8f8f2",
-        Name.Exception: "#f8f8f2",
-        Name.Function: "#50fa7b",
-        Name.Label: "#8be9fd italic",
-        Name.Namespace: "#f8f8f2",
-        Name.Other: "#f8f8f2",
-        Name.Tag: "#ff79c6",
-        Name.Variable: "#8be9fd italic",
-        Name.Variable.Class: "#8be9fd italic",
-        Name.Variable.Global: "#8be9fd italic",
-        Name.Variable.Instance: "#8be9fd italic",
-
-        Number: "#bd93f9",
-        Number.Bin: "#bd93f9",
-        Number.Float: "#bd93f9",
-        Number.Hex: "#bd93f9",
-        Number.Integer: "#bd93f9",
-        Number.Integer.Long: "#bd93f9",
-        Number.Oct: "#bd93f9",
-
-        Operator: "#ff79c6",
-        Operator.Word: "#ff79c6",
-
-        Other: "#f8f8f2",
-
-        Punctuation: "#f8f8f2",
-
-        String: "#f1fa8c",
-        String.Backtick: "#f1fa8c",
-        String.Char: "#f1fa8c",
-        String.Doc: "#f1fa8c",
-        String.Double: "#f1fa8c",
-        String.Escape: "#f1fa8c",
-        String.Heredoc: "#f1fa8c",
-        String.Interpol: "#f1fa8c",
-        String.Other: "#f1fa8c",
-        String.Regex: "#f1fa8c",
-        String.Single: "#f1fa8c",
-        String.Symbol: "#f1fa8c",
-
-        Text: "#f8f8f2",
-
-        Whitespace: "#f8f8f2"
-    }
+    return "%s%s\033[0m" % (code, string)
+
+
+def __getattr__(name):
+    # DraculaStyle subclasses a Pygments class, so it is only created the first
+    # time something asks this module for it
+    if name == "DraculaStyle":
+        style = globals()["DraculaStyle"] = _dracula_style()
+        return style
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+# Dracula palette entries shared by many token types in DraculaStyle.styles
+_FOREGROUND = "#f8f8f2"
+_COMMENT = "#6272a4"
+_STRING = "#f1fa8c"
+_NUMBER = "#bd93f9"
+_KEYWORD = "#ff79c6"
+_GREEN = "#50fa7b"
+_CYAN_ITALIC = "#8be9fd italic"
+
+
+def _dracula_style():
+    from pygments.style import Style
+    from pygments.token import Keyword, Name, Comment, String, Error, \
+        Literal, Number, Operator, Other, Punctuation, Text, Generic, \
+        Whitespace
+
+    class DraculaStyle(Style):
+        background_color = "#282a36"
+        default_style = ""
+
+        styles = {
+            Comment: _COMMENT,
+            Comment.Hashbang: _COMMENT,
+            Comment.Multiline: _COMMENT,
+            Comment.Preproc: _KEYWORD,
+            Comment.Single: _COMMENT,
+            Comment.Special: _COMMENT,
+
+            Generic: _FOREGROUND,
+            Generic.Deleted: "#8b080b",
+            Generic.Emph: "#f8f8f2 underline",
+            Generic.Error: _FOREGROUND,
+            Generic.Heading: "#f8f8f2 bold",
+            Generic.Inserted: "#f8f8f2 bold",
+            Generic.Output: "#44475a",
+            Generic.Prompt: _FOREGROUND,
+            Generic.Strong: _FOREGROUND,
+            Generic.Subheading: "#f8f8f2 bold",
+            Generic.Traceback: _FOREGROUND,
+
+            Error: _FOREGROUND,
+
+            Keyword: _KEYWORD,
+            Keyword.Constant: _KEYWORD,
+            Keyword.Declaration: _CYAN_ITALIC,
+            Keyword.Namespace: _KEYWORD,
+            Keyword.Pseudo: _KEYWORD,
+            Keyword.Reserved: _KEYWORD,
+            Keyword.Type: "#8be9fd",
+
+            Literal: _FOREGROUND,
+            Literal.Date: _FOREGROUND,
+
+            Name: _FOREGROUND,
+            Name.Attribute: _GREEN,
+            Name.Builtin: _CYAN_ITALIC,
+            Name.Builtin.Pseudo: _FOREGROUND,
+            Name.Class: _GREEN,
+            Name.Constant: _FOREGROUND,
+            Name.Decorator: _FOREGROUND,
+            Name.Entity: _FOREGROUND,
+            Name.Exception: _FOREGROUND,
+            Name.Function: _GREEN,
+            Name.Label: _CYAN_ITALIC,
+            Name.Namespace: _FOREGROUND,
+            Name.Other: _FOREGROUND,
+            Name.Tag: _KEYWORD,
+            Name.Variable: _CYAN_ITALIC,
+            Name.Variable.Class: _CYAN_ITALIC,
+            Name.Variable.Global: _CYAN_ITALIC,
+            Name.Variable.Instance: _CYAN_ITALIC,
+
+            Number: _NUMBER,
+            Number.Bin: _NUMBER,
+            Number.Float: _NUMBER,
+            Number.Hex: _NUMBER,
+            Number.Integer: _NUMBER,
+            Number.Integer.Long: _NUMBER,
+            Number.Oct: _NUMBER,
+
+            Operator: _KEYWORD,
+            Operator.Word: _KEYWORD,
+
+            Other: _FOREGROUND,
+
+            Punctuation: _FOREGROUND,
+
+            String: _STRING,
+            String.Backtick: _STRING,
+            String.Char: _STRING,
+            String.Doc: _STRING,
+            String.Double: _STRING,
+            String.Escape: _STRING,
+            String.Heredoc: _STRING,
+            String.Interpol: _STRING,
+            String.Other: _STRING,
+            String.Regex: _STRING,
+            String.Single: _STRING,
+            String.Symbol: _STRING,
+
+            Text: _FOREGROUND,
+
+            Whitespace: _FOREGROUND
+        }
+
+    DraculaStyle.__qualname__ = "DraculaStyle"
+    return DraculaStyle
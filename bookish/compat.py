@@ -1,20 +1,21 @@
 import array
-import sys
-
-import collections
+import types
+from abc import abstractmethod
+from functools import partial
+from itertools import permutations, zip_longest as izip_longest
+from operator import methodcaller
 
 def b(s):
     return s.encode("latin-1")
 
 import io
 BytesIO = io.BytesIO
-callable = lambda o: isinstance(o, collections.Callable)
+callable = callable
 exec_ = eval("exec")
 integer_types = (int,)
-iteritems = lambda o: o.items()
-itervalues = lambda o: o.values()
-iterkeys = lambda o: iter(o.keys())
-izip = zip
+iteritems = methodcaller("items")
+itervalues = methodcaller("values")
+iterkeys = methodcaller("keys")
 long_type = int
 next = next
 import pickle
@@ -29,14 +30,11 @@ import configparser
 import html.parser as htmlparser
 import urllib.parse as urlparse
 
-def config_get(config, section, name, fallback=None):
-    return config.get(section, name, fallback=fallback)
-
-def config_getboolean(config, section, name, fallback=False):
-    return config.getboolean(section, name, fallback=fallback)
-
-def config_getint(config, section, name, fallback=0):
-    return config.getint(section, name, fallback=fallback)
+# These take the parser as the first argument and supply a default fallback
+config_get = partial(configparser.RawConfigParser.get, fallback=None)
+config_getboolean = partial(configparser.RawConfigParser.getboolean,
+                            fallback=False)
+config_getint = partial(configparser.RawConfigParser.getint, fallback=0)
 
 def byte(num):
     return bytes((num,))
@@ -47,120 +45,23 @@ def u(s):
     return s
 
 def with_metaclass(meta, base=object):
-    ns = dict(base=base, meta=meta)
-    exec_("""class _WhooshBase(base, metaclass=meta):
-pass""", ns)
-    return ns["_WhooshBase"]
+    return types.new_class("_WhooshBase", (base,), {"metaclass": meta})
 
 xrange = range
 range = range
 zip_ = lambda * args: list(zip(*args))
 
-def memoryview_(source, offset=None, length=None):
+def memoryview_(source, offset=0, length=None):
     mv = memoryview(source)
-    if offset or length:
-        return mv[offset:offset + length]
-    else:
-        return mv
+    if length is None:
+        return mv[offset:] if offset else mv
+    return mv[offset:offset + length]
 
 from textwrap import indent
 from html import escape as htmlescape
 
-try:
-    from time import perf_counter
-except ImportError:
-    if sys.platform == 'win32':
-        from time import clock as perf_counter
-    else:
-        from time import time as perf_counter
-
-
-if hasattr(array.array, "tobytes"):
-    def array_tobytes(arry):
-        return arry.tobytes()
-
-    def array_frombytes(arry, bs):
-        return arry.frombytes(bs)
-else:
-    def array_tobytes(arry):
-        return arry.tostring()
-
-    def array_frombytes(arry, bs):
-        return arry.fromstring(bs)
-
-
-# Implementations missing from older versions of Python
-
-try:
-    from itertools import permutations  # @UnusedImport
-except ImportError:
-    # Python 2.5
-    def permutations(iterable, r=None):
-        pool = tuple(iterable)
-        n = len(pool)
-        r = n if r is None else r
-        if r > n:
-            return
-        indices = range(n)
-        cycles = range(n, n - r, -1)
-        yield tuple(pool[i] for i in indices[:r])
-        while n:
-            for i in reversed(range(r)):
-                cycles[i] -= 1
-                if cycles[i] == 0:
-                    indices[i:] = indices[i + 1:] + indices[i:i + 1]
-                    cycles[i] = n - i
-                else:
-                    j = cycles[i]
-                    indices[i], indices[-j] = indices[-j], indices[i]
-                    yield tuple(pool[i] for i in indices[:r])
-                    break
-            else:
-                return
-
-
-try:
-    # Python 2.6-2.7
-    from itertools import izip_longest  # @UnusedImport
-except ImportError:
-    try:
-        # Python 3.0
-        from itertools import zip_longest as izip_longest  # @UnusedImport
-    except ImportError:
-        # Python 2.5
-        from itertools import chain, izip, repeat
-
-        def izip_longest(*args, **kwds):
-            fillvalue = kwds.get('fillvalue')
-
-            def sentinel(counter=([fillvalue] * (len(args) - 1)).pop):
-                yield counter()
-
-            fillers = repeat(fillvalue)
-            iters = [chain(it, sentinel(), fillers) for it in args]
-            try:
-                for tup in izip(*iters):
-                    yield tup
-            except IndexError:
-                pass
-
-
-try:
-    from operator import methodcaller  # @UnusedImport
-except ImportError:
-    # Python 2.5
-    def methodcaller(name, *args, **kwargs):
-        def caller(obj):
-            return getattr(obj, name)(*args, **kwargs)
-        return caller
+from time import perf_counter
 
 
-try:
-    from abc import abstractmethod  # @UnusedImport
-except ImportError:
-    # Python 2.5
-    def abstractmethod(funcobj):
-        """A decorator indicating abstract methods.
-        """
-        funcobj.__isabstractmethod__ = True
-        return funcobj
+array_tobytes = array.array.tobytes
+array_frombytes = array.array.frombytes
@@ -1,28 +1,33 @@
 import os.path
 import sys
+from functools import lru_cache
 
 from bookish import search
 from bookish.text import textify
 
 
 this_dir = os.path.abspath(os.path.dirname(__file__))
+_python_version = "%s.%s" % (sys.version_info.major, sys.version_info.minor)
 
 
+# The expansion depends on the environment, so read_config() clears this cache
+# in case variables have changed since the last time the config was read
+@lru_cache(maxsize=256)
 def expandpath(path):
-    path = path.replace("${PYTHON_VERSION}", "%s.%s" %
-                        (sys.version_info.major, sys.version_info.minor))
+    path = path.replace("${PYTHON_VERSION}", _python_version)
     return os.path.expanduser(os.path.expandvars(path))
 
 
 def read_config(cfg=None, config_file=None, root_path=".", config_obj=None):
     from bookish.wiki import config
-    from bookish.stores import expandpath
+    from bookish import stores
 
+    expandpath.cache_clear()
     cfg = cfg or config.Config(root_path)
     cfg.from_object(config_obj or DefaultConfig)
 
     if config_file:
-        config_file = expandpath(config_file, root_path=root_path)
+        config_file = stores.expandpath(config_file, root_path=root_path)
         cfg.from_pyfile(config_file)
 
     cfg.from_envvar("BOOKISH_CONFIG", silent=True)
@@ -73,6 +78,8 @@ class DefaultConfig(object):
 
     # Directory of SCSS files to compile into CSS
     SCSS_ASSET_DIR = "/static/scss/"
+    # Minimum number of seconds between checks for changed SCSS files
+    SCSS_CHECK_INTERVAL = 1.0
 
     # True if documents should be editable in the browser
     EDITABLE = False
@@ -90,6 +97,11 @@ class DefaultConfig(object):
     PAGES_CLASS = "bookish.wiki.wikipages.WikiPages"
     # A system file path to a directory in which to store cache files
     CACHE_DIR = "./cache"
+    # A system file path to a directory in which to store compiled Jinja
+    # templates between runs (None to only cache them in memory)
+    JINJA_CACHE_DIR = None
+    # Number of rendered wiki pages to keep in memory (0 to turn off)
+    HTML_CACHE_SIZE = 512
 
     # A system file path to a directory in which to store the full-text index
     INDEX_DIR = "./index"
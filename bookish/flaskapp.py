@@ -28,17 +28,20 @@
 from __future__ import print_function
 import os
 import datetime
+import io
 import mimetypes
 import sys
 import threading
-import time
 import traceback
+from functools import lru_cache
+from html import escape
 
 import flask
 
 import werkzeug.exceptions
 
 from bookish import compat, paths, i18n, stores, util
+from bookish.coloring import format_string
 from bookish.edit.checkpoints import Checkpoints
 from bookish.wiki import langpaths, wikipages
 
@@ -49,8 +52,12 @@ bookishapp = flask.Flask(__name__, static_folder=None, static_url_path=None)
 extra_types = {
     "bkgrammar": "text/plain",
 }
+for _ext, _mimetype in extra_types.items():
+    mimetypes.add_type(_mimetype, "." + _ext)
 
 indexing_thread = threading.Thread()
+# Held while this process is updating the search index
+updatelock = threading.Lock()
 
 
 ICONS_PATH = "/icons/"
@@ -62,37 +69,123 @@ def after_request(response):
     return response
 
 
-def send_file_partial(path, conditional):
+@lru_cache(maxsize=1024)
+def _guess_type(suffix):
+    return mimetypes.guess_type("x" + suffix)
+
+
+def guess_mimetype(path):
+    """
+    Returns a (mimetype, encoding) tuple for the given path, like
+    ``mimetypes.guess_type()``, but caches the result by the file's suffix.
+    """
+
+    name = os.path.basename(path)
+    dot = name.find(".")
+    return _guess_type(name[dot:] if dot >= 0 else "")
+
+
+def send_file_partial(path, conditional, byterange=None, size=None):
     """
     Simple wrapper around send_file which handles HTTP 206 Partial Content
-    (byte ranges)
+    (byte ranges). If the caller has already looked at the request's byte
+    range or the file's size, it can pass them in as ``byterange`` and
+    ``size``.
     TODO: handle all send_file args, mirror send_file's error handling
     (if it has any)
     """
 
-    byterange = flask.request.range
-    if not byterange:
+    if byterange is None:
+        byterange = flask.request.range
+    if not byterange or flask.current_app.config.get("USE_X_SENDFILE"):
+        # If the app is configured to use X-Sendfile, the front-end server
+        # serves the file (including any byte range) straight from disk
         return flask.send_file(path, conditional=conditional)
 
-    size = os.path.getsize(path)
-    mimetype = mimetypes.guess_type(path)[0]
-    with open(path, 'rb') as f:
-        return send_fileobj_partial(f, size, mimetype, conditional)
+    if size is None:
+        size = os.path.getsize(path)
+    # Check the range before opening the file, so an unsatisfiable range
+    # doesn't leave a file open
+    range_bounds(byterange, size)
+    mimetype = guess_mimetype(path)[0]
+    f = open(path, 'rb')
+    return send_fileobj_partial(f, size, mimetype, conditional, byterange)
 
 
-def send_fileobj_partial(f, size, mimetype, conditional):
-    byterange = flask.request.range
-    if not byterange:
-        return flask.send_file(f, conditional=conditional, mimetype=mimetype)
+def range_bounds(byterange, size):
+    """
+    Returns a (start, end) tuple of the given byte range for a file of the
+    given size, or raises a "416 Range Not Satisfiable" exception if the range
+    doesn't fit in the file.
+    """
+
+    bounds = byterange.range_for_length(size)
+    if bounds is None:
+        raise werkzeug.exceptions.RequestedRangeNotSatisfiable(length=size)
+    return bounds
 
-    import zipfile
 
-    start, end = byterange.range_for_length(size)
-    f.seek(start)
-    data = f.read(end - start)
+def iter_file_range(f, start, length, chunk_size=65536):
+    """
+    Yields ``length`` bytes (or until the end of the file) from the given file
+    object, starting at offset ``start``, in chunks of at most ``chunk_size``
+    bytes. This doesn't close the file, since the generator may never run.
+    """
 
-    rv = flask.Response(data, 206, mimetype=mimetype, direct_passthrough=True)
-    rv.content_range = byterange.make_content_range(size)
+    # If this is a real OS file, read with pread() so we don't need to seek
+    # and don't go through the file object's buffering. Only do this for plain
+    # files: wrappers such as GzipFile have a fileno() that refers to the
+    # underlying (compressed) file
+    fd = None
+    if hasattr(os, "pread") and isinstance(getattr(f, "raw", f), io.FileIO):
+        fd = f.fileno()
+
+    if fd is None:
+        f.seek(start)
+    while length > 0:
+        size = min(chunk_size, length)
+        if fd is None:
+            data = f.read(size)
+        else:
+            data = os.pread(fd, size, start)
+        if not data:
+            break
+        start += len(data)
+        length -= len(data)
+        yield data
+
+
+def send_fileobj_partial(f, size, mimetype, conditional, byterange=None):
+    """
+    Returns a response for the contents of the given open file object,
+    handling HTTP 206 Partial Content. The response takes over the file and
+    closes it when the response is closed. If this function raises an
+    exception, it closes the file before raising.
+    """
+
+    try:
+        if byterange is None:
+            byterange = flask.request.range
+        if not byterange:
+            return flask.send_file(f, conditional=conditional,
+                                   mimetype=mimetype)
+
+        start, end = range_bounds(byterange, size)
+
+        # Stream the range instead of reading it all into memory at once
+        rv = flask.Response(iter_file_range(f, start, end - start), 206,
+                            mimetype=mimetype)
+        rv.content_length = end - start
+        rv.content_range = byterange.make_content_range(size)
+    except Exception:
+        f.close()
+        raise
+
+    # Close the file when the response is closed, even if the response is
+    # never iterated (for example a HEAD request, or the client went away).
+    # This is why the response doesn't use direct_passthrough: werkzeug
+    # doesn't call the response's close callbacks in that mode
+    rv.call_on_close(f.close)
     return rv
 
 
@@ -124,21 +217,15 @@ def is_unconditional():
 
 def directory_list(pages, dirpath):
     store = pages.store
-    names = store.list_dir(dirpath)
     files = []
 
-    for name in names:
+    # Get the information for all the files at once instead of asking the
+    # store about each file separately
+    for name, isdir, size, mod in store.scan_dir(dirpath):
         path = paths.join(dirpath, name)
         link = path
         if pages.is_wiki(link):
             link = paths.basepath(link)
-        isdir = store.is_dir(path)
-        if isdir:
-            size = -1
-            mod = -1
-        else:
-            size = store.size(path)
-            mod = store.last_modified(path)
 
         files.append({
             "path": path,
@@ -205,15 +292,19 @@ def page_not_found(exception):
     return content, 404
 
 
+@lru_cache(maxsize=64)
+def _format_trace(trace):
+    # Repeated errors usually produce identical tracebacks, so cache the
+    # highlighted HTML instead of re-running the lexer for each one
+    return format_string(trace, "pytb")
+
+
 @bookishapp.errorhandler(500)
 def internal_error(exception):
-    from bookish.coloring import format_string
-
     path = flask.request.path
 
     pages = get_wikipages()
-    trace = traceback.format_exc()
-    trace = format_string(trace, "pytb")
+    trace = _format_trace(traceback.format_exc())
 
     content = pages.render_template('500.jinja2', path=path, trace=trace,
                                     rel=null_rel, num=500)
@@ -226,6 +317,7 @@ def internal_error(exception):
 @bookishapp.route("/<path:path>")
 def show(path):
     request = flask.request
+    args = request.args
     config = flask.current_app.config
 
     pages = get_wikipages()
@@ -233,14 +325,18 @@ def show(path):
 
     store = pages.store
     path = paths.normalize("/" + path)
-    pathexists = store.exists(path)
-    spath = pages.source_path(path)
+    # Get whether the path exists, whether it's a directory, and its size and
+    # modification time from the store all at once
+    pathstat = store.stat(path)
+    pathexists = pathstat is not None
+    isdir = pathexists and pathstat[0]
     cond = not is_unconditional()
-    isdir = pathexists and store.is_dir(path)
 
+    if isdir and not path.endswith("/"):
+        return flask.redirect(path + "/", 302)
+
+    spath = get_source_path(pages, path)
     if isdir:
-        if not path.endswith("/"):
-            return flask.redirect(path + "/", 302)
         if not store.exists(spath):
             return directory_page(pages, path)
 
@@ -250,18 +346,28 @@ def show(path):
         return flask.redirect(rpath, 302)
 
     if pathexists and not isdir:
+        byterange = request.range
         fpath = store.file_path(path)
         if fpath:
-            return send_file_partial(fpath, cond)
+            return send_file_partial(fpath, cond, byterange, pathstat[1])
         else:
             try:
-                size = store.size(path)
-                mimetype, encoding = mimetypes.guess_type(path)
+                # Make the etag from the size and modification time, and check
+                # it before opening the file so a cached copy costs no I/O
+                _, size, lastmod = pathstat
+                etag = "%x-%x" % (size, int(lastmod.timestamp() * 1000000))
+                if cond and etag in request.if_none_match:
+                    raise NotModified()
+
+                if byterange:
+                    range_bounds(byterange, size)
+
+                mimetype, encoding = guess_mimetype(path)
                 f = pages.store.open(path)
                 if hasattr(f, "name"):
                     f.name = None
-                resp = send_fileobj_partial(f, size, mimetype, cond)
-                etag = "%s.%s" % (path, str(store.last_modified(path)))
+                resp = send_fileobj_partial(f, size, mimetype, cond,
+                                            byterange)
                 resp.set_etag(etag)
                 return resp
             except stores.ResourceNotFoundError:
@@ -277,32 +383,45 @@ def show(path):
         try:
             indexer = pages.indexer()
             searcher = None
-            if request.args.get("searcher") != "no":
+            if args.get("searcher") != "no":
                 searcher = indexer.searcher()
 
-            if request.args.get("format") == "simple":
+            if args.get("format") == "simple":
                 templatepath = "/templates/plain.jinja2"
                 stylespath = "/templates/tooltip.jinja2"
             else:
-                templatepath = request.args.get("template")
-                stylespath = request.args.get("styles")
+                templatepath = args.get("template")
+                stylespath = args.get("styles")
 
             extras = {
                 "editable": editable,
-                "q": request.args.get('q', ''),
+                "q": args.get('q', ''),
                 "pagelang": pagelang,
             }
 
-            # NOTE: redirection is NOT actually handled here currently. Instead
-            # the template adds a <meta> tag to do the redirection, so it works
-            # on the website.
-            try:
-                html = pages.html(path, conditional=cond, searcher=searcher,
-                                  extras=extras, allow_redirect=False,
-                                  templatename=templatepath,
-                                  stylename=stylespath)
-            except wikipages.Redirect as e:
-                return flask.redirect(e.newpath, 302)
+            # Reuse the HTML from an earlier request if the source hasn't
+            # changed (the etag changes when the source file changes)
+            htmlcache = get_html_cache()
+            key = None
+            if htmlcache is not None and etag:
+                key = (spath, etag, templatepath, stylespath, pagelang,
+                       extras["q"], editable, searcher is None)
+            html = htmlcache.get(key) if key and cond else None
+
+            if html is None:
+                # NOTE: redirection is NOT actually handled here currently.
+                # Instead the template adds a <meta> tag to do the
+                # redirection, so it works on the website.
+                try:
+                    html = pages.html(path, conditional=cond,
+                                      searcher=searcher, extras=extras,
+                                      allow_redirect=False,
+                                      templatename=templatepath,
+                                      stylename=stylespath)
+                except wikipages.Redirect as e:
+                    return flask.redirect(e.newpath, 302)
+                if key:
+                    htmlcache.put(key, html)
 
             resp = flask.Response(html)
             if etag:
@@ -345,8 +464,9 @@ def icon_list():
 @bookishapp.route("/_search")
 def search_page():
     request = flask.request
+    args = request.args
     config = flask.current_app.config
-    resp_type = request.args.get("type", "html")
+    resp_type = args.get("type", "html")
 
     pages = get_wikipages()
     indexer = pages.indexer()
@@ -362,15 +482,15 @@ def search_page():
     shortcuts = list(config.get("SHORTCUTS", ()))
     shortcuts.extend(config.get("EXTRA_SHORTCUTS", ()))
 
-    qstring = request.args.get("q", "")
-    permanent = request.args.get("permanent") == "true"
-    # startpos = request.args.get("startpos", "")
-    # endpos = request.args.get("endpos", "")
-    category = request.args.get("category")
-    require = request.args.get("require")
-    pagelang = request.args.get("lang")
-    sequence = int(request.args.get("sequence", "0"))
-    templatepath = request.args.get("template", config["SEARCH_TEMPLATE"])
+    qstring = args.get("q", "")
+    permanent = args.get("permanent") == "true"
+    # startpos = args.get("startpos", "")
+    # endpos = args.get("endpos", "")
+    category = args.get("category")
+    require = args.get("require")
+    pagelang = args.get("lang")
+    sequence = int(args.get("sequence", "0"))
+    templatepath = args.get("template", config["SEARCH_TEMPLATE"])
 
     r = qobj.results(pages, qstring, cat_order, category=category,
                      require=require, shortcuts=shortcuts, lang=pagelang,
@@ -389,10 +509,8 @@ def field_contents(name):
     pages = get_wikipages()
     indexer = pages.indexer()
     searcher = indexer.searcher()
-    terms = []
-    for x in searcher.searcher.reader().field_terms(name):
-        terms.append("<li>%s</li>" % repr(x))
-    return "".join(terms)
+    terms = searcher.searcher.reader().field_terms(name)
+    return "".join(["<li>%s</li>" % escape(str(x)) for x in terms])
 
 
 @bookishapp.route("/_toc/<path:path>")
@@ -410,7 +528,7 @@ def toc_page(path):
     basepath = request.args.get("base", path)
     template = request.args.get("template", "plain.jinja2")
 
-    spath = pages.source_path(pagepath)
+    spath = get_source_path(pages, pagepath)
     if pages.exists(spath):
         json = pages.json(spath, searcher=searcher)
         subtopics = functions.subblock_by_id(json, "subtopics")
@@ -441,10 +559,12 @@ def list_dir():
     if pages.store.exists(dirpath) and pages.store.is_dir(dirpath):
         files = directory_list(pages, dirpath)
 
+        # Convert the stores' naive UTC datetimes to POSIX timestamps
+        utc = datetime.timezone.utc
         for file in files:
             d = file.get("modified")
             if d and isinstance(d, datetime.datetime):
-                file["modified"] = time.mktime(d.timetuple())
+                file["modified"] = d.replace(tzinfo=utc).timestamp()
 
         return flask.jsonify({
             "files": files,
@@ -463,13 +583,12 @@ def edit_wiki(path):
     #     flask.abort(500)
 
     path = paths.normalize("/" + path)
-    path = pages.source_path(path)
+    path = get_source_path(pages, path)
     if paths.extension(path) != config["WIKI_EXT"]:
         # TODO: better error here!
         flask.abort(500)
 
-    userid = get_request_userid()
-    cp = Checkpoints(userid, pages.store, pages.cache_store())
+    cp = get_checkpoints(pages, pages.store)
 
     from_autosave = False
     if pages.exists(path):
@@ -514,15 +633,12 @@ def preview_wiki():
     last_autosave = 0
     if autosave:
         session = flask.session
-        userid = get_request_userid()
-
         if "last_autosave" in session:
             last_autosave = session.get("last_autosave")
         else:
             last_autosave = datetime.datetime.utcnow()
 
-        edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
-        cp = Checkpoints(userid, edit_store, pages.cachestore)
+        cp = get_checkpoints(pages, get_edit_store())
         now = datetime.datetime.utcnow()
         if now - last_autosave >= datetime.timedelta(seconds=autosave_seconds):
             cp.autosave(path, source)
@@ -541,7 +657,7 @@ def load_wiki():
     request = flask.request
     config = flask.current_app.config
     pages = get_wikipages()
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
+    edit_store = get_edit_store()
     path = request.args["path"]
 
     exists = pages.store.exists(path)
@@ -550,7 +666,7 @@ def load_wiki():
     else:
         source = ""
 
-    cp = Checkpoints(get_request_userid(), edit_store, pages.cachestore)
+    cp = get_checkpoints(pages, edit_store)
     if exists and cp.has_autosave_after(path, pages.last_modified(path)):
         has_autosave = True
         autosave = cp.get_autosave(path)
@@ -578,17 +694,12 @@ def list_wiki_forms():
 @bookishapp.route("/_save/", methods=["PUT"])
 def save_wiki():
     request = flask.request
-    config = flask.current_app.config
-    maxnum = config.get("CHECKPOINT_MAX", 10)
-
     pages = get_wikipages()
     path = request.form["path"]
     source = request.form["source"]
     # encoding = request.form.get("encoding", "utf8")
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
-    userid = get_request_userid()
-    cp = Checkpoints(userid, edit_store, pages.cachestore, maxnum)
+    cp = get_checkpoints(pages, get_edit_store())
     cp.save_checkpoint(path, source, encoding="utf8")
     return source
 
@@ -599,7 +710,7 @@ def new_dir():
     config = flask.current_app.config
     path = request.form["path"]
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
+    edit_store = get_edit_store()
     if edit_store.writable(path):
         edit_store.make_dir(path)
         return '', 204
@@ -610,16 +721,12 @@ def new_dir():
 @bookishapp.route("/_move/", methods=["PUT"])
 def move_wiki():
     request = flask.request
-    config = flask.current_app.config
-    maxnum = config.get("CHECKPOINT_MAX", 10)
-
     pages = get_wikipages()
     path = request.form["path"]
     newpath = request.form["newpath"]
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
-    userid = get_request_userid()
-    cp = Checkpoints(userid, edit_store, pages.cachestore, maxnum)
+    edit_store = get_edit_store()
+    cp = get_checkpoints(pages, edit_store)
     if edit_store.writable(newpath):
         edit_store.move(path, newpath)
         cp.move_checkpoints(path, newpath)
@@ -631,16 +738,13 @@ def move_wiki():
 @bookishapp.route("/_delete/", methods=["PUT"])
 def delete_wiki():
     request = flask.request
-    config = flask.current_app.config
     path = request.form["path"]
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
+    edit_store = get_edit_store()
     if edit_store.writable(path):
         pages = get_wikipages()
-        maxnum = config.get("CHECKPOINT_MAX", 10)
         edit_store.delete(path)
-        cp = Checkpoints(get_request_userid(), edit_store, pages.cachestore,
-                         maxnum)
+        cp = get_checkpoints(pages, edit_store)
         cp.delete_checkpoints(path)
         return '', 204
 
@@ -650,13 +754,10 @@ def delete_wiki():
 @bookishapp.route("/_list_checkpoints/", methods=["GET"])
 def list_checkpoints():
     request = flask.request
-    config = flask.current_app.config
     pages = get_wikipages()
-    maxnum = config.get("CHECKPOINT_MAX", 10)
     path = request.args["path"]
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
-    cp = Checkpoints(get_request_userid(), edit_store, pages.cachestore, maxnum)
+    cp = get_checkpoints(pages, get_edit_store())
     return flask.jsonify({
         "checkpoints": cp.checkpoints(path)
     })
@@ -665,14 +766,11 @@ def list_checkpoints():
 @bookishapp.route("/_load_checkpoint/", methods=["GET"])
 def load_checkpoint():
     request = flask.request
-    config = flask.current_app.config
     pages = get_wikipages()
     path = request.args["path"]
     cpid = request.args["id"]
 
-    edit_store = stores.store_from_spec(config.get("EDIT_STORE"))
-    userid = get_request_userid()
-    cp = Checkpoints(userid, edit_store, pages.cachestore)
+    cp = get_checkpoints(pages, get_edit_store())
     return cp.load_checkpoint(path, cpid, encoding="utf8")
 
 
@@ -683,7 +781,7 @@ def debug_tooltip(path):
     searcher = indexer.searcher()
 
     path = paths.normalize("/" + path)
-    path = pages.source_path(path)
+    path = get_source_path(pages, path)
 
     html = pages.html(
         path, templatename="/templates/plain.jinja2",
@@ -709,7 +807,7 @@ def debug_wiki_structure(path):
     searcher = indexer.searcher()
 
     path = paths.normalize("/" + path)
-    path = pages.source_path(path)
+    path = get_source_path(pages, path)
     process = flask.request.args.get("process") != "false"
 
     jsondata = pages.json(paths.basepath(path), conditional=False,
@@ -726,7 +824,7 @@ def debug_search(path):
     sables = indexer.searchables
 
     path = paths.normalize("/" + path)
-    path = pages.source_path(path)
+    path = get_source_path(pages, path)
 
     jsondata = pages.json(path, conditional=False, postprocess=False)
     docs = list(sables.documents(pages, path, jsondata, flask.request.args, {}))
@@ -747,9 +845,9 @@ def update_index():
         """
     elif request.method == "PUT":
         pages = get_wikipages()
-        indexer = pages.indexer()
         clean = request.form.get("clean") == "true"
-        indexer.update(pages, clean=clean)
+        if not reindex_if_idle(pages, clean=clean):
+            flask.current_app.logger.info("Skipping reindex, index busy")
         return flask.redirect("/_reindex")
 
 
@@ -763,7 +861,7 @@ def debug_textify(path):
         searcher = indexer.searcher()
 
     path = paths.normalize("/" + path)
-    path = pages.source_path(path)
+    path = get_source_path(pages, path)
 
     jsondata = pages.json(path, searcher=searcher, conditional=False)
     output = pages.textify(jsondata)
@@ -786,20 +884,87 @@ def load_example():
     flask.abort(400)
 
 
+def reindex_if_idle(pages, clean=False):
+    # Only run one update at a time; if one is already running, skip this one
+    # instead of waiting for it and then redoing the same work
+    if not updatelock.acquire(False):
+        return False
+    try:
+        pages.reindex(clean=clean)
+    finally:
+        updatelock.release()
+    return True
+
+
 # Create useful objects based on the current app
 
 def get_store(app=None):
     app = app or flask.current_app
+    # Use the store created by flasksupport.setup() if there is one
+    store = getattr(app, "store", None)
+    if store is not None:
+        return store
+
     with app.app_context():
         return wikipages.store_from_config(app.config)
 
 
+def get_edit_store(app=None):
+    app = app or flask.current_app
+    # Use the edit store created by flasksupport.setup() if there is one
+    store = getattr(app, "edit_store", None)
+    if store is not None:
+        return store
+
+    return stores.store_from_spec(app.config.get("EDIT_STORE"))
+
+
+def get_source_path(pages, path):
+    # Finding the source path can require checking the store, so remember the
+    # paths already looked up during this request
+    spaths = flask.g.setdefault("source_paths", {})
+    try:
+        return spaths[path]
+    except KeyError:
+        spath = spaths[path] = pages.source_path(path)
+        return spath
+
+
+def get_checkpoints(pages, store):
+    # Checkpoints and autosaves are kept in the page cache directory
+    if pages.cache is None:
+        raise werkzeug.exceptions.InternalServerError(
+            "No CACHE_DIR configured to store checkpoints in"
+        )
+
+    maxnum = flask.current_app.config.get("CHECKPOINT_MAX", 10)
+    return Checkpoints(get_request_userid(), store, pages.cache.cachestore,
+                       maxnum)
+
+
+def get_html_cache(app=None):
+    app = app or flask.current_app
+    htmlcache = getattr(app, "html_cache", None)
+    if htmlcache is None:
+        size = app.config.get("HTML_CACHE_SIZE")
+        if not size:
+            return None
+        htmlcache = app.html_cache = util.DbLruCache(size)
+    return htmlcache
+
+
 def get_wikipages(app=None):
     from houdinihelp import hpages
 
     app = app or flask.current_app
+    # If flasksupport.setup() has created the store and configured the app's
+    # Jinja environment, reuse them instead of building new ones for every
+    # request, so templates are only compiled once
+    store = getattr(app, "store", None)
+    jinja_env = app.jinja_env if store is not None else None
     with app.app_context():
-        return hpages.pages_from_config(app.config, logger=app.logger)
+        return hpages.pages_from_config(app.config, logger=app.logger,
+                                        store=store, jinja_env=jinja_env)
 
 
 
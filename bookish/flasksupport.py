@@ -1,9 +1,10 @@
 import os
 import threading
+import time
 
 import werkzeug.serving
 
-from bookish import config, flaskapp, paths, search
+from bookish import config, flaskapp, paths, search, stores
 from bookish.wiki import styles, wikipages
 
 from houdinihelp import hpages
@@ -20,6 +21,7 @@ def setup(app):
     setup_logging(app)
     setup_store(app)
     setup_jinja(app)
+    setup_json(app)
     Scss(app)
 
     if not werkzeug.serving.is_running_from_reloader():
@@ -41,18 +43,75 @@ def setup_store(app):
     store = wikipages.store_from_config(app.config)
     app.store = store
 
+    edit_spec = app.config.get("EDIT_STORE")
+    app.edit_store = stores.store_from_spec(edit_spec) if edit_spec else None
+
 
 def setup_jinja(app):
     store = app.store
     hpages.jinja_from_config(app.config, store, app.jinja_env)
 
+    # Store compiled templates on disk so they don't have to be recompiled
+    # every time the server starts. Jinja checks the template source's
+    # checksum, so edited templates are recompiled automatically
+    cache_dir = app.config.get("JINJA_CACHE_DIR")
+    if cache_dir:
+        from jinja2 import FileSystemBytecodeCache
+
+        cache_dir = stores.expandpath(cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            app.logger.warning("Could not create Jinja cache dir %s",
+                               cache_dir)
+        else:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+
+def setup_json(app):
+    # If orjson is available, use it to serialize JSON responses, since it's
+    # much faster than the json module on large directory listings and search
+    # results
+    try:
+        import orjson
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:
+        return
+
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            # Fall back to the json module for any options orjson doesn't
+            # understand
+            if set(kwargs) - {"indent", "separators"}:
+                return super(OrjsonProvider, self).dumps(obj, **kwargs)
+
+            # Let the default function handle dates so they're formatted the
+            # same way as Flask's own provider
+            option = (orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_DATACLASS
+                      | orjson.OPT_NON_STR_KEYS)
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+
+            try:
+                return orjson.dumps(obj, default=self.default,
+                                    option=option).decode("utf8")
+            except TypeError:
+                # For example an integer too big for orjson
+                return super(OrjsonProvider, self).dumps(obj, **kwargs)
+
+    app.json = OrjsonProvider(app)
+
 
 class BgIndex(object):
     def __init__(self, app):
         self.enabled = app.config.get("ENABLE_BACKGROUND_INDEXING")
         self.autostart = app.config.get("AUTOSTART_BACKGROUND_INDEXING")
         self.interval = app.config.get("BACKGROUND_INDEXING_INTERVAL", 60.0)
-        self.timer = None
+        self.thread = None
+        self.stopped = threading.Event()
 
         if self.enabled and self.autostart:
             self.app = app
@@ -62,31 +121,30 @@ class BgIndex(object):
         locked = indexlock.acquire(False)
         if not locked:
             raise BackgroundIndexUnavailable
-        if self.timer:
+        if self.thread:
             raise Exception("Background indexing is already started")
 
         self.app.logger.info("Starting background indexing, interval %s s" %
                              self.interval)
-        self.reschedule()
+        # Use one long-lived thread instead of starting a new timer thread
+        # for every run
+        self.thread = threading.Thread(target=self.run, name="BgIndex")
+        self.thread.daemon = True
+        self.thread.start()
 
-    def reschedule(self):
-        self.timer = threading.Timer(self.interval, self.trigger, ())
-        self.timer.daemon = True
-        self.timer.start()
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.trigger()
 
-    def trigger(self):
-        from bookish.search import LockError
+    def stop(self):
+        self.stopped.set()
 
+    def trigger(self):
         self.app.logger.info("Periodic reindex")
 
         pages = flaskapp.get_wikipages(self.app)
-        indexer = pages.indexer()
-        try:
-            indexer.update(pages)
-        except LockError:
-            pass
-
-        self.reschedule()
+        if not flaskapp.reindex_if_idle(pages):
+            self.app.logger.info("Skipping periodic reindex, index busy")
 
 
 class Scss(object):
@@ -103,6 +161,8 @@ class Scss(object):
 
         self.asset_dir = self.app.config.get("SCSS_ASSET_DIR")
         self.store = flaskapp.get_store(app)
+        self.check_interval = self.app.config.get("SCSS_CHECK_INTERVAL", 1.0)
+        self.last_check = 0
 
         if not self.asset_dir:
             self.app.logger.warning("No SCSS_ASSET_DIR configured.")
@@ -128,31 +188,47 @@ class Scss(object):
         assert path.endswith(".scss")
         return path.replace(".scss", ".css")
 
-    def out_of_date(self, path):
-        s = self.store
-        mtime = s.last_modified(path)
-        opath = self.output_path(path)
-        if not s.exists(opath) or mtime > s.last_modified(opath):
-            return True
-
-    def partials_have_changed(self):
-        for path, ispartial in self.find_scss(partials=True):
-            if not ispartial:
-                continue
-
-            if self.out_of_date(path):
-                return True
+    def scan_scss(self):
+        # Returns a list of (path, ispartial, outofdate) tuples for the SCSS
+        # files in the asset directory. The compiled CSS files are in the same
+        # directory, so this only needs one directory listing
+        mtimes = {}
+        for name, isdir, _, mtime in self.store.scan_dir(self.asset_dir):
+            if not isdir:
+                mtimes[name] = mtime
+
+        scss = []
+        for name in sorted(mtimes):
+            if paths.extension(name) == ".scss":
+                outmtime = mtimes.get(self.output_path(name))
+                outofdate = outmtime is None or mtimes[name] > outmtime
+                scss.append((self.asset_dir + name, name.startswith("_"),
+                             outofdate))
+        return scss
 
     def recompile_all(self):
-        for path, _ in self.find_scss(partials=True):
-            self.compile_scss(path)
+        from concurrent.futures import ThreadPoolExecutor
+
+        # libsass does the compiling in C, so compile the files in parallel
+        scsspaths = [path for path, _ in self.find_scss(partials=True)]
+        with ThreadPoolExecutor() as executor:
+            # Use list() to get the results so any errors are re-raised here
+            list(executor.map(self.compile_scss, scsspaths))
 
     def update_scss(self):
-        if self.partials_have_changed():
+        # This runs before every request, so only look at the files if it's
+        # been a while since the last check
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return
+        self.last_check = now
+
+        scss = self.scan_scss()
+        if any(outofdate for _, ispartial, outofdate in scss if ispartial):
             return self.recompile_all()
 
-        for path, _ in self.find_scss():
-            if self.out_of_date(path):
+        for path, ispartial, outofdate in scss:
+            if outofdate and not ispartial:
                 self.compile_scss(path)
 
     def import_hook(self, path):
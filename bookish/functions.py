@@ -25,11 +25,13 @@
 # those of the authors and should not be interpreted as representing official
 # policies, either expressed or implied, of Matt Chaput.
 
-import copy
 import inspect
 import random
 import re
 from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from unicodedata import normalize
 
 from bookish import paths
 from bookish.compat import string_type, text_type, xrange
@@ -39,7 +41,8 @@ class Missing(object):
     pass
 
 
-sentence_end = re.compile(r"([.]\s)|$")
+word_expr = re.compile(r"\w+", re.UNICODE)
+tag_expr = re.compile("[^ \t\r\n,]+")
 
 
 # Context functions
@@ -52,18 +55,33 @@ def string(obj, before=None, after=None):
     key, calls string() on that. Otherwise, returns str(obj).
     """
 
+    if before is None and after is None:
+        # Fast path for the common case of no before/after strings
+        if type(obj) is str:
+            return obj
+        elif obj is None:
+            return ""
+
+    # Check for the exact built-in types before falling back to isinstance(),
+    # since comparing types is faster and almost everything is a plain
+    # str, list or dict
+    t = type(obj)
     if obj is None:
         s = ""
-    elif isinstance(obj, string_type):
+    elif t is str or isinstance(obj, string_type):
         s = obj
-    elif isinstance(obj, (list, tuple)) or inspect.isgenerator(obj):
-        s = "".join(string(o, before=before, after=after) for o in obj)
-    elif isinstance(obj, dict) and ("text" in obj or "body" in obj):
-        s = "".join((string(obj.get("text"), before=before, after=after),
-                     string(obj.get("body"), before=before, after=after)))
+    elif (t is list or t is tuple or isinstance(obj, (list, tuple))
+          or inspect.isgenerator(obj)):
+        s = "".join([string(o, before, after) for o in obj])
+    elif ((t is dict or isinstance(obj, dict))
+          and ("text" in obj or "body" in obj)):
+        s = (string(obj.get("text"), before, after) +
+             string(obj.get("body"), before, after))
     else:
         s = str(obj)
 
+    if before is None and after is None:
+        return s
     return (before or "") + s + (after or "")
 
 
@@ -99,14 +117,15 @@ def sort(obj, key=None):
 
 
 def split_tags(tagstring):
-    return re.findall("[^ \t\r\n,]+", tagstring)
+    return tag_expr.findall(tagstring)
 
 
 def find_items(block, itemtype="item"):
     body = None
-    if isinstance(block, dict):
+    t = type(block)
+    if t is dict or isinstance(block, dict):
         body = block.get("body")
-    elif isinstance(block, (tuple, list)):
+    elif t is list or t is tuple or isinstance(block, (tuple, list)):
         body = block
 
     if body:
@@ -168,10 +187,12 @@ def find_title(block):
 
 
 def first_subblock_text(block):
-    for subblock in block.get("body", ()):
-        text = subblock.get("text")
-        if text:
-            return text
+    body = block.get("body")
+    if body:
+        for subblock in body:
+            text = subblock.get("text")
+            if text:
+                return text
 
 
 def first_subblock_string(block):
@@ -181,19 +202,23 @@ def first_subblock_string(block):
 
 
 def subblocks_summary(block):
-    for subblock in block.get("body", ()):
-        text = string(subblock.get("text"))
-
-        if subblock.get("type") == "summary":
-            return text
-
-        m = sentence_end.search(text)
-        if m:
-            text = text[:m.end()]
-
+    # Only the first subblock is used
+    body = block.get("body")
+    if not body:
+        return ""
+
+    subblock = body[0]
+    text = string(subblock.get("text"))
+    if subblock.get("type") == "summary":
         return text
 
-    return ""
+    # Cut the text after the first period followed by whitespace
+    pos = text.find(".")
+    while pos >= 0:
+        if text[pos + 1:pos + 2].isspace():
+            return text[:pos + 2]
+        pos = text.find(".", pos + 1)
+    return text
 
 
 def subblocks_of_type(body, typename):
@@ -212,13 +237,18 @@ def first_subblock_of_type(body, typename):
 
 def _filter_predicate(spec):
     if isinstance(spec, str):
-        spec = frozenset(spec.split())
+        spec = spec.split()
+
+    # Split the spec into type names and "#id" names up front, so the
+    # predicate only has to do set lookups
+    types = frozenset(name for name in spec if not name.startswith("#"))
+    ids = frozenset(name[1:] for name in spec if name.startswith("#"))
 
     def predicate_fn(block):
-        typename = block.get("type")
-        blockid = block_id(block)
-        return (typename in spec or
-                (blockid and ("#%s" % blockid) in spec))
+        if block.get("type") in types:
+            return True
+        # Only work out the block's ID if the spec has IDs in it
+        return bool(ids) and block_id(block) in ids
 
     return predicate_fn
 
@@ -266,7 +296,7 @@ def text_replace(text, target, replacement):
         out = []
         for span in text:
             if isinstance(span, string_type):
-                span = out.append(span.replace(target, replacement))
+                span = span.replace(target, replacement)
             elif isinstance(span, dict) and "text" in span:
                 span = span.copy()
                 span["text"] = text_replace(span["text"], target, replacement)
@@ -299,18 +329,23 @@ def next_table_cell(block):
 
 
 def find_all_depth(obj):
-    if isinstance(obj, dict):
-        yield obj
-        if "text" in obj:
-            for span in find_all_depth(obj["text"]):
-                yield span
-        if "body" in obj:
-            for block in find_all_depth(obj["body"]):
-                yield block
-    elif isinstance(obj, (tuple, list)):
-        for x in obj:
-            for y in find_all_depth(x):
-                yield y
+    # Use an explicit stack instead of recursive generators, so deep trees
+    # don't pay for a chain of nested generators on every item. Items are
+    # pushed in reverse so they come off the stack in document order
+    stack = [obj]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        obj = pop()
+        t = type(obj)
+        if t is dict or isinstance(obj, dict):
+            yield obj
+            if "body" in obj:
+                push(obj["body"])
+            if "text" in obj:
+                push(obj["text"])
+        elif t is list or t is tuple or isinstance(obj, (tuple, list)):
+            stack.extend(reversed(obj))
 
 
 def find_all_breadth(obj, with_text=False):
@@ -318,22 +353,43 @@ def find_all_breadth(obj, with_text=False):
     while todo:
         obj = todo.popleft()
 
-        if isinstance(obj, dict):
+        if type(obj) is dict or isinstance(obj, dict):
             if with_text and "text" in obj:
-                todo.extend(obj["text"])
+                # Only queue the spans that could be yielded, not strings
+                todo.extend([span for span in obj["text"]
+                             if isinstance(span, dict)])
             elif "body" in obj:
                 todo.extend(obj["body"])
             yield obj
 
 
+def _attr_matches(block, name, value):
+    if name == "id" and string(block.get("id")) == value:
+        return True
+    return "attrs" in block and string(block["attrs"].get(name)) == value
+
+
 def find_by_attr(top, name, value):
     for b in find_all_depth(top):
-        if name == "id" and string(b.get("id")) == value:
-            yield b
-        elif "attrs" in b and string(b["attrs"].get(name)) == value:
+        if _attr_matches(b, name, value):
             yield b
 
 
+def find_many(top, queries):
+    """
+    Looks for blocks matching several attribute queries with a single pass
+    over the tree, instead of calling ``find_by_attr()`` once per query.
+    ``queries`` is a dictionary mapping keys to ``(name, value)`` tuples.
+    Yields ``(key, block)`` tuples for every block that matches a query.
+    """
+
+    queries = list(queries.items())
+    for b in find_all_depth(top):
+        for key, (name, value) in queries:
+            if _attr_matches(b, name, value):
+                yield key, b
+
+
 def find_with_attr(top, name):
     for b in find_all_depth(top):
         if "attrs" in b and name in b["attrs"]:
@@ -386,10 +442,9 @@ def find_headings(block, depth=1, types=("h", "section", "heading")):
     ls = []
     for subblock in body:
         if subblock.get("type") in types or subblock.get("role") in types:
-            hblock = copy.copy(subblock)
+            # Copy the block without its body
+            hblock = {k: v for k, v in subblock.items() if k != "body"}
             hblock["id"] = block_id(subblock)
-            if "body" in hblock:
-                del hblock["body"]
 
             if depth > 1 and "body" in subblock:
                 hbody = find_headings(subblock, depth-1, types)
@@ -404,6 +459,25 @@ def find_headings(block, depth=1, types=("h", "section", "heading")):
     return ls
 
 
+def _copy_toc_body(body, itemtype="subtopics_item"):
+    # build_toc() only modifies the items (and their attrs) that find_items()
+    # finds, so only copy those and the blocks containing them, instead of
+    # using deepcopy() on the whole body. The text is shared with the original
+    if not body:
+        return body
+
+    newbody = []
+    for subblock in body:
+        subblock = subblock.copy()
+        if subblock.get("type") == itemtype:
+            if "attrs" in subblock:
+                subblock["attrs"] = subblock["attrs"].copy()
+        elif "body" in subblock:
+            subblock["body"] = _copy_toc_body(subblock["body"], itemtype)
+        newbody.append(subblock)
+    return newbody
+
+
 def build_toc(docroot, basepath=None, block=None, i=0, depth=0, maxdepth=99):
     # If this is the "top" call, create a block to return
     block = block or {"type": "toc", "is_container": True}
@@ -423,11 +497,17 @@ def build_toc(docroot, basepath=None, block=None, i=0, depth=0, maxdepth=99):
     # Copy the subtopics body into the block's body
     subtopics = p["subtopics"]
     if subtopics:
-        block["body"] = copy.deepcopy(subtopics.get("body"))
+        block["body"] = _copy_toc_body(subtopics.get("body"))
     else:
         block["body"] = []
 
     if depth < maxdepth:
+        # Find the current page's subtopics once instead of for every matching
+        # item
+        here_subtopics = None
+        if basepath:
+            here_subtopics = subblock_by_id(docroot, "subtopics")
+
         # Let's get recursive all up in here
         for item in find_items(block["body"], "subtopics_item"):
             link = first_span_of_type(item.get("text"), "link")
@@ -438,9 +518,8 @@ def build_toc(docroot, basepath=None, block=None, i=0, depth=0, maxdepth=99):
             found = False
             if basepath and fullpath == basepath:
                 item["is_here"] = True
-                st = subblock_by_id(docroot, "subtopics")
-                if st:
-                    item["body"] = st.get("body", ())
+                if here_subtopics:
+                    item["body"] = here_subtopics.get("body", ())
             else:
                 for j in xrange(i + 1, len(parents)):
                     if parents[j]["basepath"] == fullpath:
@@ -474,25 +553,26 @@ random_chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
 
 
 def random_name(length=5):
-    charcount = len(random_chars)
-    return "".join(random_chars[random.randint(0, charcount)]
-                   for _ in xrange(length))
+    return "".join(random.choices(random_chars, k=length))
 
 
 def random_id():
     return "id%05d" % random.randint(0, 99999)
 
 
-def slugify(text, lower=True):
-    from unicodedata import normalize
-
-    if not isinstance(text, text_type):
-        text = text.decode("utf8")
+@lru_cache(maxsize=4096)
+def _slugify(text, lower):
     if lower:
         text = text.lower()
     text = normalize("NFKD", text)
-    return "-".join(m.group(0) for m
-                    in re.finditer(r"\w+", text, re.UNICODE))
+    return "-".join(m.group(0) for m in word_expr.finditer(text))
+
+
+def slugify(text, lower=True):
+    if not isinstance(text, text_type):
+        text = text.decode("utf8")
+    # The same headings and labels show up over and over, so cache the results
+    return _slugify(text, lower)
 
 
 def block_id(block, strip_nums=False):
@@ -519,12 +599,14 @@ def block_id(block, strip_nums=False):
 
 
 def collapse(body, types=()):
+    if not isinstance(types, frozenset):
+        types = frozenset(types)
+
     newbody = []
     for block in body:
         if "body" in block:
             block["body"] = collapse(block["body"], types)
 
-    for block in body:
         if block.get("type") in types:
             if "body" in block:
                 newbody.extend(block["body"])
@@ -564,10 +646,12 @@ all_functions = (
     first_subblock_text, first_subblock_string, subblocks_summary,
     first_subblock_of_type, retain_subblocks, remove_subblocks,
     find_title, find_links, first_span_of_type, find_spans_of_type,
-    subblock_by_id, text_replace, string_before, string_after,  next_table_cell,
-    find_all_depth, find_all_breadth, find_by_attr, find_with_attr,
-    first_by_attr, find_by_type, first_of_type, find_headings,
-    build_toc, has_option, random_name, random_id, slugify, block_id,
-    collapse, thing, icon_ref, attr_bag,
+    subblock_by_id, text_replace, string_before,
+    string_after,  next_table_cell, find_all_depth, find_all_breadth,
+    find_by_attr, find_many, find_with_attr, first_by_attr, find_by_type,
+    first_of_type, find_headings, build_toc, has_option, random_name,
+    random_id, slugify, block_id, collapse, thing, icon_ref, attr_bag,
 )
-functions_dict = dict((fn.__name__, fn) for fn in all_functions)
+# This is shared by every Jinja environment that uses these functions, so make it
+# read-only
+functions_dict = MappingProxyType({fn.__name__: fn for fn in all_functions})
@@ -1,8 +1,9 @@
 import re
 from bookish.parser import rules
 from bookish.parser.rules import Empty, Failure, Miss
-import bookish.parser.rules as r
+from builtins import ord as _ord
 import bookish.avenue.patterns as pt
+import bookish.parser.rules as r
 
 # This file was GENERATED from a grammar file. Do not edit this file; edit the
 # grammar file and regenerate.
@@ -20,8 +21,8 @@ def anon_string1(stream, i, context):
 
 def anon_string2(stream, i, context):
     # <String anon_string2>
-    if stream.startswith(u' ', i):
-        out = u' '
+    if stream.startswith(' ', i):
+        out = ' '
         i += 1
     else:
         out = Miss
@@ -38,7 +39,11 @@ def ws(stream, i, context):
         # <Or>
         targets = None_fm1[None]
         if i < len(stream):
-            targets = None_fm1.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft1[code1]
+            else:
+                targets = None_fm1.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -73,13 +78,13 @@ def root(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'$':
+    if active1 and i < len(stream) and stream[i] not in '$':
         active1 = False
         out = Miss
     if active1:
-        # <String u'$'>
-        if stream.startswith(u'$', i):
-            out = u'$'
+        # <String '$'>
+        if stream.startswith('$', i):
+            out = '$'
             i += 1
         else:
             out = Miss
@@ -99,18 +104,20 @@ def barenum(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in '0123456789':
+        active1 = False
+        out = Miss
     if active1:
-        # <Bind u'ds'>
-        # <Regex u'[0-9]+'>
+        # <Bind 'ds'>
+        # <Regex '[0-9]+'>
         match1 = _regex1.match(stream, i)
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         if out is not Miss:
-            context[u'ds'] = out
+            context['ds'] = out
         active1 = out is not Miss
     if active1:
         # <Do int(ds)>
@@ -128,14 +135,28 @@ def anon_seq2(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in '-':
+        active1 = False
+        out = Miss
+    if active1:
+        # <String '-'>
+        if stream.startswith('-', i):
+            out = '-'
+            i += 1
+        else:
+            out = Miss
+        active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '7920845613':
+        active1 = False
+        out = Miss
     if active1:
-        # <Bind u'x'>
+        # <Bind 'x'>
         out, i = barenum(stream, i, context)
         if out is not Miss:
-            context[u'x'] = out
+            context['x'] = out
         active1 = out is not Miss
     if active1:
-        # <Do x>
+        # <Do -x>
         out = eval(_do3, globals(), context)
         active1 = out is not Miss
     context = savectx1
@@ -150,25 +171,17 @@ def anon_seq3(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
-    if active1 and i < len(stream) and stream[i] not in u'-':
+    if active1 and i < len(stream) and stream[i] not in '7920845613':
         active1 = False
         out = Miss
     if active1:
-        # <String u'-'>
-        if stream.startswith(u'-', i):
-            out = u'-'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Bind u'x'>
+        # <Bind 'x'>
         out, i = barenum(stream, i, context)
         if out is not Miss:
-            context[u'x'] = out
+            context['x'] = out
         active1 = out is not Miss
     if active1:
-        # <Do -x>
+        # <Do x>
         out = eval(_do4, globals(), context)
         active1 = out is not Miss
     context = savectx1
@@ -186,11 +199,18 @@ def number(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '792-0845613':
+        active1 = False
+        out = Miss
     if active1:
         # <Or>
         targets = None_fm2[None]
         if i < len(stream):
-            targets = None_fm2.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft2[code1]
+            else:
+                targets = None_fm2.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -215,13 +235,13 @@ def index(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Bind u'i'>
+        # <Bind 'i'>
         out, i = number(stream, i, context)
         if out is not Miss:
-            context[u'i'] = out
+            context['i'] = out
         active1 = out is not Miss
     if active1:
-        # <Bind u'j'>
+        # <Bind 'j'>
         # <Opt>
         # <Seq>
         savei2 = i
@@ -232,13 +252,13 @@ def index(stream, i, context):
             # <Call ws()>
             out, i = ws(stream, i, context)
             active2 = out is not Miss
-        if active2 and i < len(stream) and stream[i] not in u':':
+        if active2 and i < len(stream) and stream[i] not in ':':
             active2 = False
             out = Miss
         if active2:
-            # <String u':'>
-            if stream.startswith(u':', i):
-                out = u':'
+            # <String ':'>
+            if stream.startswith(':', i):
+                out = ':'
                 i += 1
             else:
                 out = Miss
@@ -259,7 +279,7 @@ def index(stream, i, context):
         else:
             out = [out]
         if out is not Miss:
-            context[u'j'] = out
+            context['j'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Slice(i, j[0] if j else None)>
@@ -271,185 +291,25 @@ def index(stream, i, context):
     return out, i
 
 
-def name(stream, i, context):
-    # <Regex name>
-    match1 = _regex2.match(stream, i)
-    if match1:
-        out = match1.group(0)
-        i = match1.end()
-        context.update(match1.groupdict())
-    else:
-        out = Miss
-    return out, i
-
-
 def anon_seq4(stream, i, context):
     # <Seq anon_seq4>
     savei1 = i
     savectx1 = context
     context = context.push()
     active1 = True
-    if active1:
-        # <Bind u'e'>
-        out, i = expr(stream, i, context)
-        if out is not Miss:
-            context[u'e'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Bind u'es'>
-        # <Star>
-        savei2 = i
-        times1 = 0
-        output1 = []
-        while i <= len(stream):
-            previ1 = i
-            # <Seq>
-            savei3 = i
-            savectx2 = context
-            context = context.push()
-            active2 = True
-            if active2:
-                # <Call ws()>
-                out, i = ws(stream, i, context)
-                active2 = out is not Miss
-            if active2 and i < len(stream) and stream[i] not in u',':
-                active2 = False
-                out = Miss
-            if active2:
-                # <String u','>
-                if stream.startswith(u',', i):
-                    out = u','
-                    i += 1
-                else:
-                    out = Miss
-                active2 = out is not Miss
-            if active2:
-                # <Call expr()>
-                out, i = expr(stream, i, context)
-                active2 = out is not Miss
-            context = savectx2
-            if not active2:
-                i = savei3
-            if out is Miss:
-                break
-            if i <= previ1:
-                if stream.startswith('\x03', i) or i == len(stream):
-                    break
-                raise Exception
-            if out is not Empty:
-                output1.append(out)
-            times1 += 1
-        if times1 >= 0:
-            out = output1
-        else:
-            out = Miss
-            i = savei2
-        if out is not Miss:
-            context[u'es'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Do [e] + es>
-        out = eval(_do6, globals(), context)
-        active1 = out is not Miss
-    context = savectx1
-    if not active1:
-        i = savei1
-    return out, i
-
-
-def anon_do1(stream, i, context):
-    # <Do anon_do1>
-    out = []
-    return out, i
-
-
-def args(stream, i, context):
-    # <Or args>
-    targets = args_fm1[None]
-    if i < len(stream):
-        targets = args_fm1.get(stream[i], targets)
-    if targets:
-        for rule in targets:
-            out, new = rule(stream, i, context)
-            if out is not Miss:
-                i = new
-                break
-        else:
-            out = Miss
-    else:
-        out = Miss
-    return out, i
-
-
-def application(stream, i, context):
-    # <Seq application>
-    savei1 = i
-    savectx1 = context
-    context = context.push()
-    active1 = True
-    if active1:
-        # <Bind u'n'>
-        out, i = name(stream, i, context)
-        if out is not Miss:
-            context[u'n'] = out
-        active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'(':
-        active1 = False
-        out = Miss
-    if active1:
-        # <String u'('>
-        if stream.startswith(u'(', i):
-            out = u'('
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Bind u'args'>
-        out, i = args(stream, i, context)
-        if out is not Miss:
-            context[u'args'] = out
-        active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u')':
-        active1 = False
-        out = Miss
-    if active1:
-        # <String u')'>
-        if stream.startswith(u')', i):
-            out = u')'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Do pt.App(n, args)>
-        out = eval(_do7, globals(), context)
-        active1 = out is not Miss
-    context = savectx1
-    if not active1:
-        i = savei1
-    return out, i
-
-
-def anon_seq5(stream, i, context):
-    # <Seq anon_seq5>
-    savei1 = i
-    savectx1 = context
-    context = context.push()
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in u'"':
+    if active1 and i < len(stream) and stream[i] not in '"':
         active1 = False
         out = Miss
     if active1:
-        # <String u'"'>
-        if stream.startswith(u'"', i):
-            out = u'"'
+        # <String '"'>
+        if stream.startswith('"', i):
+            out = '"'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u's'>
+        # <Bind 's'>
         # <Take>
         savei2 = i
         # <Plus>
@@ -463,9 +323,9 @@ def anon_seq5(stream, i, context):
             active2 = True
             if active2:
                 # <Not>
-                # <String u'"'>
-                if stream.startswith(u'"', i):
-                    out = u'"'
+                # <String '"'>
+                if stream.startswith('"', i):
+                    out = '"'
                     i += 1
                 else:
                     out = Miss
@@ -497,22 +357,22 @@ def anon_seq5(stream, i, context):
         if out is not Miss:
             out = stream[savei2:i]
         if out is not Miss:
-            context[u's'] = out
+            context['s'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'"':
+    if active1 and i < len(stream) and stream[i] not in '"':
         active1 = False
         out = Miss
     if active1:
-        # <String u'"'>
-        if stream.startswith(u'"', i):
-            out = u'"'
+        # <String '"'>
+        if stream.startswith('"', i):
+            out = '"'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do s>
-        out = eval(_do8, globals(), context)
+        out = eval(_do6, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -520,25 +380,25 @@ def anon_seq5(stream, i, context):
     return out, i
 
 
-def anon_seq6(stream, i, context):
-    # <Seq anon_seq6>
+def anon_seq5(stream, i, context):
+    # <Seq anon_seq5>
     savei1 = i
     savectx1 = context
     context = context.push()
     active1 = True
-    if active1 and i < len(stream) and stream[i] not in u"'":
+    if active1 and i < len(stream) and stream[i] not in "'":
         active1 = False
         out = Miss
     if active1:
-        # <String u"'">
-        if stream.startswith(u"'", i):
-            out = u"'"
+        # <String "'">
+        if stream.startswith("'", i):
+            out = "'"
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u's'>
+        # <Bind 's'>
         # <Take>
         savei2 = i
         # <Plus>
@@ -552,9 +412,9 @@ def anon_seq6(stream, i, context):
             active2 = True
             if active2:
                 # <Not>
-                # <String u"'">
-                if stream.startswith(u"'", i):
-                    out = u"'"
+                # <String "'">
+                if stream.startswith("'", i):
+                    out = "'"
                     i += 1
                 else:
                     out = Miss
@@ -586,22 +446,22 @@ def anon_seq6(stream, i, context):
         if out is not Miss:
             out = stream[savei2:i]
         if out is not Miss:
-            context[u's'] = out
+            context['s'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u"'":
+    if active1 and i < len(stream) and stream[i] not in "'":
         active1 = False
         out = Miss
     if active1:
-        # <String u"'">
-        if stream.startswith(u"'", i):
-            out = u"'"
+        # <String "'">
+        if stream.startswith("'", i):
+            out = "'"
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do s>
-        out = eval(_do8, globals(), context)
+        out = eval(_do6, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -613,7 +473,11 @@ def string(stream, i, context):
     # <Or string>
     targets = string_fm1[None]
     if i < len(stream):
-        targets = string_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = string_ft1[code1]
+        else:
+            targets = string_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -627,6 +491,17 @@ def string(stream, i, context):
     return out, i
 
 
+def name(stream, i, context):
+    # <Regex name>
+    match1 = _regex2.match(stream, i)
+    if match1:
+        out = match1.group(0)
+        i = match1.end()
+    else:
+        out = Miss
+    return out, i
+
+
 def lookup(stream, i, context):
     # <Seq lookup>
     savei1 = i
@@ -636,12 +511,19 @@ def lookup(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrzMYLBavoWj_CfGxgNkDRpOdyJXnEHbFm"ITZ\'qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
-        # <Bind u's'>
+        # <Bind 's'>
         # <Or>
         targets = None_fm3[None]
         if i < len(stream):
-            targets = None_fm3.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft3[code1]
+            else:
+                targets = None_fm3.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -653,11 +535,11 @@ def lookup(stream, i, context):
         else:
             out = Miss
         if out is not Miss:
-            context[u's'] = out
+            context['s'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Lookup(s)>
-        out = eval(_do9, globals(), context)
+        out = eval(_do7, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -674,19 +556,19 @@ def regex(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'/':
+    if active1 and i < len(stream) and stream[i] not in '/':
         active1 = False
         out = Miss
     if active1:
-        # <String u'/'>
-        if stream.startswith(u'/', i):
-            out = u'/'
+        # <String '/'>
+        if stream.startswith('/', i):
+            out = '/'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'r'>
+        # <Bind 'r'>
         # <Take>
         savei2 = i
         # <Plus>
@@ -700,9 +582,9 @@ def regex(stream, i, context):
             active2 = True
             if active2:
                 # <Not>
-                # <String u'/'>
-                if stream.startswith(u'/', i):
-                    out = u'/'
+                # <String '/'>
+                if stream.startswith('/', i):
+                    out = '/'
                     i += 1
                 else:
                     out = Miss
@@ -734,22 +616,22 @@ def regex(stream, i, context):
         if out is not Miss:
             out = stream[savei2:i]
         if out is not Miss:
-            context[u'r'] = out
+            context['r'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'/':
+    if active1 and i < len(stream) and stream[i] not in '/':
         active1 = False
         out = Miss
     if active1:
-        # <String u'/'>
-        if stream.startswith(u'/', i):
-            out = u'/'
+        # <String '/'>
+        if stream.startswith('/', i):
+            out = '/'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do pt.Regex(r)>
-        out = eval(_do10, globals(), context)
+        out = eval(_do8, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -764,20 +646,20 @@ def star(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'*':
+    if active1 and i < len(stream) and stream[i] not in '*':
         active1 = False
         out = Miss
     if active1:
-        # <String u'*'>
-        if stream.startswith(u'*', i):
-            out = u'*'
+        # <String '*'>
+        if stream.startswith('*', i):
+            out = '*'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do Star()>
-        out = eval(_do11, globals(), context)
+        out = eval(_do9, globals(), context)
         active1 = out is not Miss
     if not active1:
         i = savei1
@@ -786,8 +668,8 @@ def star(stream, i, context):
 
 def anon_string3(stream, i, context):
     # <String anon_string3>
-    if stream.startswith(u'!=', i):
-        out = u'!='
+    if stream.startswith('!=', i):
+        out = '!='
         i += 2
     else:
         out = Miss
@@ -796,8 +678,8 @@ def anon_string3(stream, i, context):
 
 def anon_string4(stream, i, context):
     # <String anon_string4>
-    if stream.startswith(u'<=', i):
-        out = u'<='
+    if stream.startswith('<=', i):
+        out = '<='
         i += 2
     else:
         out = Miss
@@ -806,8 +688,8 @@ def anon_string4(stream, i, context):
 
 def anon_string5(stream, i, context):
     # <String anon_string5>
-    if stream.startswith(u'<', i):
-        out = u'<'
+    if stream.startswith('<', i):
+        out = '<'
         i += 1
     else:
         out = Miss
@@ -816,8 +698,8 @@ def anon_string5(stream, i, context):
 
 def anon_string6(stream, i, context):
     # <String anon_string6>
-    if stream.startswith(u'==', i):
-        out = u'=='
+    if stream.startswith('==', i):
+        out = '=='
         i += 2
     else:
         out = Miss
@@ -826,8 +708,8 @@ def anon_string6(stream, i, context):
 
 def anon_string7(stream, i, context):
     # <String anon_string7>
-    if stream.startswith(u'=', i):
-        out = u'='
+    if stream.startswith('=', i):
+        out = '='
         i += 1
     else:
         out = Miss
@@ -836,8 +718,8 @@ def anon_string7(stream, i, context):
 
 def anon_string8(stream, i, context):
     # <String anon_string8>
-    if stream.startswith(u'=~', i):
-        out = u'=~'
+    if stream.startswith('=~', i):
+        out = '=~'
         i += 2
     else:
         out = Miss
@@ -846,8 +728,8 @@ def anon_string8(stream, i, context):
 
 def anon_string9(stream, i, context):
     # <String anon_string9>
-    if stream.startswith(u'>=', i):
-        out = u'>='
+    if stream.startswith('>=', i):
+        out = '>='
         i += 2
     else:
         out = Miss
@@ -856,8 +738,8 @@ def anon_string9(stream, i, context):
 
 def anon_string10(stream, i, context):
     # <String anon_string10>
-    if stream.startswith(u'>', i):
-        out = u'>'
+    if stream.startswith('>', i):
+        out = '>'
         i += 1
     else:
         out = Miss
@@ -868,7 +750,11 @@ def literal(stream, i, context):
     # <Or literal>
     targets = literal_fm1[None]
     if i < len(stream):
-        targets = literal_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = literal_ft1[code1]
+        else:
+            targets = literal_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -891,35 +777,42 @@ def test(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'@':
+    if active1 and i < len(stream) and stream[i] not in '@':
         active1 = False
         out = Miss
     if active1:
-        # <String u'@'>
-        if stream.startswith(u'@', i):
-            out = u'@'
+        # <String '@'>
+        if stream.startswith('@', i):
+            out = '@'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
-        # <Bind u'n'>
+        # <Bind 'n'>
         out, i = name(stream, i, context)
         if out is not Miss:
-            context[u'n'] = out
+            context['n'] = out
         active1 = out is not Miss
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'!=<>':
+    if active1 and i < len(stream) and stream[i] not in '><=!':
         active1 = False
         out = Miss
     if active1:
-        # <Bind u'op'>
+        # <Bind 'op'>
         # <Or>
         targets = None_fm4[None]
         if i < len(stream):
-            targets = None_fm4.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft4[code1]
+            else:
+                targets = None_fm4.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -931,20 +824,20 @@ def test(stream, i, context):
         else:
             out = Miss
         if out is not Miss:
-            context[u'op'] = out
+            context['op'] = out
         active1 = out is not Miss
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
     if active1:
-        # <Bind u'v'>
+        # <Bind 'v'>
         out, i = literal(stream, i, context)
         if out is not Miss:
-            context[u'v'] = out
+            context['v'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Comparison(n, op, v)>
-        out = eval(_do12, globals(), context)
+        out = eval(_do10, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -961,38 +854,38 @@ def predicate(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'?':
+    if active1 and i < len(stream) and stream[i] not in '?':
         active1 = False
         out = Miss
     if active1:
-        # <String u'?('>
-        if stream.startswith(u'?(', i):
-            out = u'?('
+        # <String '?('>
+        if stream.startswith('?(', i):
+            out = '?('
             i += 2
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'src'>
+        # <Bind 'src'>
         # <PythonExpr>
         out, i = rules.take_python_expr(stream, i, ')')
         if out is not Miss:
-            context[u'src'] = out
+            context['src'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u')':
+    if active1 and i < len(stream) and stream[i] not in ')':
         active1 = False
         out = Miss
     if active1:
-        # <String u')'>
-        if stream.startswith(u')', i):
-            out = u')'
+        # <String ')'>
+        if stream.startswith(')', i):
+            out = ')'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do pt.Predicate(src)>
-        out = eval(_do13, globals(), context)
+        out = eval(_do11, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1009,38 +902,38 @@ def action(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'{':
+    if active1 and i < len(stream) and stream[i] not in '{':
         active1 = False
         out = Miss
     if active1:
-        # <String u'{'>
-        if stream.startswith(u'{', i):
-            out = u'{'
+        # <String '{'>
+        if stream.startswith('{', i):
+            out = '{'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'src'>
+        # <Bind 'src'>
         # <PythonExpr>
         out, i = rules.take_python_expr(stream, i, ')')
         if out is not Miss:
-            context[u'src'] = out
+            context['src'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'}':
+    if active1 and i < len(stream) and stream[i] not in '}':
         active1 = False
         out = Miss
     if active1:
-        # <String u'}'>
-        if stream.startswith(u'}', i):
-            out = u'}'
+        # <String '}'>
+        if stream.startswith('}', i):
+            out = '}'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do pt.Action(src)>
-        out = eval(_do14, globals(), context)
+        out = eval(_do12, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1057,36 +950,191 @@ def brackets(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'(':
+    if active1 and i < len(stream) and stream[i] not in '(':
         active1 = False
         out = Miss
     if active1:
-        # <String u'('>
-        if stream.startswith(u'(', i):
-            out = u'('
+        # <String '('>
+        if stream.startswith('(', i):
+            out = '('
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'e'>
+        # <Bind 'e'>
         out, i = expr(stream, i, context)
         if out is not Miss:
-            context[u'e'] = out
+            context['e'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u')':
+    if active1 and i < len(stream) and stream[i] not in ')':
         active1 = False
         out = Miss
     if active1:
-        # <String u')'>
-        if stream.startswith(u')', i):
-            out = u')'
+        # <String ')'>
+        if stream.startswith(')', i):
+            out = ')'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Do e>
+        out = eval(_do13, globals(), context)
+        active1 = out is not Miss
+    context = savectx1
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def anon_seq6(stream, i, context):
+    # <Seq anon_seq6>
+    savei1 = i
+    savectx1 = context
+    context = context.push()
+    active1 = True
+    if active1:
+        # <Bind 'e'>
+        out, i = expr(stream, i, context)
+        if out is not Miss:
+            context['e'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Bind 'es'>
+        # <Star>
+        savei2 = i
+        times1 = 0
+        output1 = []
+        while i <= len(stream):
+            previ1 = i
+            # <Seq>
+            savei3 = i
+            savectx2 = context
+            context = context.push()
+            active2 = True
+            if active2:
+                # <Call ws()>
+                out, i = ws(stream, i, context)
+                active2 = out is not Miss
+            if active2 and i < len(stream) and stream[i] not in ',':
+                active2 = False
+                out = Miss
+            if active2:
+                # <String ','>
+                if stream.startswith(',', i):
+                    out = ','
+                    i += 1
+                else:
+                    out = Miss
+                active2 = out is not Miss
+            if active2:
+                # <Call expr()>
+                out, i = expr(stream, i, context)
+                active2 = out is not Miss
+            context = savectx2
+            if not active2:
+                i = savei3
+            if out is Miss:
+                break
+            if i <= previ1:
+                if stream.startswith('\x03', i) or i == len(stream):
+                    break
+                raise Exception
+            if out is not Empty:
+                output1.append(out)
+            times1 += 1
+        if times1 >= 0:
+            out = output1
+        else:
+            out = Miss
+            i = savei2
+        if out is not Miss:
+            context['es'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Do [e] + es>
+        out = eval(_do14, globals(), context)
+        active1 = out is not Miss
+    context = savectx1
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def anon_do1(stream, i, context):
+    # <Do anon_do1>
+    out = []
+    return out, i
+
+
+def args(stream, i, context):
+    # <Or args>
+    targets = args_fm1[None]
+    if i < len(stream):
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = args_ft1[code1]
+        else:
+            targets = args_fm1.get(stream[i], targets)
+    if targets:
+        for rule in targets:
+            out, new = rule(stream, i, context)
+            if out is not Miss:
+                i = new
+                break
+        else:
+            out = Miss
+    else:
+        out = Miss
+    return out, i
+
+
+def application(stream, i, context):
+    # <Seq application>
+    savei1 = i
+    savectx1 = context
+    context = context.push()
+    active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
+    if active1:
+        # <Bind 'n'>
+        out, i = name(stream, i, context)
+        if out is not Miss:
+            context['n'] = out
+        active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '(':
+        active1 = False
+        out = Miss
+    if active1:
+        # <String '('>
+        if stream.startswith('(', i):
+            out = '('
+            i += 1
+        else:
+            out = Miss
+        active1 = out is not Miss
+    if active1:
+        # <Bind 'args'>
+        out, i = args(stream, i, context)
+        if out is not Miss:
+            context['args'] = out
+        active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in ')':
+        active1 = False
+        out = Miss
+    if active1:
+        # <String ')'>
+        if stream.startswith(')', i):
+            out = ')'
+            i += 1
+        else:
+            out = Miss
+        active1 = out is not Miss
+    if active1:
+        # <Do pt.App(n, args)>
         out = eval(_do15, globals(), context)
         active1 = out is not Miss
     context = savectx1
@@ -1101,30 +1149,30 @@ def filter(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
-    if active1 and i < len(stream) and stream[i] not in u'[':
+    if active1 and i < len(stream) and stream[i] not in '[':
         active1 = False
         out = Miss
     if active1:
-        # <String u'['>
-        if stream.startswith(u'[', i):
-            out = u'['
+        # <String '['>
+        if stream.startswith('[', i):
+            out = '['
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'e'>
+        # <Bind 'e'>
         out, i = expr(stream, i, context)
         if out is not Miss:
-            context[u'e'] = out
+            context['e'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u']':
+    if active1 and i < len(stream) and stream[i] not in ']':
         active1 = False
         out = Miss
     if active1:
-        # <String u']'>
-        if stream.startswith(u']', i):
-            out = u']'
+        # <String ']'>
+        if stream.startswith(']', i):
+            out = ']'
             i += 1
         else:
             out = Miss
@@ -1143,7 +1191,11 @@ def expr1(stream, i, context):
     # <Or expr1>
     targets = expr1_fm1[None]
     if i < len(stream):
-        targets = expr1_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = expr1_ft1[code1]
+        else:
+            targets = expr1_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1164,30 +1216,30 @@ def anon_seq1(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Bind u'e1'>
+        # <Bind 'e1'>
         out, i = expr1(stream, i, context)
         if out is not Miss:
-            context[u'e1'] = out
+            context['e1'] = out
         active1 = out is not Miss
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'.':
+    if active1 and i < len(stream) and stream[i] not in '.':
         active1 = False
         out = Miss
     if active1:
-        # <String u'..'>
-        if stream.startswith(u'..', i):
-            out = u'..'
+        # <String '..'>
+        if stream.startswith('..', i):
+            out = '..'
             i += 2
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'e'>
+        # <Bind 'e'>
         out, i = expr(stream, i, context)
         if out is not Miss:
-            context[u'e'] = out
+            context['e'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Ancestor(e1, e)>
@@ -1206,30 +1258,30 @@ def anon_seq7(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Bind u'e1'>
+        # <Bind 'e1'>
         out, i = expr1(stream, i, context)
         if out is not Miss:
-            context[u'e1'] = out
+            context['e1'] = out
         active1 = out is not Miss
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in u'.':
+    if active1 and i < len(stream) and stream[i] not in '.':
         active1 = False
         out = Miss
     if active1:
-        # <String u'.'>
-        if stream.startswith(u'.', i):
-            out = u'.'
+        # <String '.'>
+        if stream.startswith('.', i):
+            out = '.'
             i += 1
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <Bind u'e'>
+        # <Bind 'e'>
         out, i = expr(stream, i, context)
         if out is not Miss:
-            context[u'e'] = out
+            context['e'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Child(e1, e)>
@@ -1245,7 +1297,11 @@ def expr2(stream, i, context):
     # <Or expr2>
     targets = expr2_fm1[None]
     if i < len(stream):
-        targets = expr2_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = expr2_ft1[code1]
+        else:
+            targets = expr2_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1266,13 +1322,13 @@ def expr(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Bind u'e2'>
+        # <Bind 'e2'>
         out, i = expr2(stream, i, context)
         if out is not Miss:
-            context[u'e2'] = out
+            context['e2'] = out
         active1 = out is not Miss
     if active1:
-        # <Bind u'e2s'>
+        # <Bind 'e2s'>
         # <Star>
         savei2 = i
         times1 = 0
@@ -1288,13 +1344,13 @@ def expr(stream, i, context):
                 # <Call ws()>
                 out, i = ws(stream, i, context)
                 active2 = out is not Miss
-            if active2 and i < len(stream) and stream[i] not in u'|':
+            if active2 and i < len(stream) and stream[i] not in '|':
                 active2 = False
                 out = Miss
             if active2:
-                # <String u'|'>
-                if stream.startswith(u'|', i):
-                    out = u'|'
+                # <String '|'>
+                if stream.startswith('|', i):
+                    out = '|'
                     i += 1
                 else:
                     out = Miss
@@ -1321,7 +1377,7 @@ def expr(stream, i, context):
             out = Miss
             i = savei2
         if out is not Miss:
-            context[u'e2s'] = out
+            context['e2s'] = out
         active1 = out is not Miss
     if active1:
         # <Do pt.Union([e2] + e2s) if e2s else e2>
@@ -1349,10 +1405,10 @@ def grammar(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Bind u'e'>
+        # <Bind 'e'>
         out, i = expr(stream, i, context)
         if out is not Miss:
-            context[u'e'] = out
+            context['e'] = out
         active1 = out is not Miss
     if active1:
         out, i = ws(stream, i, context)
@@ -1365,7 +1421,7 @@ def grammar(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do e>
-        out = eval(_do15, globals(), context)
+        out = eval(_do13, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1376,63 +1432,188 @@ def grammar(stream, i, context):
 None_fm1 = {
     None: (),
     '\t': (anon_string1,),
-    u' ': (anon_string2,),
+    ' ': (anon_string2,),
 }
-_do1 = rules.compile_expr(u'Root()')
-_regex1 = re.compile(u'[0-9]+')
-_do2 = rules.compile_expr(u'int(ds)')
-_do3 = rules.compile_expr(u'x')
-_do4 = rules.compile_expr(u'-x')
+None_ft1 = rules.firstmap_table(None_fm1)
+_do1 = rules.compile_expr('Root()')
+_regex1 = re.compile('[0-9]+')
+_do2 = rules.compile_expr('int(ds)')
+_do3 = rules.compile_expr('-x')
+_do4 = rules.compile_expr('x')
 None_fm2 = {
-    None: (anon_seq2,),
-    u'-': (anon_seq3, anon_seq2,),
-}
-_do5 = rules.compile_expr(u'pt.Slice(i, j[0] if j else None)')
-_regex2 = re.compile(u'[A-Za-z_]+[A-Za-z_0-9]*')
-_do6 = rules.compile_expr(u'[e] + es')
-args_fm1 = {
-    None: (anon_seq4, anon_do1,),
+    None: (),
+    '-': (anon_seq2,),
+    '0': (anon_seq3,),
+    '1': (anon_seq3,),
+    '2': (anon_seq3,),
+    '3': (anon_seq3,),
+    '4': (anon_seq3,),
+    '5': (anon_seq3,),
+    '6': (anon_seq3,),
+    '7': (anon_seq3,),
+    '8': (anon_seq3,),
+    '9': (anon_seq3,),
 }
-_do7 = rules.compile_expr(u'pt.App(n, args)')
-_do8 = rules.compile_expr(u's')
+None_ft2 = rules.firstmap_table(None_fm2)
+_do5 = rules.compile_expr('pt.Slice(i, j[0] if j else None)')
+_do6 = rules.compile_expr('s')
 string_fm1 = {
     None: (),
-    u'"': (anon_seq5,),
-    u"'": (anon_seq6,),
+    '"': (anon_seq4,),
+    "'": (anon_seq5,),
 }
+string_ft1 = rules.firstmap_table(string_fm1)
+_regex2 = re.compile('[A-Za-z_]+[A-Za-z_0-9]*')
 None_fm3 = {
-    None: (name,),
-    u'"': (string, name,),
-    u"'": (string, name,),
+    None: (),
+    '"': (string,),
+    "'": (string,),
+    'A': (name,),
+    'B': (name,),
+    'C': (name,),
+    'D': (name,),
+    'E': (name,),
+    'F': (name,),
+    'G': (name,),
+    'H': (name,),
+    'I': (name,),
+    'J': (name,),
+    'K': (name,),
+    'L': (name,),
+    'M': (name,),
+    'N': (name,),
+    'O': (name,),
+    'P': (name,),
+    'Q': (name,),
+    'R': (name,),
+    'S': (name,),
+    'T': (name,),
+    'U': (name,),
+    'V': (name,),
+    'W': (name,),
+    'X': (name,),
+    'Y': (name,),
+    'Z': (name,),
+    '_': (name,),
+    'a': (name,),
+    'b': (name,),
+    'c': (name,),
+    'd': (name,),
+    'e': (name,),
+    'f': (name,),
+    'g': (name,),
+    'h': (name,),
+    'i': (name,),
+    'j': (name,),
+    'k': (name,),
+    'l': (name,),
+    'm': (name,),
+    'n': (name,),
+    'o': (name,),
+    'p': (name,),
+    'q': (name,),
+    'r': (name,),
+    's': (name,),
+    't': (name,),
+    'u': (name,),
+    'v': (name,),
+    'w': (name,),
+    'x': (name,),
+    'y': (name,),
+    'z': (name,),
 }
-_do9 = rules.compile_expr(u'pt.Lookup(s)')
-_do10 = rules.compile_expr(u'pt.Regex(r)')
-_do11 = rules.compile_expr(u'Star()')
+None_ft3 = rules.firstmap_table(None_fm3)
+_do7 = rules.compile_expr('pt.Lookup(s)')
+_do8 = rules.compile_expr('pt.Regex(r)')
+_do9 = rules.compile_expr('Star()')
 None_fm4 = {
     None: (),
-    u'!': (anon_string3,),
-    u'<': (anon_string4, anon_string5,),
-    u'=': (anon_string6, anon_string7, anon_string8,),
-    u'>': (anon_string9, anon_string10,),
+    '!': (anon_string3,),
+    '<': (anon_string4, anon_string5,),
+    '=': (anon_string6, anon_string7, anon_string8,),
+    '>': (anon_string9, anon_string10,),
 }
+None_ft4 = rules.firstmap_table(None_fm4)
 literal_fm1 = {
     None: (number,),
-    u'"': (string, number,),
-    u"'": (string, number,),
+    '"': (string, number,),
+    "'": (string, number,),
+}
+literal_ft1 = rules.firstmap_table(literal_fm1)
+_do10 = rules.compile_expr('pt.Comparison(n, op, v)')
+_do11 = rules.compile_expr('pt.Predicate(src)')
+_do12 = rules.compile_expr('pt.Action(src)')
+_do13 = rules.compile_expr('e')
+_do14 = rules.compile_expr('[e] + es')
+args_fm1 = {
+    None: (anon_seq6, anon_do1,),
 }
-_do12 = rules.compile_expr(u'pt.Comparison(n, op, v)')
-_do13 = rules.compile_expr(u'pt.Predicate(src)')
-_do14 = rules.compile_expr(u'pt.Action(src)')
-_do15 = rules.compile_expr(u'e')
-_do16 = rules.compile_expr(u'pt.Filter(e)')
+args_ft1 = rules.firstmap_table(args_fm1)
+_do15 = rules.compile_expr('pt.App(n, args)')
+_do16 = rules.compile_expr('pt.Filter(e)')
 expr1_fm1 = {
-    None: (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
-    u'[': (root, index, application, lookup, regex, star, test, predicate, action, brackets, filter,),
+    None: (root, index, lookup, regex, star, test, predicate, action, brackets,),
+    'A': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'B': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'C': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'D': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'E': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'F': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'G': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'H': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'I': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'J': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'K': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'L': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'M': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'N': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'O': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'P': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'Q': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'R': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'S': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'T': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'U': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'V': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'W': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'X': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'Y': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'Z': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    '[': (root, index, lookup, regex, star, test, predicate, action, brackets, filter,),
+    '_': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'a': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'b': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'c': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'd': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'e': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'f': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'g': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'h': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'i': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'j': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'k': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'l': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'm': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'n': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'o': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'p': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'q': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'r': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    's': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    't': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'u': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'v': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'w': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'x': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'y': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
+    'z': (root, index, application, lookup, regex, star, test, predicate, action, brackets,),
 }
-_do17 = rules.compile_expr(u'pt.Ancestor(e1, e)')
-_do18 = rules.compile_expr(u'pt.Child(e1, e)')
+expr1_ft1 = rules.firstmap_table(expr1_fm1)
+_do17 = rules.compile_expr('pt.Ancestor(e1, e)')
+_do18 = rules.compile_expr('pt.Child(e1, e)')
 expr2_fm1 = {
     None: (anon_seq1, anon_seq7, expr1,),
 }
-_do19 = rules.compile_expr(u'pt.Union([e2] + e2s) if e2s else e2')
+expr2_ft1 = rules.firstmap_table(expr2_fm1)
+_do19 = rules.compile_expr('pt.Union([e2] + e2s) if e2s else e2')
 
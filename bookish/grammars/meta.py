@@ -1,45 +1,20 @@
 import re
 from bookish.parser import rules
 from bookish.parser.rules import Empty, Failure, Miss
+from builtins import ord as _ord
 
 # This file was GENERATED from a grammar file. Do not edit this file; edit the
 # grammar file and regenerate.
 
 
-def hspace(stream, i, context):
-    # <Regex hspace>
+def hspaces(stream, i, context):
+    # <Regex hspaces>
     match1 = _regex1.match(stream, i)
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
-    else:
-        out = Miss
-    return out, i
-
-
-def hspaces(stream, i, context):
-    # <Star hspaces>
-    savei1 = i
-    times1 = 0
-    output1 = []
-    while i <= len(stream):
-        previ1 = i
-        out, i = hspace(stream, i, context)
-        if out is Miss:
-            break
-        if i <= previ1:
-            if stream.startswith('\x03', i) or i == len(stream):
-                break
-            raise Exception
-        if out is not Empty:
-            output1.append(out)
-        times1 += 1
-    if times1 >= 0:
-        out = output1
     else:
         out = Miss
-        i = savei1
     return out, i
 
 
@@ -49,7 +24,6 @@ def vspace(stream, i, context):
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
     else:
         out = Miss
     return out, i
@@ -62,6 +36,9 @@ def emptyline(stream, i, context):
     if active1:
         out, i = hspaces(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '\n\r':
+        active1 = False
+        out = Miss
     if active1:
         out, i = vspace(stream, i, context)
         active1 = out is not Miss
@@ -96,14 +73,19 @@ def emptylines(stream, i, context):
 
 
 def identifier(stream, i, context):
-    # <Regex identifier>
-    match1 = _regex4.match(stream, i)
-    if match1:
-        out = match1.group(0)
-        i = match1.end()
-        context.update(match1.groupdict())
+    # <Memo identifier>
+    key1 = ('memo1', i)
+    if key1 in context.cache:
+        out, i = context.cache[key1]
     else:
-        out = Miss
+        # <Regex '[A-Za-z_][A-Za-z_0-9]*'>
+        match1 = _regex4.match(stream, i)
+        if match1:
+            out = match1.group(0)
+            i = match1.end()
+        else:
+            out = Miss
+        context.cache[key1] = (out, i)
     return out, i
 
 
@@ -113,6 +95,9 @@ def dottedname(stream, i, context):
     # <Seq>
     savei2 = i
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         out, i = identifier(stream, i, context)
         active1 = out is not Miss
@@ -137,6 +122,9 @@ def dottedname(stream, i, context):
                 else:
                     out = Miss
                 active2 = out is not Miss
+            if active2 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+                active2 = False
+                out = Miss
             if active2:
                 out, i = identifier(stream, i, context)
                 active2 = out is not Miss
@@ -182,7 +170,6 @@ def import_(stream, i, context):
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         if out is not Miss:
@@ -204,6 +191,9 @@ def import_(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrzMYLBavoWj_CfGxgNkDRpOdyJXnEHbFmITZqushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'qid'>
         out, i = dottedname(stream, i, context)
@@ -221,6 +211,9 @@ def import_(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'n'>
         out, i = identifier(stream, i, context)
@@ -237,15 +230,6 @@ def import_(stream, i, context):
     return out, i
 
 
-def streamend(stream, i, context):
-    # <StreamEnd streamend>
-    if stream.startswith('\x03', i) or i >= len(stream):
-        out = Empty
-    else:
-        out = Miss
-    return out, i
-
-
 def anon_value1(stream, i, context):
     # <Value anon_value1>
     out = ()
@@ -301,7 +285,11 @@ def arguments(stream, i, context):
     # <Or arguments>
     targets = arguments_fm1[None]
     if i < len(stream):
-        targets = arguments_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = arguments_ft1[code1]
+        else:
+            targets = arguments_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -315,79 +303,6 @@ def arguments(stream, i, context):
     return out, i
 
 
-def call2(stream, i, context):
-    # <Seq call2>
-    savei1 = i
-    savectx1 = context
-    context = context.push()
-    active1 = True
-    if active1:
-        # <Bind 'mod'>
-        out, i = identifier(stream, i, context)
-        if out is not Miss:
-            context['mod'] = out
-        active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in '.':
-        active1 = False
-        out = Miss
-    if active1:
-        # <String '.'>
-        if stream.startswith('.', i):
-            out = '.'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Bind 'name'>
-        out, i = identifier(stream, i, context)
-        if out is not Miss:
-            context['name'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Bind 'args'>
-        out, i = arguments(stream, i, context)
-        if out is not Miss:
-            context['args'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Do rules.Call2(mod, name, args)>
-        out = eval(_do2, globals(), context)
-        active1 = out is not Miss
-    context = savectx1
-    if not active1:
-        i = savei1
-    return out, i
-
-
-def call(stream, i, context):
-    # <Seq call>
-    savei1 = i
-    savectx1 = context
-    context = context.push()
-    active1 = True
-    if active1:
-        # <Bind 'name'>
-        out, i = identifier(stream, i, context)
-        if out is not Miss:
-            context['name'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Bind 'args'>
-        out, i = arguments(stream, i, context)
-        if out is not Miss:
-            context['args'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Do rules.Call(name, args)>
-        out = eval(_do3, globals(), context)
-        active1 = out is not Miss
-    context = savectx1
-    if not active1:
-        i = savei1
-    return out, i
-
-
 def wall_(stream, i, context):
     # <Seq wall_>
     savei1 = i
@@ -405,6 +320,9 @@ def wall_(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'n'>
         out, i = identifier(stream, i, context)
@@ -413,7 +331,7 @@ def wall_(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Wall(n)>
-        out = eval(_do4, globals(), context)
+        out = eval(_do2, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -458,7 +376,7 @@ def action2(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.DoCode(code)>
-        out = eval(_do5, globals(), context)
+        out = eval(_do3, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -503,7 +421,7 @@ def action1(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Do(code)>
-        out = eval(_do6, globals(), context)
+        out = eval(_do4, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -522,122 +440,67 @@ def any_(stream, i, context):
 
 
 def bs(stream, i, context):
-    # <Seq bs>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'b':
-        active1 = False
+    # <Replace bs>
+    # <String 'b'>
+    if stream.startswith('b', i):
+        out = 'b'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'b'>
-        if stream.startswith('b', i):
-            out = 'b'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\x08'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def ff(stream, i, context):
-    # <Seq ff>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'f':
-        active1 = False
+    # <Replace ff>
+    # <String 'f'>
+    if stream.startswith('f', i):
+        out = 'f'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'f'>
-        if stream.startswith('f', i):
-            out = 'f'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\x0c'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def lf(stream, i, context):
-    # <Seq lf>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'n':
-        active1 = False
+    # <Replace lf>
+    # <String 'n'>
+    if stream.startswith('n', i):
+        out = 'n'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'n'>
-        if stream.startswith('n', i):
-            out = 'n'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\n'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def cr(stream, i, context):
-    # <Seq cr>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'r':
-        active1 = False
+    # <Replace cr>
+    # <String 'r'>
+    if stream.startswith('r', i):
+        out = 'r'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'r'>
-        if stream.startswith('r', i):
-            out = 'r'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\r'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def tab(stream, i, context):
-    # <Seq tab>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 't':
-        active1 = False
+    # <Replace tab>
+    # <String 't'>
+    if stream.startswith('t', i):
+        out = 't'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 't'>
-        if stream.startswith('t', i):
-            out = 't'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\t'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
@@ -704,7 +567,7 @@ def hx(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do chr(int(x, 16))>
-        out = eval(_do7, globals(), context)
+        out = eval(_do5, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -733,7 +596,11 @@ def escchar(stream, i, context):
         # <Or>
         targets = None_fm1[None]
         if i < len(stream):
-            targets = None_fm1.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft1[code1]
+            else:
+                targets = None_fm1.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -804,7 +671,7 @@ def dqstring(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip1.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -824,7 +691,7 @@ def dqstring(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do ''.join(s)>
-        out = eval(_do8, globals(), context)
+        out = eval(_do6, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -885,7 +752,7 @@ def sqstring(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip2.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -905,7 +772,7 @@ def sqstring(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do ''.join(s)>
-        out = eval(_do8, globals(), context)
+        out = eval(_do6, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -927,7 +794,11 @@ def string(stream, i, context):
         # <Or>
         targets = None_fm2[None]
         if i < len(stream):
-            targets = None_fm2.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft2[code1]
+            else:
+                targets = None_fm2.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -943,7 +814,7 @@ def string(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.String(s)>
-        out = eval(_do9, globals(), context)
+        out = eval(_do7, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -951,56 +822,17 @@ def string(stream, i, context):
     return out, i
 
 
-def comment(stream, i, context):
-    # <Regex comment>
+def ws(stream, i, context):
+    # <Regex ws>
     match1 = _regex7.match(stream, i)
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
     else:
         out = Miss
     return out, i
 
 
-def ws(stream, i, context):
-    # <Star ws>
-    savei1 = i
-    times1 = 0
-    output1 = []
-    while i <= len(stream):
-        previ1 = i
-        # <Or>
-        targets = None_fm3[None]
-        if i < len(stream):
-            targets = None_fm3.get(stream[i], targets)
-        if targets:
-            for rule in targets:
-                out, new = rule(stream, i, context)
-                if out is not Miss:
-                    i = new
-                    break
-            else:
-                out = Miss
-        else:
-            out = Miss
-        if out is Miss:
-            break
-        if i <= previ1:
-            if stream.startswith('\x03', i) or i == len(stream):
-                break
-            raise Exception
-        if out is not Empty:
-            output1.append(out)
-        times1 += 1
-    if times1 >= 0:
-        out = output1
-    else:
-        out = Miss
-        i = savei1
-    return out, i
-
-
 def brackets(stream, i, context):
     # <Seq brackets>
     savei1 = i
@@ -1021,6 +853,9 @@ def brackets(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'inside'>
         out, i = expr(stream, i, context)
@@ -1080,7 +915,7 @@ def value(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Do(v)>
-        out = eval(_do10, globals(), context)
+        out = eval(_do8, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1125,7 +960,7 @@ def regex(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip3.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -1145,7 +980,7 @@ def regex(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Regex(''.join(chars))>
-        out = eval(_do11, globals(), context)
+        out = eval(_do9, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1170,6 +1005,9 @@ def take(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'trule'>
         out, i = expr(stream, i, context)
@@ -1192,7 +1030,7 @@ def take(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Take(trule)>
-        out = eval(_do12, globals(), context)
+        out = eval(_do10, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1252,9 +1090,13 @@ def firsts(stream, i, context):
                 active2 = out is not Miss
             if active2:
                 # <Or>
-                targets = None_fm4[None]
+                targets = None_fm3[None]
                 if i < len(stream):
-                    targets = None_fm4.get(stream[i], targets)
+                    code1 = _ord(stream[i])
+                    if code1 < 256:
+                        targets = None_ft3[code1]
+                    else:
+                        targets = None_fm3.get(stream[i], targets)
                 if targets:
                     for rule in targets:
                         out, new = rule(stream, i, context)
@@ -1301,7 +1143,7 @@ def firsts(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.FirstChars(chars)>
-        out = eval(_do13, globals(), context)
+        out = eval(_do11, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1346,7 +1188,7 @@ def predicate2(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.IfCode(code)>
-        out = eval(_do14, globals(), context)
+        out = eval(_do12, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1391,7 +1233,7 @@ def predicate1(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.If(code)>
-        out = eval(_do15, globals(), context)
+        out = eval(_do13, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1422,6 +1264,9 @@ def anon_seq2(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         out, i = expr1(stream, i, context)
         active1 = out is not Miss
@@ -1454,6 +1299,9 @@ def mixed(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'until'>
         out, i = expr1(stream, i, context)
@@ -1463,9 +1311,13 @@ def mixed(stream, i, context):
     if active1:
         # <Bind 'target'>
         # <Or>
-        targets = None_fm5[None]
+        targets = None_fm4[None]
         if i < len(stream):
-            targets = None_fm5.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft4[code1]
+            else:
+                targets = None_fm4.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -1492,6 +1344,88 @@ def mixed(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do rules.Mixed(until, target)>
+        out = eval(_do14, globals(), context)
+        active1 = out is not Miss
+    context = savectx1
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def call2(stream, i, context):
+    # <Seq call2>
+    savei1 = i
+    savectx1 = context
+    context = context.push()
+    active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
+    if active1:
+        # <Bind 'mod'>
+        out, i = identifier(stream, i, context)
+        if out is not Miss:
+            context['mod'] = out
+        active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '.':
+        active1 = False
+        out = Miss
+    if active1:
+        # <String '.'>
+        if stream.startswith('.', i):
+            out = '.'
+            i += 1
+        else:
+            out = Miss
+        active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
+    if active1:
+        # <Bind 'name'>
+        out, i = identifier(stream, i, context)
+        if out is not Miss:
+            context['name'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Bind 'args'>
+        out, i = arguments(stream, i, context)
+        if out is not Miss:
+            context['args'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Do rules.Call2(mod, name, args)>
+        out = eval(_do15, globals(), context)
+        active1 = out is not Miss
+    context = savectx1
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def call(stream, i, context):
+    # <Seq call>
+    savei1 = i
+    savectx1 = context
+    context = context.push()
+    active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
+    if active1:
+        # <Bind 'name'>
+        out, i = identifier(stream, i, context)
+        if out is not Miss:
+            context['name'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Bind 'args'>
+        out, i = arguments(stream, i, context)
+        if out is not Miss:
+            context['args'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Do rules.Call(name, args)>
         out = eval(_do16, globals(), context)
         active1 = out is not Miss
     context = savectx1
@@ -1553,7 +1487,7 @@ def among(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip4.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -1601,6 +1535,9 @@ def extent(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'erule'>
         out, i = expr(stream, i, context)
@@ -1635,7 +1572,11 @@ def atom(stream, i, context):
     # <Or atom>
     targets = atom_fm1[None]
     if i < len(stream):
-        targets = atom_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = atom_ft1[code1]
+        else:
+            targets = atom_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1666,6 +1607,9 @@ def anon_seq3(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfGgkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'a'>
         out, i = atom(stream, i, context)
@@ -1686,7 +1630,11 @@ def expr1(stream, i, context):
     # <Or expr1>
     targets = expr1_fm1[None]
     if i < len(stream):
-        targets = expr1_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = expr1_ft1[code1]
+        else:
+            targets = expr1_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1717,6 +1665,9 @@ def fail(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'frule'>
         out, i = expr1(stream, i, context)
@@ -1761,6 +1712,9 @@ def anon_seq4(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e1'>
         out, i = expr1(stream, i, context)
@@ -1794,6 +1748,9 @@ def anon_seq5(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e1'>
         out, i = expr1(stream, i, context)
@@ -1827,6 +1784,9 @@ def anon_seq6(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLaYvoWj_C<xfG^gkN>DRp[OdyJXn@EHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e1'>
         out, i = expr1(stream, i, context)
@@ -1847,7 +1807,11 @@ def tildable(stream, i, context):
     # <Or tildable>
     targets = tildable_fm1[None]
     if i < len(stream):
-        targets = tildable_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = tildable_ft1[code1]
+        else:
+            targets = tildable_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2062,7 +2026,11 @@ def barenum(stream, i, context):
     # <Or barenum>
     targets = barenum_fm1[None]
     if i < len(stream):
-        targets = barenum_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = barenum_ft1[code1]
+        else:
+            targets = barenum_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2094,15 +2062,18 @@ def anon_seq11(stream, i, context):
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         active1 = out is not Miss
     if active1:
         # <Or>
-        targets = None_fm6[None]
+        targets = None_fm5[None]
         if i < len(stream):
-            targets = None_fm6.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft5[code1]
+            else:
+                targets = None_fm5.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -2143,7 +2114,7 @@ def repeattimes(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in '0761824953':
+    if active1 and i < len(stream) and stream[i] not in '7920845613':
         active1 = False
         out = Miss
     if active1:
@@ -2155,9 +2126,13 @@ def repeattimes(stream, i, context):
     if active1:
         # <Bind 'mx'>
         # <Or>
-        targets = None_fm7[None]
+        targets = None_fm6[None]
         if i < len(stream):
-            targets = None_fm7.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft6[code1]
+            else:
+                targets = None_fm6.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -2221,7 +2196,11 @@ def postfixes(stream, i, context):
     # <Or postfixes>
     targets = postfixes_fm1[None]
     if i < len(stream):
-        targets = postfixes_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = postfixes_ft1[code1]
+        else:
+            targets = postfixes_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2241,6 +2220,9 @@ def repeatable(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'SzrAKQU-M.BLa~voWj_C<xfG^gkN>DRp[OdyJXn@EYHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e2'>
         out, i = tildable(stream, i, context)
@@ -2279,6 +2261,9 @@ def anon_seq12(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'n'>
         out, i = identifier(stream, i, context)
@@ -2301,6 +2286,9 @@ def bindable(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'SAKzrQU-M.BLa~voWj_C<xfG^gkN>DRp[OdyJXn@EYHb!Fm"I(?TZ\'/qushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e3a'>
         out, i = repeatable(stream, i, context)
@@ -2309,9 +2297,13 @@ def bindable(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Or>
-        targets = None_fm8[None]
+        targets = None_fm7[None]
         if i < len(stream):
-            targets = None_fm8.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft7[code1]
+            else:
+                targets = None_fm7.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -2329,6 +2321,17 @@ def bindable(stream, i, context):
     return out, i
 
 
+def hspace(stream, i, context):
+    # <Regex hspace>
+    match1 = _regex9.match(stream, i)
+    if match1:
+        out = match1.group(0)
+        i = match1.end()
+    else:
+        out = Miss
+    return out, i
+
+
 def anon_seq13(stream, i, context):
     # <Seq anon_seq13>
     savei1 = i
@@ -2364,13 +2367,15 @@ def anon_seq13(stream, i, context):
             out = Miss
             i = savei2
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '\t ':
+        active1 = False
+        out = Miss
     if active1:
         # <Regex '[ \t]+'>
-        match1 = _regex9.match(stream, i)
+        match1 = _regex10.match(stream, i)
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         active1 = out is not Miss
@@ -2385,6 +2390,9 @@ def seqable(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e3'>
         out, i = bindable(stream, i, context)
@@ -2406,9 +2414,13 @@ def seqable(stream, i, context):
             active2 = True
             if active2:
                 # <Or>
-                targets = None_fm9[None]
+                targets = None_fm8[None]
                 if i < len(stream):
-                    targets = None_fm9.get(stream[i], targets)
+                    code1 = _ord(stream[i])
+                    if code1 < 256:
+                        targets = None_ft8[code1]
+                    else:
+                        targets = None_fm8.get(stream[i], targets)
                 if targets:
                     for rule in targets:
                         out, new = rule(stream, i, context)
@@ -2420,6 +2432,9 @@ def seqable(stream, i, context):
                 else:
                     out = Miss
                 active2 = out is not Miss
+            if active2 and i < len(stream) and stream[i] not in 'SAKzrQU-M.BLa~voWj_C<xfG^gkN>DRp[OdyJXn@EYHb!Fm"I(?TZ\'/qushticVewlP':
+                active2 = False
+                out = Miss
             if active2:
                 # <Bind 'e3a'>
                 out, i = repeatable(stream, i, context)
@@ -2428,9 +2443,13 @@ def seqable(stream, i, context):
                 active2 = out is not Miss
             if active2:
                 # <Or>
-                targets = None_fm8[None]
+                targets = None_fm7[None]
                 if i < len(stream):
-                    targets = None_fm8.get(stream[i], targets)
+                    code2 = _ord(stream[i])
+                    if code2 < 256:
+                        targets = None_ft7[code2]
+                    else:
+                        targets = None_fm7.get(stream[i], targets)
                 if targets:
                     for rule in targets:
                         out, new = rule(stream, i, context)
@@ -2478,6 +2497,9 @@ def expr(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e4'>
         out, i = seqable(stream, i, context)
@@ -2514,6 +2536,9 @@ def expr(stream, i, context):
             if active2:
                 out, i = ws(stream, i, context)
                 active2 = out is not Miss
+            if active2 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+                active2 = False
+                out = Miss
             if active2:
                 # <Bind 'e3'>
                 out, i = bindable(stream, i, context)
@@ -2535,9 +2560,13 @@ def expr(stream, i, context):
                     active3 = True
                     if active3:
                         # <Or>
-                        targets = None_fm9[None]
+                        targets = None_fm8[None]
                         if i < len(stream):
-                            targets = None_fm9.get(stream[i], targets)
+                            code1 = _ord(stream[i])
+                            if code1 < 256:
+                                targets = None_ft8[code1]
+                            else:
+                                targets = None_fm8.get(stream[i], targets)
                         if targets:
                             for rule in targets:
                                 out, new = rule(stream, i, context)
@@ -2549,6 +2578,9 @@ def expr(stream, i, context):
                         else:
                             out = Miss
                         active3 = out is not Miss
+                    if active3 and i < len(stream) and stream[i] not in 'SAKzrQU-M.BLa~voWj_C<xfG^gkN>DRp[OdyJXn@EYHb!Fm"I(?TZ\'/qushticVewlP':
+                        active3 = False
+                        out = Miss
                     if active3:
                         # <Bind 'e3a'>
                         out, i = repeatable(stream, i, context)
@@ -2557,9 +2589,13 @@ def expr(stream, i, context):
                         active3 = out is not Miss
                     if active3:
                         # <Or>
-                        targets = None_fm8[None]
+                        targets = None_fm7[None]
                         if i < len(stream):
-                            targets = None_fm8.get(stream[i], targets)
+                            code2 = _ord(stream[i])
+                            if code2 < 256:
+                                targets = None_ft7[code2]
+                            else:
+                                targets = None_fm7.get(stream[i], targets)
                         if targets:
                             for rule in targets:
                                 out, new = rule(stream, i, context)
@@ -2626,27 +2662,22 @@ def expr(stream, i, context):
 
 
 def vspaces(stream, i, context):
-    # <Star vspaces>
-    savei1 = i
-    times1 = 0
-    output1 = []
-    while i <= len(stream):
-        previ1 = i
-        out, i = vspace(stream, i, context)
-        if out is Miss:
-            break
-        if i <= previ1:
-            if stream.startswith('\x03', i) or i == len(stream):
-                break
-            raise Exception
-        if out is not Empty:
-            output1.append(out)
-        times1 += 1
-    if times1 >= 0:
-        out = output1
+    # <Regex vspaces>
+    match1 = _regex11.match(stream, i)
+    if match1:
+        out = match1.group(0)
+        i = match1.end()
+    else:
+        out = Miss
+    return out, i
+
+
+def streamend(stream, i, context):
+    # <StreamEnd streamend>
+    if stream.startswith('\x03', i) or i >= len(stream):
+        out = Empty
     else:
         out = Miss
-        i = savei1
     return out, i
 
 
@@ -2657,12 +2688,11 @@ def assignment(stream, i, context):
     context = context.push()
     active1 = True
     if active1:
-        # <Not>
-        out, i = streamend(stream, i, context)
-        if out is Miss:
-            out = Empty
-        else:
+        # <NotStreamEnd>
+        if stream.startswith('\x03', i) or i >= len(stream):
             out = Miss
+        else:
+            out = Empty
         active1 = out is not Miss
     if active1:
         out, i = emptylines(stream, i, context)
@@ -2676,7 +2706,6 @@ def assignment(stream, i, context):
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         if out is not Miss:
@@ -2687,6 +2716,9 @@ def assignment(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'n'>
         out, i = identifier(stream, i, context)
@@ -2705,10 +2737,12 @@ def assignment(stream, i, context):
         if match2:
             out = match2.group(0)
             i = match2.end()
-            context.update(match2.groupdict())
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in 'zrU-MLYa~oWj_<f^NRp[yJ@Fm"I(?Z/qucewlPSAKQ.BvCxGgk>DOdXnEHb!T\'shtiV':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'e'>
         out, i = expr(stream, i, context)
@@ -2720,9 +2754,13 @@ def assignment(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Or>
-        targets = None_fm10[None]
+        targets = None_fm9[None]
         if i < len(stream):
-            targets = None_fm10.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft9[code1]
+            else:
+                targets = None_fm9.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -2821,7 +2859,7 @@ def grammar(stream, i, context):
     return out, i
 
 
-_regex1 = re.compile('[ \t]|#[^\n]*')
+_regex1 = re.compile('(?:[ \t]|#[^\n]*)*')
 _regex2 = re.compile('\r\n|[\r\n]')
 _regex3 = re.compile('[ \t]+')
 _regex4 = re.compile('[A-Za-z_][A-Za-z_0-9]*')
@@ -2831,14 +2869,14 @@ arguments_fm1 = {
     None: (anon_value1,),
     '(': (anon_seq1, anon_value1,),
 }
+arguments_ft1 = rules.firstmap_table(arguments_fm1)
 _regex6 = re.compile(' *= *')
-_do2 = rules.compile_expr('rules.Call2(mod, name, args)')
-_do3 = rules.compile_expr('rules.Call(name, args)')
-_do4 = rules.compile_expr('rules.Wall(n)')
-_do5 = rules.compile_expr('rules.DoCode(code)')
-_do6 = rules.compile_expr('rules.Do(code)')
+_do2 = rules.compile_expr('rules.Wall(n)')
+_do3 = rules.compile_expr('rules.DoCode(code)')
+_do4 = rules.compile_expr('rules.Do(code)')
+_skip1 = re.compile('[^"\\\\]*')
 _charset1 = '0123456789ABCDEFabcdef'
-_do7 = rules.compile_expr('chr(int(x, 16))')
+_do5 = rules.compile_expr('chr(int(x, 16))')
 None_fm1 = {
     None: (any_,),
     'b': (bs, any_,),
@@ -2848,89 +2886,254 @@ None_fm1 = {
     't': (tab, any_,),
     'x': (hx, any_,),
 }
-_do8 = rules.compile_expr("''.join(s)")
+None_ft1 = rules.firstmap_table(None_fm1)
+_do6 = rules.compile_expr("''.join(s)")
+_skip2 = re.compile("[^'\\\\]*")
 None_fm2 = {
     None: (),
     '"': (dqstring,),
     "'": (sqstring,),
 }
-_do9 = rules.compile_expr('rules.String(s)')
-_regex7 = re.compile('#[^\n]*')
+None_ft2 = rules.firstmap_table(None_fm2)
+_do7 = rules.compile_expr('rules.String(s)')
+_regex7 = re.compile('(?:[ \t\r\n]|#[^\n]*)*')
+_do8 = rules.compile_expr('rules.Do(v)')
+_skip3 = re.compile('[^/]*')
+_do9 = rules.compile_expr("rules.Regex(''.join(chars))")
+_do10 = rules.compile_expr('rules.Take(trule)')
 None_fm3 = {
-    None: (hspace, vspace, comment,),
-}
-_do10 = rules.compile_expr('rules.Do(v)')
-_do11 = rules.compile_expr("rules.Regex(''.join(chars))")
-_do12 = rules.compile_expr('rules.Take(trule)')
-None_fm4 = {
     None: (any_,),
     '\\': (escchar, any_,),
 }
-_do13 = rules.compile_expr('rules.FirstChars(chars)')
-_do14 = rules.compile_expr('rules.IfCode(code)')
-_do15 = rules.compile_expr('rules.If(code)')
-None_fm5 = {
+None_ft3 = rules.firstmap_table(None_fm3)
+_do11 = rules.compile_expr('rules.FirstChars(chars)')
+_do12 = rules.compile_expr('rules.IfCode(code)')
+_do13 = rules.compile_expr('rules.If(code)')
+None_fm4 = {
     None: (anon_seq2, anon_value2,),
 }
-_do16 = rules.compile_expr('rules.Mixed(until, target)')
+None_ft4 = rules.firstmap_table(None_fm4)
+_do14 = rules.compile_expr('rules.Mixed(until, target)')
+_do15 = rules.compile_expr('rules.Call2(mod, name, args)')
+_do16 = rules.compile_expr('rules.Call(name, args)')
+_skip4 = re.compile('[^\\\\\\]]*')
 _do17 = rules.compile_expr("rules.Among(''.join(items))")
 _do18 = rules.compile_expr('rules.Extent(erule)')
 atom_fm1 = {
-    None: (call2, call,),
-    '!': (wall_, action2, action1, call2, call,),
-    '"': (string, call2, call,),
-    "'": (string, call2, call,),
-    '(': (brackets, call2, call,),
-    '-': (value, call2, call,),
-    '.': (fail, call2, call,),
-    '/': (regex, call2, call,),
-    '<': (take, call2, call,),
-    '>': (firsts, call2, call,),
-    '?': (predicate2, predicate1, call2, call,),
-    '@': (mixed, call2, call,),
-    '[': (among, call2, call,),
+    None: (),
+    '!': (wall_, action2, action1,),
+    '"': (string,),
+    "'": (string,),
+    '(': (brackets,),
+    '-': (value,),
+    '.': (fail,),
+    '/': (regex,),
+    '<': (take,),
+    '>': (firsts,),
+    '?': (predicate2, predicate1,),
+    '@': (mixed,),
+    'A': (call2, call,),
+    'B': (call2, call,),
+    'C': (call2, call,),
+    'D': (call2, call,),
+    'E': (call2, call,),
+    'F': (call2, call,),
+    'G': (call2, call,),
+    'H': (call2, call,),
+    'I': (call2, call,),
+    'J': (call2, call,),
+    'K': (call2, call,),
+    'L': (call2, call,),
+    'M': (call2, call,),
+    'N': (call2, call,),
+    'O': (call2, call,),
+    'P': (call2, call,),
+    'Q': (call2, call,),
+    'R': (call2, call,),
+    'S': (call2, call,),
+    'T': (call2, call,),
+    'U': (call2, call,),
+    'V': (call2, call,),
+    'W': (call2, call,),
+    'X': (call2, call,),
+    'Y': (call2, call,),
+    'Z': (call2, call,),
+    '[': (among,),
+    '_': (call2, call,),
+    'a': (call2, call,),
+    'b': (call2, call,),
+    'c': (call2, call,),
+    'd': (call2, call,),
+    'e': (call2, call,),
+    'f': (call2, call,),
+    'g': (call2, call,),
+    'h': (call2, call,),
+    'i': (call2, call,),
+    'j': (call2, call,),
+    'k': (call2, call,),
+    'l': (call2, call,),
+    'm': (call2, call,),
+    'n': (call2, call,),
+    'o': (call2, call,),
+    'p': (call2, call,),
+    'q': (call2, call,),
+    'r': (call2, call,),
+    's': (call2, call,),
+    't': (call2, call,),
+    'u': (call2, call,),
+    'v': (call2, call,),
+    'w': (call2, call,),
     'x': (extent, call2, call,),
+    'y': (call2, call,),
+    'z': (call2, call,),
 }
+atom_ft1 = rules.firstmap_table(atom_fm1)
 _do19 = rules.compile_expr('rules.LookBehind(a)')
 expr1_fm1 = {
-    None: (call2, call,),
-    '!': (wall_, action2, action1, call2, call,),
-    '"': (string, call2, call,),
-    "'": (string, call2, call,),
-    '(': (brackets, call2, call,),
-    '-': (value, call2, call,),
-    '.': (fail, call2, call,),
-    '/': (regex, call2, call,),
-    '<': (take, call2, call,),
-    '>': (firsts, call2, call,),
-    '?': (predicate2, predicate1, call2, call,),
-    '@': (mixed, call2, call,),
-    '[': (among, call2, call,),
-    '^': (anon_seq3, call2, call,),
+    None: (),
+    '!': (wall_, action2, action1,),
+    '"': (string,),
+    "'": (string,),
+    '(': (brackets,),
+    '-': (value,),
+    '.': (fail,),
+    '/': (regex,),
+    '<': (take,),
+    '>': (firsts,),
+    '?': (predicate2, predicate1,),
+    '@': (mixed,),
+    'A': (call2, call,),
+    'B': (call2, call,),
+    'C': (call2, call,),
+    'D': (call2, call,),
+    'E': (call2, call,),
+    'F': (call2, call,),
+    'G': (call2, call,),
+    'H': (call2, call,),
+    'I': (call2, call,),
+    'J': (call2, call,),
+    'K': (call2, call,),
+    'L': (call2, call,),
+    'M': (call2, call,),
+    'N': (call2, call,),
+    'O': (call2, call,),
+    'P': (call2, call,),
+    'Q': (call2, call,),
+    'R': (call2, call,),
+    'S': (call2, call,),
+    'T': (call2, call,),
+    'U': (call2, call,),
+    'V': (call2, call,),
+    'W': (call2, call,),
+    'X': (call2, call,),
+    'Y': (call2, call,),
+    'Z': (call2, call,),
+    '[': (among,),
+    '^': (anon_seq3,),
+    '_': (call2, call,),
+    'a': (call2, call,),
+    'b': (call2, call,),
+    'c': (call2, call,),
+    'd': (call2, call,),
+    'e': (call2, call,),
+    'f': (call2, call,),
+    'g': (call2, call,),
+    'h': (call2, call,),
+    'i': (call2, call,),
+    'j': (call2, call,),
+    'k': (call2, call,),
+    'l': (call2, call,),
+    'm': (call2, call,),
+    'n': (call2, call,),
+    'o': (call2, call,),
+    'p': (call2, call,),
+    'q': (call2, call,),
+    'r': (call2, call,),
+    's': (call2, call,),
+    't': (call2, call,),
+    'u': (call2, call,),
+    'v': (call2, call,),
+    'w': (call2, call,),
     'x': (extent, call2, call,),
+    'y': (call2, call,),
+    'z': (call2, call,),
 }
+expr1_ft1 = rules.firstmap_table(expr1_fm1)
 _do20 = rules.compile_expr('rules.FailIf(frule)')
 _do21 = rules.compile_expr('rules.Not(rules.Peek(e1))')
 _do22 = rules.compile_expr('rules.Peek(e1)')
 _do23 = rules.compile_expr('rules.Not(e1)')
 tildable_fm1 = {
-    None: (call2, call,),
-    '!': (wall_, action2, action1, call2, call,),
-    '"': (string, call2, call,),
-    "'": (string, call2, call,),
-    '(': (brackets, call2, call,),
-    '-': (value, call2, call,),
-    '.': (fail, call2, call,),
-    '/': (regex, call2, call,),
-    '<': (take, call2, call,),
-    '>': (firsts, call2, call,),
-    '?': (predicate2, predicate1, call2, call,),
-    '@': (mixed, call2, call,),
-    '[': (among, call2, call,),
-    '^': (anon_seq3, call2, call,),
+    None: (),
+    '!': (wall_, action2, action1,),
+    '"': (string,),
+    "'": (string,),
+    '(': (brackets,),
+    '-': (value,),
+    '.': (fail,),
+    '/': (regex,),
+    '<': (take,),
+    '>': (firsts,),
+    '?': (predicate2, predicate1,),
+    '@': (mixed,),
+    'A': (call2, call,),
+    'B': (call2, call,),
+    'C': (call2, call,),
+    'D': (call2, call,),
+    'E': (call2, call,),
+    'F': (call2, call,),
+    'G': (call2, call,),
+    'H': (call2, call,),
+    'I': (call2, call,),
+    'J': (call2, call,),
+    'K': (call2, call,),
+    'L': (call2, call,),
+    'M': (call2, call,),
+    'N': (call2, call,),
+    'O': (call2, call,),
+    'P': (call2, call,),
+    'Q': (call2, call,),
+    'R': (call2, call,),
+    'S': (call2, call,),
+    'T': (call2, call,),
+    'U': (call2, call,),
+    'V': (call2, call,),
+    'W': (call2, call,),
+    'X': (call2, call,),
+    'Y': (call2, call,),
+    'Z': (call2, call,),
+    '[': (among,),
+    '^': (anon_seq3,),
+    '_': (call2, call,),
+    'a': (call2, call,),
+    'b': (call2, call,),
+    'c': (call2, call,),
+    'd': (call2, call,),
+    'e': (call2, call,),
+    'f': (call2, call,),
+    'g': (call2, call,),
+    'h': (call2, call,),
+    'i': (call2, call,),
+    'j': (call2, call,),
+    'k': (call2, call,),
+    'l': (call2, call,),
+    'm': (call2, call,),
+    'n': (call2, call,),
+    'o': (call2, call,),
+    'p': (call2, call,),
+    'q': (call2, call,),
+    'r': (call2, call,),
+    's': (call2, call,),
+    't': (call2, call,),
+    'u': (call2, call,),
+    'v': (call2, call,),
+    'w': (call2, call,),
     'x': (extent, call2, call,),
-    '~': (anon_seq4, anon_seq5, anon_seq6, call2, call,),
+    'y': (call2, call,),
+    'z': (call2, call,),
+    '~': (anon_seq4, anon_seq5, anon_seq6,),
 }
+tildable_ft1 = rules.firstmap_table(tildable_fm1)
 _do24 = rules.compile_expr('rules.Star(e2)')
 _do25 = rules.compile_expr('rules.Plus(e2)')
 _do26 = rules.compile_expr('rules.Opt(e2)')
@@ -2950,8 +3153,9 @@ barenum_fm1 = {
     '8': (decnum,),
     '9': (decnum,),
 }
+barenum_ft1 = rules.firstmap_table(barenum_fm1)
 _regex8 = re.compile(' *, *')
-None_fm6 = {
+None_fm5 = {
     None: (anon_value3,),
     '0': (decnum, hexnum, anon_value3,),
     '1': (decnum, anon_value3,),
@@ -2964,9 +3168,11 @@ None_fm6 = {
     '8': (decnum, anon_value3,),
     '9': (decnum, anon_value3,),
 }
-None_fm7 = {
+None_ft5 = rules.firstmap_table(None_fm5)
+None_fm6 = {
     None: (anon_seq11, anon_get2,),
 }
+None_ft6 = rules.firstmap_table(None_fm6)
 _do29 = rules.compile_expr('(mn, mx)')
 _do30 = rules.compile_expr('rules.Repeat(e2, *ts)')
 postfixes_fm1 = {
@@ -2976,21 +3182,30 @@ postfixes_fm1 = {
     '?': (anon_seq9, anon_get1,),
     '{': (anon_seq10, anon_get1,),
 }
+postfixes_ft1 = rules.firstmap_table(postfixes_fm1)
 _do31 = rules.compile_expr('rules.Bind(n, e3a)')
-None_fm8 = {
+None_fm7 = {
     None: (anon_get3,),
     ':': (anon_seq12, anon_get3,),
 }
-_regex9 = re.compile('[ \t]+')
-None_fm9 = {
-    None: (hspace, anon_seq13,),
+None_ft7 = rules.firstmap_table(None_fm7)
+_regex9 = re.compile('[ \t]|#[^\n]*')
+_regex10 = re.compile('[ \t]+')
+None_fm8 = {
+    None: (anon_seq13,),
+    '\t': (hspace, anon_seq13,),
+    ' ': (hspace, anon_seq13,),
+    '#': (hspace, anon_seq13,),
 }
+None_ft8 = rules.firstmap_table(None_fm8)
 _do32 = rules.compile_expr('rules.Seq(e3, *e3s) if e3s else e3')
 _do33 = rules.compile_expr('rules.Or(e4, *e4s) if e4s else e4')
-None_fm10 = {
+_regex11 = re.compile('[\r\n]*')
+None_fm9 = {
     None: (vspaces,),
     '\x03': (vspaces, streamend,),
 }
+None_ft9 = rules.firstmap_table(None_fm9)
 _do34 = rules.compile_expr('(n, rules.Params(e, args) if args else e)')
 _do35 = rules.compile_expr('(dict(imps), dict(rs))')
 
@@ -1,6 +1,7 @@
 import re
 from bookish.parser import rules
 from bookish.parser.rules import Empty, Failure, Miss
+from builtins import ord as _ord
 import bookish.parser.bootstrap as bs
 import bookish.parser.rules as r
 import bookish.wiki.wikipages as w
@@ -16,7 +17,6 @@ def hspaces(stream, i, context):
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
     else:
         out = Miss
     return out, i
@@ -119,7 +119,6 @@ def hspace(stream, i, context):
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
     else:
         out = Miss
     return out, i
@@ -149,7 +148,11 @@ def vspace(stream, i, context):
     # <Or vspace>
     targets = vspace_fm1[None]
     if i < len(stream):
-        targets = vspace_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = vspace_ft1[code1]
+        else:
+            targets = vspace_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -173,7 +176,11 @@ def ws(stream, i, context):
         # <Or>
         targets = None_fm1[None]
         if i < len(stream):
-            targets = None_fm1.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft1[code1]
+            else:
+                targets = None_fm1.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -227,6 +234,9 @@ def identifier(stream, i, context):
             out = Empty
         i = savei2
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Take>
         savei3 = i
@@ -235,7 +245,6 @@ def identifier(stream, i, context):
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         if out is not Miss:
@@ -264,7 +273,7 @@ def anon_seq1(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -330,7 +339,11 @@ def codeblock(stream, i, context):
         # <Or>
         targets = None_fm2[None]
         if i < len(stream):
-            targets = None_fm2.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft2[code1]
+            else:
+                targets = None_fm2.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -364,7 +377,7 @@ def codeblock(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip1.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -389,7 +402,11 @@ def codeblock(stream, i, context):
         # <Or>
         targets = None_fm3[None]
         if i < len(stream):
-            targets = None_fm3.get(stream[i], targets)
+            code2 = _ord(stream[i])
+            if code2 < 256:
+                targets = None_ft3[code2]
+            else:
+                targets = None_fm3.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -634,122 +651,67 @@ def any_(stream, i, context):
 
 
 def bs(stream, i, context):
-    # <Seq bs>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'b':
-        active1 = False
+    # <Replace bs>
+    # <String 'b'>
+    if stream.startswith('b', i):
+        out = 'b'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'b'>
-        if stream.startswith('b', i):
-            out = 'b'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\x08'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def ff(stream, i, context):
-    # <Seq ff>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'f':
-        active1 = False
+    # <Replace ff>
+    # <String 'f'>
+    if stream.startswith('f', i):
+        out = 'f'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'f'>
-        if stream.startswith('f', i):
-            out = 'f'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\x0c'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def lf(stream, i, context):
-    # <Seq lf>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'n':
-        active1 = False
+    # <Replace lf>
+    # <String 'n'>
+    if stream.startswith('n', i):
+        out = 'n'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'n'>
-        if stream.startswith('n', i):
-            out = 'n'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\n'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def cr(stream, i, context):
-    # <Seq cr>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 'r':
-        active1 = False
+    # <Replace cr>
+    # <String 'r'>
+    if stream.startswith('r', i):
+        out = 'r'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 'r'>
-        if stream.startswith('r', i):
-            out = 'r'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\r'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
 def tab(stream, i, context):
-    # <Seq tab>
-    savei1 = i
-    active1 = True
-    if active1 and i < len(stream) and stream[i] not in 't':
-        active1 = False
+    # <Replace tab>
+    # <String 't'>
+    if stream.startswith('t', i):
+        out = 't'
+        i += 1
+    else:
         out = Miss
-    if active1:
-        # <String 't'>
-        if stream.startswith('t', i):
-            out = 't'
-            i += 1
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        # <Value>
+    if out is not Miss:
         out = '\t'
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
     return out, i
 
 
@@ -845,7 +807,11 @@ def escchar(stream, i, context):
         # <Or>
         targets = None_fm4[None]
         if i < len(stream):
-            targets = None_fm4.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft4[code1]
+            else:
+                targets = None_fm4.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -898,7 +864,7 @@ def anon_mixed1(stream, i, context):
                 output1.append(out)
                 lasti = i
         else:
-            i += 1
+            i = _skip2.match(stream, i + 1).end()
     if i > lasti:
         output1.append(stream[lasti:i])
     out = output1
@@ -958,7 +924,7 @@ def dqstring(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip3.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -992,6 +958,9 @@ def itemext(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in '\t ':
+        active1 = False
+        out = Miss
     if active1:
         # <Plus>
         savei2 = i
@@ -1021,7 +990,11 @@ def itemext(stream, i, context):
         # <Or>
         targets = None_fm5[None]
         if i < len(stream):
-            targets = None_fm5.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft5[code1]
+            else:
+                targets = None_fm5.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -1080,6 +1053,9 @@ def itemtype(stream, i, context):
             # <If n>
             out = Empty if eval(_if1, context.namespace, context) else Miss
             active2 = out is not Miss
+        if active2 and i < len(stream) and stream[i] not in ' \t':
+            active2 = False
+            out = Miss
         if active2:
             # <Call itemext()>
             out, i = itemext(stream, i, context)
@@ -1157,14 +1133,18 @@ def starters(stream, i, context):
     if active1:
         out, i = hspaces(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in '{/=#:~-*':
+    if active1 and i < len(stream) and stream[i] not in '#=*:{~/-':
         active1 = False
         out = Miss
     if active1:
         # <Or>
         targets = None_fm6[None]
         if i < len(stream):
-            targets = None_fm6.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft6[code1]
+            else:
+                targets = None_fm6.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -1215,7 +1195,11 @@ def break_(stream, i, context):
     # <Or break_>
     targets = break__fm1[None]
     if i < len(stream):
-        targets = break__fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = break__ft1[code1]
+        else:
+            targets = break__fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1274,7 +1258,7 @@ def html_comment(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip4.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -1375,7 +1359,7 @@ def line_comment(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip5.match(stream, i + 1).end()
         if i > lasti:
             output2.append(stream[lasti:i])
         out = output2
@@ -1400,7 +1384,11 @@ def comment(stream, i, context):
     # <Or comment>
     targets = comment_fm1[None]
     if i < len(stream):
-        targets = comment_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = comment_ft1[code1]
+        else:
+            targets = comment_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1442,7 +1430,7 @@ def env(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -1472,35 +1460,6 @@ def env(stream, i, context):
     return out, i
 
 
-def named_entity(stream, i, context):
-    # <Seq named_entity>
-    savei1 = i
-    savectx1 = context
-    context = context.push()
-    active1 = True
-    if active1:
-        # <Bind 'n'>
-        # <Regex '[A-Za-z]+'>
-        match1 = _regex4.match(stream, i)
-        if match1:
-            out = match1.group(0)
-            i = match1.end()
-            context.update(match1.groupdict())
-        else:
-            out = Miss
-        if out is not Miss:
-            context['n'] = out
-        active1 = out is not Miss
-    if active1:
-        # <Do util.decode_named_entity(n)>
-        out = eval(_do11, globals(), context)
-        active1 = out is not Miss
-    context = savectx1
-    if not active1:
-        i = savei1
-    return out, i
-
-
 def digit(stream, i, context):
     # <Among digit>
     if i < len(stream) and stream[i] in _charset5:
@@ -1553,7 +1512,7 @@ def chardec(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do int(d)>
-        out = eval(_do12, globals(), context)
+        out = eval(_do11, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1618,7 +1577,7 @@ def charhex(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do int(h, 16)>
-        out = eval(_do13, globals(), context)
+        out = eval(_do12, globals(), context)
         active1 = out is not Miss
     context = savectx1
     if not active1:
@@ -1630,7 +1589,11 @@ def charnum(stream, i, context):
     # <Or charnum>
     targets = charnum_fm1[None]
     if i < len(stream):
-        targets = charnum_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = charnum_ft1[code1]
+        else:
+            targets = charnum_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -1661,7 +1624,7 @@ def num_entity(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'x0761824953':
+    if active1 and i < len(stream) and stream[i] not in '7x920845613':
         active1 = False
         out = Miss
     if active1:
@@ -1672,6 +1635,37 @@ def num_entity(stream, i, context):
         active1 = out is not Miss
     if active1:
         # <Do util.unichr(num)>
+        out = eval(_do13, globals(), context)
+        active1 = out is not Miss
+    context = savectx1
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def named_entity(stream, i, context):
+    # <Seq named_entity>
+    savei1 = i
+    savectx1 = context
+    context = context.push()
+    active1 = True
+    if active1 and i < len(stream) and stream[i] not in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
+    if active1:
+        # <Bind 'n'>
+        # <Regex '[A-Za-z]+'>
+        match1 = _regex4.match(stream, i)
+        if match1:
+            out = match1.group(0)
+            i = match1.end()
+        else:
+            out = Miss
+        if out is not Miss:
+            context['n'] = out
+        active1 = out is not Miss
+    if active1:
+        # <Do util.decode_named_entity(n)>
         out = eval(_do14, globals(), context)
         active1 = out is not Miss
     context = savectx1
@@ -1697,12 +1691,19 @@ def entity(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '#SAKQUrzMYLBavoWjCfGxgNkDRpOdyJXnEHbFmITZqushticVewlP':
+        active1 = False
+        out = Miss
     if active1:
         # <Bind 'char'>
         # <Or>
         targets = None_fm7[None]
         if i < len(stream):
-            targets = None_fm7.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft7[code1]
+            else:
+                targets = None_fm7.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -1769,7 +1770,11 @@ def keyname(stream, i, context):
             # <Or>
             targets = None_fm8[None]
             if i < len(stream):
-                targets = None_fm8.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft8[code1]
+                else:
+                    targets = None_fm8.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -1786,7 +1791,7 @@ def keyname(stream, i, context):
                 break
             elif out is not Miss:
                 break
-        i += 1
+        i = _skip6.match(stream, i + 1).end()
     if i > lasti:
         output1.append(stream[lasti:i])
     out = output1
@@ -1799,6 +1804,34 @@ def anon_seq4(stream, i, context):
     # <Seq anon_seq4>
     savei1 = i
     active1 = True
+    if active1:
+        # <Not>
+        # <String '('>
+        if stream.startswith('(', i):
+            out = '('
+            i += 1
+        else:
+            out = Miss
+        if out is Miss:
+            out = Empty
+        else:
+            out = Miss
+        active1 = out is not Miss
+    if active1:
+        out, i = keyname(stream, i, context)
+        active1 = out is not Miss
+    if not active1:
+        i = savei1
+    return out, i
+
+
+def anon_seq5(stream, i, context):
+    # <Seq anon_seq5>
+    savei1 = i
+    active1 = True
+    if active1 and i < len(stream) and stream[i] not in '\t ':
+        active1 = False
+        out = Miss
     if active1:
         # <Plus>
         savei2 = i
@@ -1831,31 +1864,6 @@ def anon_seq4(stream, i, context):
     return out, i
 
 
-def anon_seq5(stream, i, context):
-    # <Seq anon_seq5>
-    savei1 = i
-    active1 = True
-    if active1:
-        # <Not>
-        # <String '('>
-        if stream.startswith('(', i):
-            out = '('
-            i += 1
-        else:
-            out = Miss
-        if out is Miss:
-            out = Empty
-        else:
-            out = Miss
-        active1 = out is not Miss
-    if active1:
-        out, i = keyname(stream, i, context)
-        active1 = out is not Miss
-    if not active1:
-        i = savei1
-    return out, i
-
-
 def keys(stream, i, context):
     # <Seq keys>
     savei1 = i
@@ -1878,7 +1886,11 @@ def keys(stream, i, context):
         # <Or>
         targets = None_fm9[None]
         if i < len(stream):
-            targets = None_fm9.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft9[code1]
+            else:
+                targets = None_fm9.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -2062,7 +2074,11 @@ def wordstart(stream, i, context):
     # <Or wordstart>
     targets = wordstart_fm1[None]
     if i < len(stream):
-        targets = wordstart_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = wordstart_ft1[code1]
+        else:
+            targets = wordstart_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2117,7 +2133,11 @@ def wordend(stream, i, context):
     # <Or wordend>
     targets = wordend_fm1[None]
     if i < len(stream):
-        targets = wordend_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = wordend_ft1[code1]
+        else:
+            targets = wordend_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2182,7 +2202,11 @@ def strong(stream, i, context):
             # <Or>
             targets = None_fm10[None]
             if i < len(stream):
-                targets = None_fm10.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft10[code1]
+                else:
+                    targets = None_fm10.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -2311,7 +2335,11 @@ def glyph(stream, i, context):
             # <Or>
             targets = None_fm11[None]
             if i < len(stream):
-                targets = None_fm11.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft11[code1]
+                else:
+                    targets = None_fm11.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -2374,6 +2402,9 @@ def xname(stream, i, context):
             out = Empty
         i = savei2
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz':
+        active1 = False
+        out = Miss
     if active1:
         # <Take>
         savei3 = i
@@ -2382,7 +2413,6 @@ def xname(stream, i, context):
         if match1:
             out = match1.group(0)
             i = match1.end()
-            context.update(match1.groupdict())
         else:
             out = Miss
         if out is not Miss:
@@ -2402,7 +2432,7 @@ def attr(stream, i, context):
     if active1:
         out, i = ws(stream, i, context)
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -2444,7 +2474,7 @@ def attr(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip7.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -2534,7 +2564,7 @@ def anon_seq6(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -2591,7 +2621,7 @@ def ctag(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -2638,7 +2668,7 @@ def anon_seq7(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -2668,7 +2698,7 @@ def anon_seq7(stream, i, context):
             out = Miss
         active1 = out is not Miss
     if active1:
-        # <IfCode _stream.find("</%s>" % _context['n'], _i) >= 0>
+        # <IfCode stream.find("</%s>" % context['n'], i) >= 0>
         out = Empty if (stream.find("</%s>" % context['n'], i) >= 0) else Miss
         active1 = out is not Miss
     if active1:
@@ -2691,7 +2721,7 @@ def anon_seq7(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -2707,7 +2737,7 @@ def anon_seq7(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip8.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -2735,7 +2765,11 @@ def xml(stream, i, context):
     # <Or xml>
     targets = xml_fm1[None]
     if i < len(stream):
-        targets = xml_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = xml_ft1[code1]
+        else:
+            targets = xml_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -2818,7 +2852,11 @@ def var(stream, i, context):
             # <Or>
             targets = None_fm12[None]
             if i < len(stream):
-                targets = None_fm12.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft12[code1]
+                else:
+                    targets = None_fm12.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -3040,7 +3078,11 @@ def link(stream, i, context):
     # <Or link>
     targets = link_fm1[None]
     if i < len(stream):
-        targets = link_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = link_ft1[code1]
+        else:
+            targets = link_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -3081,7 +3123,6 @@ def space(stream, i, context):
     if match1:
         out = match1.group(0)
         i = match1.end()
-        context.update(match1.groupdict())
     else:
         out = Miss
     return out, i
@@ -3091,6 +3132,9 @@ def uisep(stream, i, context):
     # <Seq uisep>
     savei1 = i
     active1 = True
+    if active1 and i < len(stream) and stream[i] not in '\t\n\r ':
+        active1 = False
+        out = Miss
     if active1:
         # <Plus>
         savei2 = i
@@ -3126,6 +3170,9 @@ def uisep(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in '\t\n\r ':
+        active1 = False
+        out = Miss
     if active1:
         # <Plus>
         savei3 = i
@@ -3210,7 +3257,11 @@ def ui(stream, i, context):
             # <Or>
             targets = None_fm13[None]
             if i < len(stream):
-                targets = None_fm13.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft13[code1]
+                else:
+                    targets = None_fm13.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -3231,7 +3282,11 @@ def ui(stream, i, context):
             # <Or>
             targets = None_fm14[None]
             if i < len(stream):
-                targets = None_fm14.get(stream[i], targets)
+                code2 = _ord(stream[i])
+                if code2 < 256:
+                    targets = None_ft14[code2]
+                else:
+                    targets = None_fm14.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -3374,7 +3429,11 @@ def em(stream, i, context):
             # <Or>
             targets = None_fm15[None]
             if i < len(stream):
-                targets = None_fm15.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft15[code1]
+                else:
+                    targets = None_fm15.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -3501,7 +3560,11 @@ def code(stream, i, context):
             # <Or>
             targets = None_fm16[None]
             if i < len(stream):
-                targets = None_fm16.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft16[code1]
+                else:
+                    targets = None_fm16.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -3566,7 +3629,11 @@ def spans(stream, i, context):
     # <Or spans>
     targets = spans_fm1[None]
     if i < len(stream):
-        targets = spans_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = spans_ft1[code1]
+        else:
+            targets = spans_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -3584,7 +3651,11 @@ def inline(stream, i, context):
     # <Or inline>
     targets = inline_fm1[None]
     if i < len(stream):
-        targets = inline_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = inline_ft1[code1]
+        else:
+            targets = inline_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -3789,7 +3860,7 @@ def apos(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'sltnNTSL':
+    if active1 and i < len(stream) and stream[i] not in 'SsntNLTl':
         active1 = False
         out = Miss
     if active1:
@@ -3798,7 +3869,11 @@ def apos(stream, i, context):
         # <Or>
         targets = None_fm17[None]
         if i < len(stream):
-            targets = None_fm17.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft17[code1]
+            else:
+                targets = None_fm17.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -3918,7 +3993,11 @@ def symbols(stream, i, context):
         # <Or>
         targets = None_fm18[None]
         if i < len(stream):
-            targets = None_fm18.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft18[code1]
+            else:
+                targets = None_fm18.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -4009,7 +4088,11 @@ def dashes(stream, i, context):
         # <Or>
         targets = None_fm19[None]
         if i < len(stream):
-            targets = None_fm19.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft19[code1]
+            else:
+                targets = None_fm19.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -4183,7 +4266,7 @@ def arrows(stream, i, context):
     savectx1 = context
     context = context.push()
     active1 = True
-    if active1 and i < len(stream) and stream[i] not in '=-<':
+    if active1 and i < len(stream) and stream[i] not in '<=-':
         active1 = False
         out = Miss
     if active1:
@@ -4191,7 +4274,11 @@ def arrows(stream, i, context):
         # <Or>
         targets = None_fm20[None]
         if i < len(stream):
-            targets = None_fm20.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft20[code1]
+            else:
+                targets = None_fm20.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -4205,11 +4292,18 @@ def arrows(stream, i, context):
         if out is not Miss:
             context['c'] = out
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in ' \n\t\r\x03':
+        active1 = False
+        out = Miss
     if active1:
         # <Or>
         targets = None_fm21[None]
         if i < len(stream):
-            targets = None_fm21.get(stream[i], targets)
+            code2 = _ord(stream[i])
+            if code2 < 256:
+                targets = None_ft21[code2]
+            else:
+                targets = None_fm21.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -4282,13 +4376,20 @@ def mult(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
+    if active1 and i < len(stream) and stream[i] not in ' 7\t9\x0320845613':
+        active1 = False
+        out = Miss
     if active1:
         # <Peek>
         savei3 = i
         # <Or>
         targets = None_fm22[None]
         if i < len(stream):
-            targets = None_fm22.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft22[code1]
+            else:
+                targets = None_fm22.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -4316,7 +4417,11 @@ def typog(stream, i, context):
     # <Or typog>
     targets = typog_fm1[None]
     if i < len(stream):
-        targets = typog_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = typog_ft1[code1]
+        else:
+            targets = typog_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -4334,7 +4439,11 @@ def stylespans(stream, i, context):
     # <Or stylespans>
     targets = stylespans_fm1[None]
     if i < len(stream):
-        targets = stylespans_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = stylespans_ft1[code1]
+        else:
+            targets = stylespans_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -4729,7 +4838,11 @@ def title(stream, i, context):
             # <Or>
             targets = None_fm23[None]
             if i < len(stream):
-                targets = None_fm23.get(stream[i], targets)
+                code1 = _ord(stream[i])
+                if code1 < 256:
+                    targets = None_ft23[code1]
+                else:
+                    targets = None_fm23.get(stream[i], targets)
             if targets:
                 for rule in targets:
                     out, new = rule(stream, i, context)
@@ -4844,7 +4957,11 @@ def title(stream, i, context):
         # <Or>
         targets = None_fm24[None]
         if i < len(stream):
-            targets = None_fm24.get(stream[i], targets)
+            code2 = _ord(stream[i])
+            if code2 < 256:
+                targets = None_ft24[code2]
+            else:
+                targets = None_fm24.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -5241,7 +5358,11 @@ def heading(stream, i, context):
         # <Or>
         targets = None_fm25[None]
         if i < len(stream):
-            targets = None_fm25.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft25[code1]
+            else:
+                targets = None_fm25.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -5307,7 +5428,11 @@ def summary(stream, i, context):
                 # <Or>
                 targets = None_fm26[None]
                 if i < len(stream):
-                    targets = None_fm26.get(stream[i], targets)
+                    code1 = _ord(stream[i])
+                    if code1 < 256:
+                        targets = None_ft26[code1]
+                    else:
+                        targets = None_fm26.get(stream[i], targets)
                 if targets:
                     for rule in targets:
                         out, new = rule(stream, i, context)
@@ -5324,7 +5449,7 @@ def summary(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -5340,7 +5465,7 @@ def summary(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip9.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -5640,7 +5765,11 @@ def anon_seq17(stream, i, context):
         # <Or>
         targets = None_fm27[None]
         if i < len(stream):
-            targets = None_fm27.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft27[code1]
+            else:
+                targets = None_fm27.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -5736,7 +5865,11 @@ def bullet_ending(stream, i, context):
     # <Or bullet_ending>
     targets = bullet_ending_fm1[None]
     if i < len(stream):
-        targets = bullet_ending_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = bullet_ending_ft1[code1]
+        else:
+            targets = bullet_ending_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -5771,7 +5904,7 @@ def bullet_body(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -5787,7 +5920,7 @@ def bullet_body(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip9.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -5822,7 +5955,7 @@ def bullet(stream, i, context):
         if out is not Miss:
             context['indent'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in '-*':
+    if active1 and i < len(stream) and stream[i] not in '*-':
         active1 = False
         out = Miss
     if active1:
@@ -5971,7 +6104,7 @@ def item(stream, i, context):
                 break
             elif out is not Miss:
                 break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -6088,7 +6221,11 @@ def note(stream, i, context):
         # <Or>
         targets = None_fm28[None]
         if i < len(stream):
-            targets = None_fm28.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft28[code1]
+            else:
+                targets = None_fm28.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -6228,7 +6365,7 @@ def property(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip10.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -6289,7 +6426,7 @@ def property(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            i += 1
+            i = _skip5.match(stream, i + 1).end()
         if i > lasti:
             output3.append(stream[lasti:i])
         out = output3
@@ -6350,7 +6487,6 @@ def property(stream, i, context):
                 if match1:
                     out = match1.group(0)
                     i = match1.end()
-                    context.update(match1.groupdict())
                 else:
                     out = Miss
                 if out is not Miss:
@@ -6422,7 +6558,7 @@ def pxml(stream, i, context):
         if out is not Miss:
             context['indent'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -6463,7 +6599,7 @@ def pxml(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -6479,7 +6615,7 @@ def pxml(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip9.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
@@ -6544,7 +6680,7 @@ def section(stream, i, context):
         else:
             out = Miss
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in 'FDoMXTSId_KAUsbjr4OmavRY0Bz16PkZnpgNy2eG53HQCWhiqx78ltEJVw9ucLf':
+    if active1 and i < len(stream) and stream[i] not in 'SAKQUrz9MYLB5a8voWj_C7fGxgNk04DRpOdyJXnEHb2Fm61ITZ3qushticVewlP':
         active1 = False
         out = Miss
     if active1:
@@ -6619,7 +6755,11 @@ def section(stream, i, context):
         # <Or>
         targets = None_fm29[None]
         if i < len(stream):
-            targets = None_fm29.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft29[code1]
+            else:
+                targets = None_fm29.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -6868,7 +7008,11 @@ def para_ending(stream, i, context):
     # <Or para_ending>
     targets = para_ending_fm1[None]
     if i < len(stream):
-        targets = para_ending_fm1.get(stream[i], targets)
+        code1 = _ord(stream[i])
+        if code1 < 256:
+            targets = para_ending_ft1[code1]
+        else:
+            targets = para_ending_fm1.get(stream[i], targets)
     if targets:
         for rule in targets:
             out, new = rule(stream, i, context)
@@ -6900,7 +7044,7 @@ def para(stream, i, context):
         output1 = []
         lasti = i
         while i < len(stream):
-            if i == len(stream) or stream[i] in '\n:|\x03':
+            if i == len(stream) or stream[i] in '\x03\n:|':
                 savei2 = i
                 out, i = para_ending(stream, i, context)
                 i = savei2
@@ -6909,7 +7053,7 @@ def para(stream, i, context):
                     break
                 elif out is not Miss:
                     break
-            if i == len(stream) or stream[i] in ' x=&<.[*/`%+"_(\'-':
+            if i == len(stream) or stream[i] in ' \'</x%+(-.=`*"&_[':
                 savei2 = i
                 out, i = spans(stream, i, context)
                 if out is Miss:
@@ -6925,14 +7069,14 @@ def para(stream, i, context):
                     output1.append(out)
                     lasti = i
             else:
-                i += 1
+                i = _skip11.match(stream, i + 1).end()
         if i > lasti:
             output1.append(stream[lasti:i])
         out = output1
         if out is not Miss:
             context['tx'] = out
         active1 = out is not Miss
-    if active1 and i < len(stream) and stream[i] not in '\n:|\x03':
+    if active1 and i < len(stream) and stream[i] not in '\x03\n:|':
         active1 = False
         out = Miss
     if active1:
@@ -6963,7 +7107,11 @@ def blocks(stream, i, context):
         # <Or>
         targets = None_fm30[None]
         if i < len(stream):
-            targets = None_fm30.get(stream[i], targets)
+            code1 = _ord(stream[i])
+            if code1 < 256:
+                targets = None_ft30[code1]
+            else:
+                targets = None_fm30.get(stream[i], targets)
         if targets:
             for rule in targets:
                 out, new = rule(stream, i, context)
@@ -7045,28 +7193,36 @@ vspace_fm1 = {
     '\n': (anon_among1,),
     '\r': (anon_string1, anon_among1,),
 }
+vspace_ft1 = rules.firstmap_table(vspace_fm1)
 None_fm1 = {
-    None: (hspace,),
-    '\n': (hspace, vspace,),
-    '\r': (hspace, vspace,),
+    None: (),
+    '\t': (hspace,),
+    '\n': (vspace,),
+    '\r': (vspace,),
+    ' ': (hspace,),
 }
+None_ft1 = rules.firstmap_table(None_fm1)
 _charset2 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_0123456789'
 _regex3 = re.compile('[A-Za-z_0-9]+')
 _do2 = rules.compile_expr('None')
 None_fm2 = {
     None: (anon_seq1, anon_do1,),
 }
+None_ft2 = rules.firstmap_table(None_fm2)
+_skip1 = re.compile('[^\\}]*')
 None_fm3 = {
     None: (),
     '\x03': (lineend, streamend,),
     '\n': (lineend,),
 }
+None_ft3 = rules.firstmap_table(None_fm3)
 _do3 = rules.compile_expr('w.block("pre", indent, tx, lang=lang)')
 _do4 = rules.compile_expr('len(ns) + len(space)')
 _charset3 = '-*'
 _do5 = rules.compile_expr('len(bs) + len(space)')
 _do6 = rules.compile_expr('n[0] if n else None')
 _if1 = rules.compile_expr('n')
+_skip2 = re.compile('[^:\\\\]*')
 _charset4 = '0123456789ABCDEFabcdef'
 _do7 = rules.compile_expr('chr(int(x, 16))')
 None_fm4 = {
@@ -7078,11 +7234,14 @@ None_fm4 = {
     't': (tab, any_,),
     'x': (hx, any_,),
 }
+None_ft4 = rules.firstmap_table(None_fm4)
+_skip3 = re.compile('[^"\\\\]*')
 _do8 = rules.compile_expr("''.join(s)")
 None_fm5 = {
     None: (anon_mixed1,),
     '"': (dqstring, anon_mixed1,),
 }
+None_ft5 = rules.firstmap_table(None_fm5)
 _do9 = rules.compile_expr('(n, ext[0] if ext else None)')
 None_fm6 = {
     None: (),
@@ -7095,24 +7254,27 @@ None_fm6 = {
     '{': (anon_string4,),
     '~': (anon_string5,),
 }
+None_ft6 = rules.firstmap_table(None_fm6)
 break__fm1 = {
     None: (),
     '\x03': (blockbreak, streamend,),
     '\n': (blockbreak, anon_seq2,),
 }
+break__ft1 = rules.firstmap_table(break__fm1)
+_skip4 = re.compile('[^\\-]*')
+_skip5 = re.compile('[^\x03\\\n]*')
 comment_fm1 = {
     None: (),
     ' ': (anon_seq3, line_comment,),
     '/': (anon_seq3, line_comment,),
     '<': (anon_seq3,),
 }
+comment_ft1 = rules.firstmap_table(comment_fm1)
 _do10 = rules.compile_expr('w.span("env", [], name=n)')
-_regex4 = re.compile('[A-Za-z]+')
-_do11 = rules.compile_expr('util.decode_named_entity(n)')
 _charset5 = '0123456789'
-_do12 = rules.compile_expr('int(d)')
+_do11 = rules.compile_expr('int(d)')
 _charset6 = '0123456789abcdefABCDEF'
-_do13 = rules.compile_expr('int(h, 16)')
+_do12 = rules.compile_expr('int(h, 16)')
 charnum_fm1 = {
     None: (),
     '0': (chardec,),
@@ -7127,52 +7289,121 @@ charnum_fm1 = {
     '9': (chardec,),
     'x': (charhex,),
 }
-_do14 = rules.compile_expr('util.unichr(num)')
+charnum_ft1 = rules.firstmap_table(charnum_fm1)
+_do13 = rules.compile_expr('util.unichr(num)')
+_regex4 = re.compile('[A-Za-z]+')
+_do14 = rules.compile_expr('util.decode_named_entity(n)')
 None_fm7 = {
-    None: (named_entity,),
-    '#': (num_entity, named_entity,),
+    None: (),
+    '#': (num_entity,),
+    'A': (named_entity,),
+    'B': (named_entity,),
+    'C': (named_entity,),
+    'D': (named_entity,),
+    'E': (named_entity,),
+    'F': (named_entity,),
+    'G': (named_entity,),
+    'H': (named_entity,),
+    'I': (named_entity,),
+    'J': (named_entity,),
+    'K': (named_entity,),
+    'L': (named_entity,),
+    'M': (named_entity,),
+    'N': (named_entity,),
+    'O': (named_entity,),
+    'P': (named_entity,),
+    'Q': (named_entity,),
+    'R': (named_entity,),
+    'S': (named_entity,),
+    'T': (named_entity,),
+    'U': (named_entity,),
+    'V': (named_entity,),
+    'W': (named_entity,),
+    'X': (named_entity,),
+    'Y': (named_entity,),
+    'Z': (named_entity,),
+    'a': (named_entity,),
+    'b': (named_entity,),
+    'c': (named_entity,),
+    'd': (named_entity,),
+    'e': (named_entity,),
+    'f': (named_entity,),
+    'g': (named_entity,),
+    'h': (named_entity,),
+    'i': (named_entity,),
+    'j': (named_entity,),
+    'k': (named_entity,),
+    'l': (named_entity,),
+    'm': (named_entity,),
+    'n': (named_entity,),
+    'o': (named_entity,),
+    'p': (named_entity,),
+    'q': (named_entity,),
+    'r': (named_entity,),
+    's': (named_entity,),
+    't': (named_entity,),
+    'u': (named_entity,),
+    'v': (named_entity,),
+    'w': (named_entity,),
+    'x': (named_entity,),
+    'y': (named_entity,),
+    'z': (named_entity,),
 }
+None_ft7 = rules.firstmap_table(None_fm7)
 _do15 = rules.compile_expr('char')
+_skip6 = re.compile('[^\\ \\)]*')
 None_fm8 = {
     None: (),
     ' ': (anon_string6,),
     ')': (anon_string7,),
 }
+None_ft8 = rules.firstmap_table(None_fm8)
 None_fm9 = {
-    None: (anon_seq4, anon_seq5,),
+    None: (anon_seq4,),
+    '\t': (anon_seq5, anon_seq4,),
+    ' ': (anon_seq5, anon_seq4,),
 }
+None_ft9 = rules.firstmap_table(None_fm9)
 _do16 = rules.compile_expr('w.span("keys", None, keys=[k] + kk)')
 wordstart_fm1 = {
     None: (streamstart, anon_not1,),
 }
+wordstart_ft1 = rules.firstmap_table(wordstart_fm1)
 None_fm10 = {
     None: (anon_failif3,),
     '*': (anon_string8, anon_failif3,),
 }
+None_ft10 = rules.firstmap_table(None_fm10)
 wordend_fm1 = {
     None: (anon_not2,),
     '\x03': (streamend, anon_not2,),
 }
+wordend_ft1 = rules.firstmap_table(wordend_fm1)
 _do17 = rules.compile_expr('w.span("strong", tx)')
 None_fm11 = {
     None: (anon_failif4,),
     ')': (anon_string9, anon_failif4,),
 }
+None_ft11 = rules.firstmap_table(None_fm11)
 _do18 = rules.compile_expr('w.span("link", None, scheme="Glyph", value=v)')
 _regex5 = re.compile('[-A-Za-z_0-9]+')
+_skip7 = re.compile('[^"]*')
 _do19 = rules.compile_expr('(k, v)')
 _do20 = rules.compile_expr('dict(attrs)')
 _do21 = rules.compile_expr('w.span("xml", \'\', tag=n, attrs=alist)')
+_skip8 = re.compile('[^\\ "%\\&\'\\(\\*\\+\\-\\./<=\\[_`x]*')
 _if2 = rules.compile_expr('n == name')
 _do22 = rules.compile_expr('w.span("xml", tx, tag=n, attrs=alist)')
 xml_fm1 = {
     None: (),
     '<': (anon_seq6, anon_seq7,),
 }
+xml_ft1 = rules.firstmap_table(xml_fm1)
 None_fm12 = {
     None: (anon_failif5,),
     '>': (anon_string10, anon_failif5,),
 }
+None_ft12 = rules.firstmap_table(None_fm12)
 _do23 = rules.compile_expr('w.span("var", tx)')
 _regex6 = re.compile('((?P<name>[A-Z][-_.A-Za-z0-9]*):)?(?P<value>[^\\]\\n|]*)')
 _do24 = rules.compile_expr('w.span("link", \'\', scheme=name, value=value)')
@@ -7181,24 +7412,33 @@ link_fm1 = {
     None: (),
     '[': (anonlink, textlink,),
 }
+link_ft1 = rules.firstmap_table(link_fm1)
 None_fm13 = {
     None: (anon_failif6,),
     '_': (anon_string11, anon_failif6,),
 }
+None_ft13 = rules.firstmap_table(None_fm13)
 _regex7 = re.compile('[ \\t\\r\\n]')
 None_fm14 = {
-    None: (uisep, inline,),
+    None: (inline,),
+    '\t': (uisep, inline,),
+    '\n': (uisep, inline,),
+    '\r': (uisep, inline,),
+    ' ': (uisep, inline,),
 }
+None_ft14 = rules.firstmap_table(None_fm14)
 _do26 = rules.compile_expr('w.span("ui", tx)')
 None_fm15 = {
     None: (anon_failif7,),
     '_': (anon_string12, anon_failif7,),
 }
+None_ft15 = rules.firstmap_table(None_fm15)
 _do27 = rules.compile_expr('w.span("em", tx)')
 None_fm16 = {
     None: (anon_failif8,),
     '`': (anon_string13, anon_failif8,),
 }
+None_ft16 = rules.firstmap_table(None_fm16)
 _do28 = rules.compile_expr('w.span("code", tx)')
 spans_fm1 = {
     None: (),
@@ -7220,6 +7460,7 @@ spans_fm1 = {
     '`': (code,),
     'x': (typog,),
 }
+spans_ft1 = rules.firstmap_table(spans_fm1)
 inline_fm1 = {
     None: (anon_failif2,),
     ' ': (spans, anon_failif2,),
@@ -7240,6 +7481,7 @@ inline_fm1 = {
     '`': (spans, anon_failif2,),
     'x': (spans, anon_failif2,),
 }
+inline_ft1 = rules.firstmap_table(inline_fm1)
 _do29 = rules.compile_expr('w.span("q", tx)')
 _if3 = rules.compile_expr('c.isalpha()')
 _do30 = rules.compile_expr('c')
@@ -7256,15 +7498,18 @@ None_fm17 = {
     's': (anon_among2,),
     't': (anon_among3,),
 }
+None_ft17 = rules.firstmap_table(None_fm17)
 None_fm18 = {
     None: (),
     '(': (anon_seq8, anon_seq9, anon_seq10,),
 }
+None_ft18 = rules.firstmap_table(None_fm18)
 _charset9 = ' \t\r\n-;:\'",./?'
 None_fm19 = {
     None: (),
     '-': (anon_string18, anon_string19,),
 }
+None_ft19 = rules.firstmap_table(None_fm19)
 _do31 = rules.compile_expr('u"\\u2014" if len(d) == 3 else u"\\u2013"')
 None_fm20 = {
     None: (),
@@ -7272,26 +7517,34 @@ None_fm20 = {
     '<': (anon_seq12, anon_seq13, anon_seq14,),
     '=': (anon_seq15,),
 }
+None_ft20 = rules.firstmap_table(None_fm20)
 None_fm21 = {
-    None: (anon_peek1,),
-    '\x03': (lineend, anon_peek1,),
+    None: (),
+    '\x03': (lineend,),
+    '\t': (anon_peek1,),
     '\n': (lineend, anon_peek1,),
+    '\r': (anon_peek1,),
+    ' ': (anon_peek1,),
 }
+None_ft21 = rules.firstmap_table(None_fm21)
 _do32 = rules.compile_expr("' ' + c")
 None_fm22 = {
-    None: (hspace,),
-    '\x03': (hspace, r.streamend,),
-    '0': (digit, hspace,),
-    '1': (digit, hspace,),
-    '2': (digit, hspace,),
-    '3': (digit, hspace,),
-    '4': (digit, hspace,),
-    '5': (digit, hspace,),
-    '6': (digit, hspace,),
-    '7': (digit, hspace,),
-    '8': (digit, hspace,),
-    '9': (digit, hspace,),
+    None: (),
+    '\x03': (r.streamend,),
+    '\t': (hspace,),
+    ' ': (hspace,),
+    '0': (digit,),
+    '1': (digit,),
+    '2': (digit,),
+    '3': (digit,),
+    '4': (digit,),
+    '5': (digit,),
+    '6': (digit,),
+    '7': (digit,),
+    '8': (digit,),
+    '9': (digit,),
 }
+None_ft22 = rules.firstmap_table(None_fm22)
 typog_fm1 = {
     None: (),
     '"': (quotes,),
@@ -7303,6 +7556,7 @@ typog_fm1 = {
     '=': (arrows,),
     'x': (mult,),
 }
+typog_ft1 = rules.firstmap_table(typog_fm1)
 stylespans_fm1 = {
     None: (anon_failif1,),
     ' ': (comment, anon_failif1,),
@@ -7322,17 +7576,20 @@ stylespans_fm1 = {
     '`': (code, anon_failif1,),
     'x': (typog, anon_failif1,),
 }
+stylespans_ft1 = rules.firstmap_table(stylespans_fm1)
 _do33 = rules.compile_expr('w.span("supertitle", tx)')
 None_fm23 = {
     None: (anon_seq16,),
     '<': (anon_seq16, anon_string20,),
 }
+None_ft23 = rules.firstmap_table(None_fm23)
 _do34 = rules.compile_expr('w.span("subtitle", tx)')
 None_fm24 = {
     None: (),
     '\x03': (streamend,),
     '\n': (anon_string21,),
 }
+None_ft24 = rules.firstmap_table(None_fm24)
 _do35 = rules.compile_expr('w.block("title", indent, supt + tx + subt, level=0)')
 _if4 = rules.compile_expr('len(eqs) > 1')
 _if5 = rules.compile_expr('eqs == eqs2')
@@ -7342,25 +7599,30 @@ None_fm25 = {
     '\x03': (streamend,),
     '\n': (anon_string22,),
 }
+None_ft25 = rules.firstmap_table(None_fm25)
 _do37 = rules.compile_expr('w.block("h", indent, tx, level=len(eqs), id=tag[0] if tag else None, container=True)')
+_skip9 = re.compile('[^\x03\\\n\\ "%\\&\'\\(\\*\\+\\-\\./<=\\[_`x]*')
 None_fm26 = {
     None: (),
     '\x03': (break_,),
     '\n': (break_,),
     '"': (anon_string23,),
 }
+None_ft26 = rules.firstmap_table(None_fm26)
 _do38 = rules.compile_expr('w.block("summary", indent, tx)')
 _do39 = rules.compile_expr('w.block("divider", indent, None)')
 _do40 = rules.compile_expr('w.block("sep", indent, tx, level=len(line))')
 None_fm27 = {
     None: (emptylines, anon_seq18,),
 }
+None_ft27 = rules.firstmap_table(None_fm27)
 _if6 = rules.compile_expr('nextin < indent or nextin > indent + bwidth')
 bullet_ending_fm1 = {
     None: (),
     '\x03': (streamend,),
     '\n': (anon_seq17, anon_seq19, anon_seq20,),
 }
+bullet_ending_ft1 = rules.firstmap_table(bullet_ending_fm1)
 _do41 = rules.compile_expr('tx')
 _do42 = rules.compile_expr("w.block('bullet', indent, tx, blevel=indent+bwidth)")
 _do43 = rules.compile_expr("w.block('ord', indent, tx, blevel=indent+bwidth)")
@@ -7371,8 +7633,10 @@ None_fm28 = {
     'T': (anon_string25,),
     'W': (anon_string26,),
 }
+None_ft28 = rules.firstmap_table(None_fm28)
 _if7 = rules.compile_expr('nextin > indent')
 _do45 = rules.compile_expr('w.block(it.lower(), indent, tx, role="item")')
+_skip10 = re.compile('[^\\\n\\ :]*')
 _charset10 = ':\n '
 _regex8 = re.compile('[^\\n]*')
 _if8 = rules.compile_expr('line.strip()')
@@ -7384,7 +7648,9 @@ None_fm29 = {
     '\x03': (streamend,),
     '\n': (anon_string27,),
 }
+None_ft29 = rules.firstmap_table(None_fm29)
 _do49 = rules.compile_expr('w.block(n + "_section", indent, tx, level=1, role="section", id=n, container=True)')
+_skip11 = re.compile('[^\x03\\\n\\ "%\\&\'\\(\\*\\+\\-\\./:<=\\[_`x\\|]*')
 para_ending_fm1 = {
     None: (),
     '\x03': (anon_seq21,),
@@ -7392,9 +7658,11 @@ para_ending_fm1 = {
     ':': (anon_seq22,),
     '|': (anon_seq23, anon_seq24,),
 }
+para_ending_ft1 = rules.firstmap_table(para_ending_fm1)
 _do50 = rules.compile_expr('w.block(nd[0], indent, tx, role=nd[1])')
 None_fm30 = {
     None: (codeblock, title, heading, summary, divider, sep, bullet, ord, item, note, property, pxml, section, para,),
 }
+None_ft30 = rules.firstmap_table(None_fm30)
 _do51 = rules.compile_expr('[blk for blk in b if blk]')
 
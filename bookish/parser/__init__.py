@@ -35,34 +35,38 @@ class ParserError(Exception):
 class ParserContext(util.Context):
     def __init__(self, m=None, parent=None, namespace=None, debug=False):
         super(ParserContext, self).__init__(m, parent)
-        if namespace:
-            self._namespace = namespace
-        elif parent:
-            self._namespace = None
+        # Rules read these on every match, so look them up from the parent
+        # once here instead of walking up the chain of contexts every time
+        if parent:
+            self.namespace = parent.namespace
+            self.cache = parent.cache
+            self.debug = debug or parent.debug
         else:
-            self._namespace = {}
-        self._debug = debug
-        self._cache = None if parent else {}
+            self.namespace = namespace or {}
+            self.cache = {}
+            self.debug = debug
 
     def __repr__(self):
         return "<%s %r %r>" % (type(self).__name__,
                                list(self.namespace.keys()),
                                list(self.keys()))
 
-    @property
-    def namespace(self):
-        return self.parent.namespace if self.parent else self._namespace
-
-    @property
-    def debug(self):
-        return self._debug or (self.parent and self.parent.debug)
-
-    @property
-    def cache(self):
-        return self.parent.cache if self.parent else self._cache
+    def push(self, m=None):
+        # Rules push a new context for nearly every match, so fill in the new
+        # object directly instead of going through the chain of __init__s
+        parent = self if (self.map or not self.parent) else self.parent
+        c = object.__new__(type(self))
+        c.map = m
+        c.parent = parent
+        c.namespace = parent.namespace
+        c.cache = parent.cache
+        c.debug = parent.debug
+        return c
 
     def set_debug(self, v):
-        self._debug = v
+        # Note that this only affects this context and contexts pushed from it
+        # afterwards
+        self.debug = v
         return self
 
 
@@ -71,7 +75,12 @@ def condition_string(c, add_eot=True):
     if c and c[0] == u"\ufeff":
         c = c[1:]
 
-    c = c.replace("\r\n", "\n").replace("\r", "\n").replace("\t", " " * 8)
+    # Checking for the characters first is much faster than calling replace()
+    # on a large string that doesn't contain them
+    if "\r" in c:
+        c = c.replace("\r\n", "\n").replace("\r", "\n")
+    if "\t" in c:
+        c = c.replace("\t", " " * 8)
 
     if add_eot and not c.endswith("\x03"):
         c += u"\x03"
@@ -33,6 +33,8 @@ def make_namespace(imports, rules, ns=None, snap=True):
         if isinstance(rule, r.Call) and not rule.args:
             rules[name] = ns[name] = ns[rule.name]
     ctx = ParserContext(namespace=ns)
+    # Snapping replaces the children of rules, which changes their hashes, so
+    # this tracks the IDs of rules that have already been snapped
     seen = set()
     for name, rule in rules.items():
         rules[name] = ns[name] = rule.snap(ctx, seen)
@@ -97,10 +99,12 @@ blockbreak = r.blockbreak
 
 comment = r.Regex("#[^\n]*")
 hspace = r.Regex("[ \t]|#[^\n]*")
-hspaces = r.Star(hspace)
 vspace = r.Regex("\r\n|[\r\n]")
-vspaces = r.Star(vspace)
-ws = r.Star(hspace | vspace | comment)
+# These are tried between almost every token, so instead of looping over the
+# rules above, match the whole run of whitespace with a single regex
+hspaces = r.Regex("(?:[ \t]|#[^\n]*)*")
+vspaces = r.Regex("[\r\n]*")
+ws = r.Regex("(?:[ \t\r\n]|#[^\n]*)*")
 
 emptyline = hspaces + vspace
 emptylines = r.Star(emptyline)
@@ -125,17 +129,17 @@ _number = (
 )
 
 escchar = "\\" + (
-    ("n" + r.Value("\n")) ** "lf" |
-    ("r" + r.Value("\r")) ** "cr" |
-    ("t" + r.Value("\t")) ** "tab" |
-    ("b" + r.Value("\b")) ** "bs"|
-    ("f" + r.Value("\f")) ** "ff" |
+    r.Replace("n", "\n") ** "lf" |
+    r.Replace("r", "\r") ** "cr" |
+    r.Replace("t", "\t") ** "tab" |
+    r.Replace("b", "\b") ** "bs" |
+    r.Replace("f", "\f") ** "ff" |
     ("x" + r.Bind("x", r.Take(r.Repeat(hexdigit, 2, 4))) +
      r.Do("chr(int(x, 16))")) ** "hx" |
     any_
 )
 
-identifier = r.Regex("[A-Za-z_][A-Za-z_0-9]*")
+identifier = r.Regex("[A-Za-z_][A-Za-z_0-9]*").memoize()
 
 dqstring = ('"' + r.Wall("dq") + r.Bind("s", r.Mixed('"', escchar)) + '"' +
             r.Do("''.join(s)"))
@@ -204,10 +208,14 @@ arguments = (
     r.Value(())
 )
 
-call = (r.Bind("name", identifier) + r.Bind("args", arguments) +
+# The Or in atom can't work out what characters the identifier regex starts
+# with, so say so explicitly, otherwise these are tried at every position
+call = (r.FirstChars(ascii_letters + "_") +
+        r.Bind("name", identifier) + r.Bind("args", arguments) +
         r.Do("rules.Call(name, args)"))
 
-call2 = (r.Bind("mod", identifier) +
+call2 = (r.FirstChars(ascii_letters + "_") +
+         r.Bind("mod", identifier) +
          "." + r.Bind("name", identifier) +
          r.Bind("args", arguments) +
          r.Do("rules.Call2(mod, name, args)"))
@@ -287,7 +295,7 @@ import_ = (
 
 ruleend = hspaces + (vspaces | r.streamend)
 assignment = (
-    r.Not(r.streamend) +
+    r.notstreamend +
     noindent +
     r.Wall("rule") +
     r.Bind("n", identifier) +
@@ -333,7 +341,7 @@ def parse_grammar_file(filepath, pos=0, main="grammar", ns=None):
     out, _ = meta.grammar(content, pos, ParserContext())
     assert out is not r.Miss
     imps, rules = out
-    return Parser(imps, rules)
+    return Parser(imps, rules, main=main, ns=ns)
 
 
 def compile_grammar_file(inpath, outpath=None, pos=0,
@@ -7,6 +7,7 @@ fixed_imports = [
     "import re",
     "from bookish.parser import rules",
     "from bookish.parser.rules import Empty, Failure, Miss",
+    "from builtins import ord as _ord",
 ]
 
 message = """
@@ -38,6 +38,11 @@ from collections import defaultdict
 
 from bookish.compat import string_type
 
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
 
 class Miss:
     """
@@ -87,6 +92,11 @@ ws_expr = re.compile("\n( *)")
 brackets = {"(": ")", "[": "]", "{": "}"}
 # This is a set containing the close brackets from the previous dictionary
 endbrackets = frozenset(brackets.values())
+# These match the inside of a quoted Python string, up to the end quote
+pystring_bodies = {
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL),
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*", re.DOTALL),
+}
 
 
 # Helper functions
@@ -145,6 +155,21 @@ def make_firstmap(rules, pctx):
     return char2rules
 
 
+def firstmap_table(firstmap):
+    """
+    Given a dictionary as created by make_firstmap(), returns a tuple of 256
+    rule lists indexed by character code, so looking up the rules for a
+    Latin-1 character is a single subscript instead of a dictionary lookup.
+    Characters above 255 still need to be looked up in the dictionary.
+    """
+
+    table = [firstmap[None]] * 256
+    for char, rlist in firstmap.items():
+        if char is not None and ord(char) < 256:
+            table[ord(char)] = rlist
+    return tuple(table)
+
+
 def firstmap_string(builder, firstmap):
     """
     Returns a Python source code string representation of a dictionary as
@@ -167,6 +192,64 @@ def firstmap_string(builder, firstmap):
     return fmcode
 
 
+def regex_first_chars(pattern):
+    """
+    Returns a string containing the characters a match of the given regular
+    expression pattern could start with, or None if the pattern could match
+    an empty string or the characters can't easily be worked out.
+    """
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, TypeError):
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    chars = _items_first_chars(list(parsed))
+    if chars is None or len(chars) > 256:
+        return None
+    return "".join(sorted(chars))
+
+
+def _items_first_chars(items):
+    # Returns the set of possible first characters for the sequence of parsed
+    # regex items, or None if unknown or the first item can be empty
+    if not items:
+        return None
+
+    op, av = items[0]
+    if op is sre_parse.LITERAL:
+        return set([chr(av)])
+    elif op is sre_parse.IN:
+        chars = set()
+        for iop, iav in av:
+            if iop is sre_parse.LITERAL:
+                chars.add(chr(iav))
+            elif iop is sre_parse.RANGE and iav[1] - iav[0] <= 256:
+                chars.update(chr(c) for c in range(iav[0], iav[1] + 1))
+            else:
+                # Negated sets and categories such as \d
+                return None
+        return chars
+    elif op is sre_parse.SUBPATTERN:
+        _, add_flags, _, sub = av
+        if add_flags & re.IGNORECASE:
+            return None
+        return _items_first_chars(list(sub))
+    elif op is sre_parse.BRANCH:
+        chars = set()
+        for sub in av[1]:
+            subchars = _items_first_chars(list(sub))
+            if subchars is None:
+                return None
+            chars.update(subchars)
+        return chars
+    elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] > 0:
+        return _items_first_chars(list(av[2]))
+    return None
+
+
 def charset_string(chars):
     """
     Returns a Python source code representation of a set of characters.
@@ -175,6 +258,19 @@ def charset_string(chars):
     return repr("".join(chars))
 
 
+def mixed_skip_pattern(u_firsts, rule, r_firsts):
+    """
+    Returns a regular expression pattern matching a run of characters at which
+    a Mixed rule with the given first chars for its "until" and content rules
+    would try neither rule, or None if the first chars aren't known.
+    """
+
+    if not u_firsts or (rule and not r_firsts):
+        return None
+    stops = "".join(sorted(set(u_firsts) | set(r_firsts or ())))
+    return "[^%s]*" % re.escape(stops)
+
+
 def take_python_expr(stream, i, ends):
     """
     Starting at a given position, takes a string corresponding to a Python
@@ -206,18 +302,14 @@ def take_python_expr(stream, i, ends):
         elif char in endbrackets:
             return None, i
 
-        # If we're starting a string, loop through chars until we find
-        # the end quote
+        # If we're starting a string, skip to the end quote
         if char in "\"'":
-            while i < length - 1:
-                i += 1
-                inner = stream[i]
-                if inner == "\\":
-                    i += 1
-                elif inner == char:
-                    break
-
+            i = pystring_bodies[char].match(stream, i + 1, length).end()
             if i >= length:
+                # The string isn't closed, so take the rest of the stream
+                i = length - 1
+            elif stream[i] == "\\":
+                # The stream ends with a backslash inside the string
                 return None, start
 
         # Move to the next char
@@ -268,16 +360,7 @@ def row_and_col(stream, i):
     number and column number corresponding to that position.
     """
 
-    length = len(stream)
-    if stream.endswith("\x03"):
-        length -= 1
-
-    row = 1
-    nl = stream.find("\n")
-    while 0 <= nl < i < length:
-        row += 1
-        nl = stream.find("\n", nl + 1)
-
+    row = stream.count("\n", 0, i) + 1
     pnl = stream.rfind("\n", 0, i)
     col = (i - pnl) if pnl >= 0 else i + 1
 
@@ -368,6 +451,10 @@ class Rule(object):
     def rulename(self):
         return self._rulename
 
+    def memoize(self):
+        # Returns this rule wrapped in a Memo, see the caveats there
+        return Memo(self)
+
     def fixed_length(self, pctx=None):
         return self._fixedlen
 
@@ -395,7 +482,7 @@ class Rule(object):
         return False
 
     def snap(self, pctx, seen):
-        seen.add(self)
+        seen.add(id(self))
         return self
 
     def build(self, bld):
@@ -558,6 +645,29 @@ class StreamEnd(SingletonRule):
         bld.line("    out = Miss")
 
 
+class NotStreamEnd(SingletonRule):
+    """
+    Matches anywhere except at the end of the input. This is the same as
+    Not(streamend) but without the extra rule call.
+    """
+
+    _fixedlen = 0
+    inline = True
+
+    @staticmethod
+    def __call__(stream, i, context):
+        if stream.startswith("\x03", i) or i >= len(stream):
+            return Miss, None
+        else:
+            return Empty, i
+
+    def build(self, bld):
+        bld.line("if stream.startswith('\\x03', i) or i >= len(stream):")
+        bld.line("    out = Miss")
+        bld.line("else:")
+        bld.line("    out = Empty")
+
+
 class BlockBreak(SingletonRule):
     """
     Matches the end of a "block". So, the end of the input, or a newline
@@ -627,6 +737,7 @@ streamstart = StreamStart()
 linestart = LineStart()
 lineend = LineEnd()
 streamend = StreamEnd()
+notstreamend = NotStreamEnd()
 blockbreak = BlockBreak()
 
 
@@ -758,6 +869,12 @@ class Among(Rule):
 
     def __init__(self, items):
         self.items = items
+        # A regex matching a run of the characters, used by scan() to consume
+        # repeats in one call instead of one rule call per character
+        if items and isinstance(items, string_type):
+            self._run = re.compile("[%s]*" % re.escape(items)).match
+        else:
+            self._run = None
 
     def __hash__(self):
         return hash((self.__class__, self.items))
@@ -775,6 +892,24 @@ class Among(Rule):
                 return x, i + 1
         return Miss, None
 
+    def scan(self, stream, i, maxtimes=None):
+        """
+        Returns the position of the first character at or after the given
+        position that is not in this rule's set of characters, taking at most
+        "maxtimes" characters if it is given.
+        """
+
+        if self._run is None:
+            end = i
+            length = len(stream)
+            while end < length and stream[end] in self.items:
+                end += 1
+        else:
+            end = self._run(stream, i).end()
+        if maxtimes and end - i > maxtimes:
+            end = i + maxtimes
+        return end
+
     def build(self, bld):
         setstring = charset_string(self.items)
         charset = bld.add_constant("_charset", setstring)
@@ -797,7 +932,9 @@ class Regex(Rule):
     def __init__(self, pattern, groups=True):
         self.pattern = pattern
         self.expr = re.compile(pattern, re.UNICODE)
-        self.groups = groups
+        self._match = self.expr.match
+        # Only copy named groups into the context if the pattern has any
+        self.groups = groups and bool(self.expr.groupindex)
 
     def __hash__(self):
         return hash((self.__class__, self.pattern))
@@ -805,8 +942,15 @@ class Regex(Rule):
     def _repr(self):
         return repr(self.pattern)
 
+    def first_chars(self, pctx):
+        try:
+            return self._firsts
+        except AttributeError:
+            self._firsts = regex_first_chars(self.pattern)
+            return self._firsts
+
     def __call__(self, stream, i, context):
-        m = self.expr.match(stream, i)
+        m = self._match(stream, i)
         if m:
             if self.groups:
                 context.update(m.groupdict())
@@ -865,8 +1009,8 @@ class MultiRule(Rule):
         return any(r.has_binding(bld) for r in self.rules)
 
     def snap(self, pctx, seen):
-        if self not in seen:
-            seen.add(self)
+        if id(self) not in seen:
+            seen.add(id(self))
             self.rules = [r.snap(pctx, seen) for r in self.rules]
         return self
 
@@ -880,6 +1024,7 @@ class Or(MultiRule):
     def __init__(self, *rules):
         self.rules = [ensure(r) for r in rules]
         self._fmap = None
+        self._ftable = None
 
     def fixed_length(self, pctx=None):
         if any(r.fixed_length() is None for r in self.rules):
@@ -908,19 +1053,35 @@ class Or(MultiRule):
         fmap = self._fmap
         if fmap is None:
             fmap = self._fmap = make_firstmap(rules, context)
+            self._ftable = firstmap_table(fmap)
 
         if i < len(stream):
-            rules = fmap.get(stream[i], fmap[None])
+            c = ord(stream[i])
+            if c < 256:
+                rules = self._ftable[c]
+            else:
+                rules = fmap.get(stream[i], fmap[None])
         if not rules:
             return Miss, None
 
+        # Only go through accept() when debugging, it's an extra call per rule
+        debug = context.debug
+        c = None
         for rule in rules:
-            c = context.push()
-            out, newi = rule.accept(stream, i, c)
+            # A failed alternative that didn't bind anything leaves its
+            # context empty, so the next alternative can reuse it instead of
+            # pushing a new one
+            if c is None or c.map:
+                c = context.push()
+            if debug:
+                out, newi = rule.accept(stream, i, c)
+            else:
+                out, newi = rule(stream, i, c)
             if out is Miss:
                 pass
             else:
-                context.update(c.first())
+                if c.map:
+                    context.update(c.map)
                 return out, newi
 
         return Miss, None
@@ -930,9 +1091,18 @@ class Or(MultiRule):
 
         fm_name = bld.add_constant("%s_fm" % self.rulename() or "or",
                                    firstmap_string(bld, fmap))
+        ft_name = bld.add_constant("%s_ft" % self.rulename() or "or",
+                                   "rules.firstmap_table(%s)" % fm_name)
+        code = bld.generate_id("code")
         bld.line("targets = %s[None]" % fm_name)
         bld.line("if i < len(stream):")
-        bld.line("    targets = %s.get(stream[i], targets)" % fm_name)
+        # The generated module imports ord() as _ord, since a grammar can
+        # have a rule named "ord" (the wiki grammar does)
+        bld.line("    %s = _ord(stream[i])" % code)
+        bld.line("    if %s < 256:" % code)
+        bld.line("        targets = %s[%s]" % (ft_name, code))
+        bld.line("    else:")
+        bld.line("        targets = %s.get(stream[i], targets)" % fm_name)
         bld.line("if targets:")
         bld.line("    for rule in targets:")
         bld.line("        out, new = rule(stream, i, context)")
@@ -996,14 +1166,18 @@ class Seq(MultiRule):
 
     def __call__(self, stream, i, context):
         c = context.push()
+        debug = context.debug
         out = None
         wall = None
         for r in self.rules:
-            if isinstance(r, Wall):
+            if type(r) is Wall:
                 wall = r
                 continue
 
-            out, newi = r.accept(stream, i, c)
+            if debug:
+                out, newi = r.accept(stream, i, c)
+            else:
+                out, newi = r(stream, i, c)
             if out is Miss:
                 if wall:
                     raise Exception("%r did not match at %s" %
@@ -1063,7 +1237,8 @@ class Not(Rule):
         return (self.rule, )
 
     def __call__(self, stream, i, context):
-        out, _ = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, _ = accept(stream, i, context)
         if out is Miss:
             return Empty, i
         else:
@@ -1110,12 +1285,21 @@ class Repeat(Rule):
         mintimes = self.mintimes
         maxtimes = self.maxtimes
 
+        # Repeating a character set is common (e.g. digits), so consume the
+        # whole run at once instead of calling the sub-rule for every char
+        if type(rule) is Among and not context.debug:
+            end = rule.scan(stream, i, maxtimes)
+            if end - i >= mintimes:
+                return list(stream[i:end]), end
+            return Miss, None
+
         times = 0
         output = []
         slen = len(stream)
 
+        accept = rule.accept if context.debug else rule
         while i <= slen:
-            out, newi = rule.accept(stream, i, context)
+            out, newi = accept(stream, i, context)
             if out is Miss:
                 break
 
@@ -1207,7 +1391,8 @@ class Opt(Rule):
         return True
 
     def __call__(self, stream, i, context):
-        out, newi = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, newi = accept(stream, i, context)
         if out is Miss:
             return [], i
         else:
@@ -1242,7 +1427,8 @@ class Peek(Rule):
         return (self.rule, )
 
     def __call__(self, stream, i, context):
-        out, _ = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, _ = accept(stream, i, context)
         if out is Miss:
             return Miss, None
         else:
@@ -1277,7 +1463,8 @@ class LookBehind(Rule):
         assert length is not None and length > 0, (rule, length)
         start = i - length
         if start >= 0:
-            out, newi = rule.accept(stream, start, context)
+            accept = rule.accept if context.debug else rule
+            out, newi = accept(stream, start, context)
             if out is not Miss and newi == i:
                 return Empty, i
         return Miss, None
@@ -1317,7 +1504,8 @@ class FailIf(Rule):
         return (self.rule, )
 
     def __call__(self, stream, i, context):
-        out, i = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, i = accept(stream, i, context)
         if out is Miss:
             return out, None
         else:
@@ -1387,8 +1575,8 @@ class Wrapper(Rule):
         return self.rule.has_binding(bld)
 
     def snap(self, pctx, seen):
-        if self not in seen:
-            seen.add(self)
+        if id(self) not in seen:
+            seen.add(id(self))
             self.rule = self.rule.snap(pctx, seen)
         return self
 
@@ -1410,7 +1598,8 @@ class Replace(Wrapper):
         return self.output
 
     def __call__(self, stream, i, context):
-        out, i = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, i = accept(stream, i, context)
         if out is not Miss:
             out = self.output
         return out, i
@@ -1428,7 +1617,8 @@ class Take(Wrapper):
     """
 
     def __call__(self, stream, i, context):
-        out, newi = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, newi = accept(stream, i, context)
         if out is Miss:
             return Miss, None
         else:
@@ -1455,7 +1645,8 @@ class Bind(Wrapper):
         return repr(self.name)
 
     def __call__(self, stream, i, context):
-        out, i = self.rule.accept(stream, i, context)
+        accept = self.rule.accept if context.debug else self.rule
+        out, i = accept(stream, i, context)
         if out is not Miss:
             context[self.name] = out
         return out, i
@@ -1492,6 +1683,39 @@ class Extent(Wrapper):
         bld.line("    out['extent'] = (%s, i)" % starti)
 
 
+class Memo(Wrapper):
+    """
+    Remembers the output of the sub-rule at each position it's tried, so if
+    the parser backtracks and tries the sub-rule again at the same position it
+    gets the stored result instead of re-parsing (packrat parsing). The results
+    are stored in the context's cache, which is shared by all the contexts
+    pushed during a single parse.
+
+    Only wrap rules whose output doesn't depend on variables in the context,
+    and which don't bind variables the enclosing rules need, since on a cache
+    hit the sub-rule isn't run at all.
+    """
+
+    def __call__(self, stream, i, context):
+        cache = context.cache
+        key = (id(self), i)
+        try:
+            return cache[key]
+        except KeyError:
+            accept = self.rule.accept if context.debug else self.rule
+            result = cache[key] = accept(stream, i, context)
+            return result
+
+    def build(self, bld):
+        key = bld.generate_id("key")
+        bld.line("%s = (%r, i)" % (key, bld.generate_id("memo", top_level=True)))
+        bld.line("if %s in context.cache:" % key)
+        bld.line("    out, i = context.cache[%s]" % key)
+        bld.line("else:")
+        bld.call(self.rule, indent=4)
+        bld.line("    context.cache[%s] = (out, i)" % key)
+
+
 class Call(Rule):
     """
     Invokes another rule by name. This is how we implement circular/recursive
@@ -1538,15 +1762,17 @@ class Call(Rule):
             values = dict((argname, eval(argcode, {}, context))
                           for argname, argcode in zip(rule.argnames, self.args))
             context = context.push(values)
-        return rule.accept(stream, i, context)
+        if context.debug:
+            return rule.accept(stream, i, context)
+        return rule(stream, i, context)
 
     def has_binding(self, bld):
         rule = self.resolve(bld.context)
         return rule.has_binding(bld)
 
     def snap(self, pctx, seen):
-        if self not in seen:
-            seen.add(self)
+        if id(self) not in seen:
+            seen.add(id(self))
             self.rule = self.resolve(pctx).snap(pctx, seen)
         if self.args:
             return self
@@ -1637,6 +1863,9 @@ class Mixed(Rule):
         else:
             self.r_firsts = None
 
+        skip = mixed_skip_pattern(self.u_firsts, rule, self.r_firsts)
+        self._skip = re.compile(skip).match if skip else None
+
     # def __hash__(self):
     #     return hash((self.__class__, self.until, self.rule))
 
@@ -1652,6 +1881,8 @@ class Mixed(Rule):
         rule = self.rule
         r_firsts = self.r_firsts
 
+        skip = self._skip
+
         length = len(stream)
         context = context.push()
         output = []
@@ -1679,6 +1910,10 @@ class Mixed(Rule):
                         output.append(stream[lasti:i])
                     output.append(out)
                     lasti = i = newi
+            elif skip:
+                # Jump over the following characters neither rule can start
+                # with in one go
+                i = skip(stream, i + 1).end()
             else:
                 i += 1
 
@@ -1687,8 +1922,8 @@ class Mixed(Rule):
         return output, i
 
     def snap(self, pctx, seen):
-        if self not in seen:
-            seen.add(self)
+        if id(self) not in seen:
+            seen.add(id(self))
             self.until = self.until.snap(pctx, seen)
             if self.rule:
                 self.rule = self.rule.snap(pctx, seen)
@@ -1708,10 +1943,17 @@ class Mixed(Rule):
         else:
             r_firsts = None
 
+        skip = mixed_skip_pattern(u_firsts, rule, r_firsts)
+
         output = bld.generate_id("output")
         bld.line("%s = []" % output)
         bld.line("lasti = i")
         bld.line("while i < len(stream):")
+        if skip:
+            skipname = bld.add_constant("_skip", "re.compile(%r)" % skip)
+            nextchar = "i = %s.match(stream, i + 1).end()" % skipname
+        else:
+            nextchar = "i += 1"
 
         if u_firsts:
             bld.line("    if i == len(stream) or stream[i] in %r:" % u_firsts)
@@ -1751,9 +1993,9 @@ class Mixed(Rule):
                 bld.line("    lasti = i")
             if r_firsts:
                 bld.line("    else:")
-                bld.line("        i += 1")
+                bld.line("        " + nextchar)
         else:
-            bld.line("    i += 1")
+            bld.line("    " + nextchar)
 
         bld.line("if i > lasti:")
         bld.line("    %s.append(stream[lasti:i])" % output)
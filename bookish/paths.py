@@ -73,6 +73,16 @@ def norm_parts(path, out=None):
     return out
 
 
+def is_normal(path):
+    """
+    Returns True if the given path string is already normalized, that is, it
+    contains no "." or ".." names and no adjacent slashes.
+    """
+
+    # "." and ".." can only appear at the start or after a slash
+    return not (path.startswith(".") or "/." in path or "//" in path)
+
+
 def normalize(path):
     """
     Returns a *normalized* version of the given path string.
@@ -83,6 +93,9 @@ def normalize(path):
     "/a/b/d"
     """
 
+    # Most paths are already normal, so avoid splitting them into parts
+    if is_normal(path):
+        return path
     return "".join(norm_parts(path))
 
 
@@ -226,6 +239,9 @@ def basename(path):
     if not path:
         return ""
 
+    if is_normal(path):
+        return path[path.rfind("/") + 1:]
+
     last = norm_parts(path)[-1]
     if last.endswith("/"):
         return ""
@@ -4,6 +4,7 @@ import calendar
 import errno
 import os.path
 import re
+import stat
 import sys
 import zipfile
 from datetime import datetime
@@ -221,6 +222,38 @@ class Store(object):
 
         return ()
 
+    def scan_dir(self, path):
+        """
+        Returns a list of ``(name, isdir, size, last_modified)`` tuples for the
+        files under the given path. For directories, the size and modification
+        time are ``-1``. Subclasses can override this to get the information
+        for the whole directory at once instead of one file at a time.
+        """
+
+        entries = []
+        for name in self.list_dir(path):
+            p = paths.join(path, name)
+            if self.is_dir(p):
+                entries.append((name, True, -1, -1))
+            else:
+                entries.append((name, False, self.size(p),
+                                self.last_modified(p)))
+        return entries
+
+    def stat(self, path):
+        """
+        Returns an ``(isdir, size, last_modified)`` tuple for the given path, or
+        None if the path doesn't exist. For directories, the size and
+        modification time are ``-1``, as in ``scan_dir()``. Subclasses can
+        override this to get the information in one call instead of several.
+        """
+
+        if not self.exists(path):
+            return None
+        if self.is_dir(path):
+            return True, -1, -1
+        return False, self.size(path), self.last_modified(path)
+
     def last_modified(self, path):
         """
         Returns a datetime object
@@ -352,6 +385,46 @@ class FileStore(Store):
 
         return [fname for fname in fnames if not fname.startswith(".")]
 
+    def scan_dir(self, path):
+        # os.scandir() knows which entries are directories without a stat call,
+        # and needs one stat per file for the size and modification time
+        file_path = self.file_path(path)
+        try:
+            it = os.scandir(file_path)
+        except OSError:
+            e = sys.exc_info()[1]
+            if e.errno == errno.ENOENT:
+                raise ResourceNotFoundError("%s (%s)" % (path, file_path))
+            else:
+                raise
+
+        entries = []
+        with it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    entries.append((name, True, -1, -1))
+                else:
+                    st = entry.stat()
+                    entries.append((name, False, st.st_size,
+                                    datetime.utcfromtimestamp(st.st_mtime)))
+        return entries
+
+    def stat(self, path):
+        # Get everything from a single os.stat() call
+        if not path:
+            return None
+        try:
+            st = os.stat(self.file_path(path))
+        except (OSError, ValueError):
+            return None
+
+        if stat.S_ISDIR(st.st_mode):
+            return True, -1, -1
+        return False, st.st_size, datetime.utcfromtimestamp(st.st_mtime)
+
     def last_modified(self, path):
         try:
             mtime = os.path.getmtime(self.file_path(path))
@@ -803,6 +876,12 @@ class WrappingStore(Store):
     def list_dir(self, path):
         return self.child.list_dir(self._xlate_down(path))
 
+    def scan_dir(self, path):
+        return self.child.scan_dir(self._xlate_down(path))
+
+    def stat(self, path):
+        return self.child.stat(self._xlate_down(path))
+
     def last_modified(self, path):
         return self.child.last_modified(self._xlate_down(path))
 
@@ -935,6 +1014,16 @@ class MountStore(WrappingStore):
         else:
             return []
 
+    def scan_dir(self, path):
+        if self._check(path):
+            return WrappingStore.scan_dir(self, path)
+        else:
+            return []
+
+    def stat(self, path):
+        if self._check(path):
+            return WrappingStore.stat(self, path)
+
     def exists(self, path):
         return self._check(path) and self.child.exists(self._xlate_down(path))
 
@@ -990,6 +1079,14 @@ class HideStore(WrappingStore):
                 continue
             yield name
 
+    def scan_dir(self, path):
+        return [entry for entry in self.child.scan_dir(self._xlate_down(path))
+                if self._check(paths.join(path, entry[0]))]
+
+    def stat(self, path):
+        if self._check(path):
+            return self.child.stat(self._xlate_down(path))
+
     def exists(self, path):
         if not self._check(path):
             return False
@@ -1087,6 +1184,22 @@ class OverlayStore(Store):
                 seen.update(store.list_dir(path))
         return sorted(seen)
 
+    def scan_dir(self, path):
+        # Like the other methods, the first store containing a name wins
+        entries = {}
+        for store in self.stores:
+            if store.exists(path):
+                for entry in store.scan_dir(path):
+                    if entry[0] not in entries:
+                        entries[entry[0]] = entry
+        return [entries[name] for name in sorted(entries)]
+
+    def stat(self, path):
+        for store in self.stores:
+            st = store.stat(path)
+            if st is not None:
+                return st
+
     def last_modified(self, path):
         s = self.store_for(path)
         if not s:
@@ -275,16 +275,18 @@ class Context(object):
             for item in self.parent.__iter__(seen):
                 yield item
 
-    def __getitem__(self, key):
-        if self.map:
-            try:
-                return self.map[key]
-            except KeyError:
-                pass
-
-        if self.parent:
-            return self.parent[key]
+    # The lookup methods walk up the chain in a loop instead of recursing,
+    # since the parser evaluates actions with a context as the locals, so
+    # every name in an action (including globals such as module names) is
+    # looked up through the whole chain
 
+    def __getitem__(self, key):
+        c = self
+        while c is not None:
+            m = c.map
+            if m and key in m:
+                return m[key]
+            c = c.parent
         raise KeyError(key)
 
     def __setitem__(self, key, value):
@@ -293,17 +295,20 @@ class Context(object):
         self.map[key] = value
 
     def __contains__(self, key):
-        if self.map and key in self.map:
-            return True
-        if self.parent:
-            return key in self.parent
+        c = self
+        while c is not None:
+            if c.map and key in c.map:
+                return True
+            c = c.parent
         return False
 
     def get(self, key, default=None):
-        if self.map and key in self.map:
-            return self.map[key]
-        elif self.parent:
-            return self.parent.get(key, default)
+        c = self
+        while c is not None:
+            m = c.map
+            if m and key in m:
+                return m[key]
+            c = c.parent
         return default
 
     def update(self, m):
@@ -35,7 +35,7 @@ from collections import defaultdict
 
 from bookish import functions, paths, util
 from bookish.compat import StringIO
-from bookish.compat import iteritems, string_type
+from bookish.compat import string_type
 from bookish.wiki import includes, langpaths
 from bookish.util import join_text
 
@@ -1126,7 +1126,7 @@ class RunSearches(Processor):
                     cls._read_labels(pages, path, attrs["labels"], labels)
 
                 groups = block["groups"] = {}
-                for key, docnums in iteritems(r.groups()):
+                for key, docnums in r.groups().items():
                     if not key:
                         key = u"_"
                     groups[key] = searcher.group_hits(docnums)
@@ -30,6 +30,8 @@ class HoudniBaseConfig(DefaultConfig):
 
     # A system file path to a directory in which to store cache files
     CACHE_DIR = "$HOUDINI_USER_PREF_DIR/config/Help/cache"
+    # A system file path to a directory in which to store compiled templates
+    JINJA_CACHE_DIR = "$HOUDINI_USER_PREF_DIR/config/Help/jinja_cache"
 
     # A system file path to a directory in which to store the full-text index
     INDEX_DIR = "$HFS/houdini/config/Help/index"
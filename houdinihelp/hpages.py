@@ -27,9 +27,16 @@ table_to_dir = {
 
 # Setup
 
-def pages_from_config(config, cls=None, jinja_env=None, logger=None):
-    store = wikipages.store_from_config(config)
-    jinja_env = jinja_from_config(config, store, jinja_env=jinja_env)
+def pages_from_config(config, cls=None, jinja_env=None, logger=None,
+                      store=None):
+    # If the caller passes both a store and a Jinja environment, the
+    # environment is assumed to already be set up for that store (for example
+    # by flasksupport.setup()), so it is used as-is and keeps its template cache
+    if store is None:
+        store = wikipages.store_from_config(config)
+        jinja_env = jinja_from_config(config, store, jinja_env=jinja_env)
+    elif jinja_env is None:
+        jinja_env = jinja_from_config(config, store)
     logger = wikipages.logger_from_config(config, logger)
 
     cls = cls or config.get("PAGES_CLASS", HoudiniPages)
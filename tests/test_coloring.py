@@ -0,0 +1,24 @@
+from bookish import coloring
+
+
+def test_parse_hl_lines():
+    assert coloring.parse_hl_lines("[1,2,5]") == frozenset([1, 2, 5])
+    assert coloring.parse_hl_lines("1-3, 7") == frozenset([1, 2, 3, 7])
+    assert coloring.parse_hl_lines("[2-4,3]") == frozenset([2, 3, 4])
+    assert coloring.parse_hl_lines("") == frozenset()
+
+
+def test_hl_lines():
+    block = {
+        "type": "pre", "lang": "python", "text": "a = 1\nb = 2\nc = 3",
+        "attrs": {"hl_lines": "2-3"},
+    }
+    html = coloring.format_block(block)
+    assert html.count('<span class="hll">') == 2
+    assert html.startswith('<span class="n">a</span>')
+
+
+def test_no_lexer():
+    assert coloring.format_string("a < b", "nosuchlexer") == "a &lt; b"
+    assert coloring.format_string("a b", pre=True) == \
+        "<pre class='syntax '>a b</pre>"
@@ -0,0 +1,42 @@
+import flask
+
+from bookish import flaskapp
+
+
+def test_send_file_partial(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(100)))
+    closed = []
+
+    class File(object):
+        def __init__(self):
+            self.f = open(str(path), "rb")
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+        def close(self):
+            closed.append(True)
+            self.f.close()
+
+    app = flask.Flask(__name__)
+
+    @app.route("/file")
+    def file_view():
+        return flaskapp.send_fileobj_partial(File(), 100, None, True)
+
+    client = app.test_client()
+    r = client.get("/file", headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206
+    assert r.data == bytes(range(10, 20))
+    r.close()
+    assert len(closed) == 1
+
+    # The file is closed even if the response is never read
+    r = client.head("/file", headers={"Range": "bytes=10-19"})
+    r.close()
+    assert len(closed) == 2
+
+    r = client.get("/file", headers={"Range": "bytes=500-600"})
+    assert r.status_code == 416
+    assert len(closed) == 3
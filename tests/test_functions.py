@@ -0,0 +1,187 @@
+from bookish import functions
+
+
+def _doc():
+    return {"type": "root", "body": [
+        {"type": "h", "text": ["Alfa ", {"type": "strong", "text": ["bravo"]}],
+         "body": [
+             {"type": "para", "text": ["charlie"]},
+         ]},
+        {"type": "para", "attrs": {"id": "delta"}, "text": ["delta"]},
+    ]}
+
+
+def test_find_all_depth():
+    doc = _doc()
+    types = [b.get("type") for b in functions.find_all_depth(doc)]
+    assert types == ["root", "h", "strong", "para", "para"]
+
+    assert functions.first_of_type(doc, "strong")["text"] == ["bravo"]
+    assert functions.find_id(doc, "delta")["text"] == ["delta"]
+
+
+def test_block_id():
+    doc = _doc()
+    h = doc["body"][0]
+    assert functions.block_id(h) == "alfa-bravo"
+    assert functions.block_id(h) == "alfa-bravo"
+    assert functions.block_id(doc["body"][1]) == "delta"
+
+    block = {"type": "para", "attrs": {"id": "item12"}}
+    assert functions.block_id(block, strip_nums=True) == "item"
+    assert functions.block_id(block) == "item12"
+
+    empty = {"type": "para"}
+    assert functions.block_id(empty) == functions.block_id(empty)
+    # Getting the ID doesn't change the block
+    assert h == _doc()["body"][0]
+    assert empty == {"type": "para"}
+
+
+def test_split_tags():
+    assert functions.split_tags("a, b\tc\n d,,e") == ["a", "b", "c", "d", "e"]
+    assert functions.slugify(u"Café Olé!") == "cafe-ole"
+
+
+def test_find_many():
+    doc = _doc()
+    doc["body"][0]["attrs"] = {"id": "alfa", "status": "new"}
+    found = list(functions.find_many(doc, {
+        "alfa": ("id", "alfa"),
+        "delta": ("id", "delta"),
+        "new": ("status", "new"),
+    }))
+    assert [(key, b["type"]) for key, b in found] == [
+        ("alfa", "h"), ("new", "h"), ("delta", "para")
+    ]
+
+
+def test_string():
+    text = ["a", {"text": ["b", {"text": "c"}], "body": [{"text": "d"}]}, 3]
+    assert functions.string(text) == "abcd3"
+    assert functions.string(None) == ""
+    assert functions.string("x", "<", ">") == "<x>"
+    assert functions.string(["a", "b"], "[", "]") == "[[a][b]]"
+
+
+def test_random_name():
+    for _ in range(100):
+        name = functions.random_name(8)
+        assert len(name) == 8
+        assert all(c in functions.random_chars for c in name)
+
+
+def test_collapse():
+    body = [
+        {"type": "para", "text": "a"},
+        {"type": "group", "body": [
+            {"type": "para", "text": "b"},
+            {"type": "group", "body": [{"type": "para", "text": "c"}]},
+        ]},
+        {"type": "group"},
+        {"type": "section", "body": [
+            {"type": "group", "body": [{"type": "para", "text": "d"}]},
+        ]},
+    ]
+    out = functions.collapse(body, ("group",))
+    assert functions.string(out) == "abcd"
+    assert [b["type"] for b in out] == ["para", "para", "para", "section"]
+    assert out[3]["body"] == [{"type": "para", "text": "d"}]
+
+
+def test_filter_subblocks():
+    body = _doc()["body"]
+    assert functions.retain_subblocks(body, "h") == body[:1]
+    assert functions.retain_subblocks(body, "#delta") == body[1:]
+    assert functions.retain_subblocks(body, ["#alfa-bravo", "x"]) == body[:1]
+    assert functions.remove_subblocks(body, "h #delta") == []
+    assert functions.remove_subblocks(body, "para") == body[:1]
+
+
+def test_find_all_breadth():
+    doc = _doc()
+    types = [b.get("type") for b in functions.find_all_breadth(doc)]
+    assert types == ["root", "h", "para", "para"]
+
+    h = doc["body"][0]
+    types = [b.get("type") for b in functions.find_all_breadth(h, True)]
+    assert types == ["h", "strong"]
+
+
+def _toc_item(path):
+    return {"type": "subtopics_item", "attrs": {},
+            "text": [{"type": "link", "fullpath": path, "text": [path]}]}
+
+
+def test_build_toc():
+    import copy
+
+    docroot = {
+        "parents": [
+            {"basepath": "/", "attrs": {"title": "Root"}, "subtopics": {
+                "body": [{"type": "section", "body": [
+                    _toc_item("/a"), _toc_item("/b")
+                ]}]
+            }},
+            {"basepath": "/a", "attrs": {"title": "A"}, "subtopics": {
+                "body": [_toc_item("/a/c"), _toc_item("/a/d")]
+            }},
+        ],
+        "body": [{"type": "subtopics", "id": "subtopics", "body": [
+            _toc_item("/a/d/e")
+        ]}],
+    }
+    original = copy.deepcopy(docroot)
+
+    toc = functions.build_toc(docroot, "/a/d")
+    # Building the TOC must not modify the parents
+    assert docroot == original
+
+    a, b = toc["body"][0]["body"]
+    assert a["is_ancestor"] and a["attrs"]["title"] == "A"
+    assert "is_ancestor" not in b
+    c, d = a["body"]
+    assert d["is_here"] and "is_here" not in c
+    assert d["body"] == docroot["body"][0]["body"]
+
+
+def test_find_headings():
+    doc = _doc()
+    doc["body"][0]["body"].append({"type": "h", "text": ["Echo"]})
+    hs = functions.find_headings(doc, depth=2)
+    assert len(hs) == 1
+    assert hs[0]["id"] == "alfa-bravo"
+    assert hs[0]["body"] == [{"type": "h", "text": ["Echo"], "id": "echo"}]
+    # The original blocks keep their bodies
+    assert len(doc["body"][0]["body"]) == 2
+
+
+def test_text_replace():
+    text = ["a-b", {"type": "em", "text": ["c-d"]}, "e"]
+    out = functions.text_replace(text, "-", "+")
+    assert out == ["a+b", {"type": "em", "text": ["c+d"]}, "e"]
+    assert text[1]["text"] == ["c-d"]
+    assert functions.text_replace("a-b", "-", "") == "ab"
+
+
+def test_summary():
+    block = {"body": [
+        {"type": "para", "text": ["First one. Second one."]},
+        {"type": "para", "text": ["Other"]},
+    ]}
+    assert functions.subblocks_summary(block) == "First one. "
+    assert functions.subblocks_summary({"body": [
+        {"type": "summary", "text": "All. Of it."}
+    ]}) == "All. Of it."
+    assert functions.subblocks_summary({}) == ""
+
+    assert functions.first_subblock_text({"body": [{}, {"text": "x"}]}) == "x"
+    assert functions.first_subblock_text({}) is None
+
+
+def test_functions_dict():
+    import nose.tools
+
+    assert functions.functions_dict["string"] is functions.string
+    with nose.tools.assert_raises(TypeError):
+        functions.functions_dict["string"] = None
@@ -19,6 +19,105 @@ def test_context():
     assert not ("b" in c)
 
 
+def test_condition_string():
+    assert p.condition_string(u"\ufeffa\r\nb\rc\td") == \
+        "a\nb\nc        d\x03"
+    assert p.condition_string("a\x03") == "a\x03"
+    assert p.condition_string("a", add_eot=False) == "a"
+
+
+def test_memo():
+    from bookish.parser import rules
+
+    memo = rules.Regex("[a-z]+").memoize()
+    assert isinstance(memo, rules.Memo)
+    ctx = p.ParserContext()
+    assert memo("abc def", 0, ctx) == ("abc", 3)
+    assert memo("abc def", 4, ctx) == ("def", 7)
+    assert memo("abc def", 3, ctx)[0] is rules.Miss
+    assert len(ctx.cache) == 3
+
+    # A cached result is returned without running the sub-rule again
+    ctx.cache[(id(memo), 0)] = ("zzz", 3)
+    assert memo("abc def", 0, ctx.push()) == ("zzz", 3)
+
+
+def test_repeat_among():
+    from bookish.parser import rules
+
+    digits = rules.Among("0123456789")
+    ctx = p.ParserContext()
+    assert rules.Plus(digits)("123ab", 0, ctx) == (["1", "2", "3"], 3)
+    assert rules.Plus(digits)("ab", 0, ctx)[0] is rules.Miss
+    assert rules.Star(digits)("ab", 0, ctx) == ([], 0)
+    assert rules.Repeat(digits, 2, 4)("123456", 0, ctx) == (list("1234"), 4)
+    assert rules.Repeat(digits, 2, 4)("1a", 0, ctx)[0] is rules.Miss
+
+    odd = rules.Among("-]^\\")
+    assert odd.scan("^]-\\x", 0) == 4
+    assert odd.scan("^]-\\x", 1, maxtimes=2) == 3
+
+
+def test_mixed_skip():
+    from bookish.parser import bootstrap as bs, rules
+
+    ctx = p.ParserContext()
+    m = rules.Mixed('"', bs.escchar)
+    assert m._skip is not None
+    assert m('ab\\tc\\"d"e', 0, ctx) == (["ab", "\t", "c", '"', "d"], 8)
+    assert m("abc", 0, ctx) == (["abc"], 3)
+    assert rules.Mixed("/")("a\\b/", 0, ctx) == (["a\\b"], 3)
+
+
+def test_regex_first_chars():
+    from bookish.parser.rules import regex_first_chars
+
+    assert regex_first_chars("[a-c]+") == "abc"
+    assert regex_first_chars("xy|z") == "xz"
+    assert regex_first_chars("(?P<n>[ab])c") == "ab"
+    assert regex_first_chars("\r\n|[\r\n]") == "\n\r"
+    # Patterns that can match nothing, or where it's not worth working out
+    assert regex_first_chars("x*y") is None
+    assert regex_first_chars("[^x]") is None
+    assert regex_first_chars("\\d") is None
+    assert regex_first_chars("(?i)a") is None
+
+
+def test_firstmap_table():
+    from bookish.parser import rules
+
+    fmap = {None: ["x"], "a": ["a", "x"]}
+    table = rules.firstmap_table(fmap)
+    assert len(table) == 256
+    assert table[ord("a")] == ["a", "x"]
+    assert table[ord("b")] == ["x"]
+
+    r = rules.Or(rules.String("a"), rules.String("\u2013"))
+    ctx = p.ParserContext()
+    assert r("\u2013", 0, ctx) == ("\u2013", 1)
+    assert r("b", 0, ctx)[0] is rules.Miss
+
+
+def test_take_python_expr():
+    from bookish.parser.rules import take_python_expr
+
+    assert take_python_expr("a, b)", 0, ")") == ("a, b", 4)
+    assert take_python_expr("f(')') + 1)", 0, ")") == ("f(')') + 1", 10)
+    assert take_python_expr('"a\\"b")', 0, ")") == ('"a\\"b"', 6)
+    # An unclosed string takes the rest of the stream
+    assert take_python_expr("'ab)\x03", 0, ")") == ("'ab)", 4)
+    assert take_python_expr("'ab\\", 0, ")") == (None, 0)
+
+
+def test_row_and_col():
+    from bookish.parser.rules import row_and_col
+
+    assert row_and_col("ab\ncd\x03", 0) == (1, 1)
+    assert row_and_col("ab\ncd\x03", 2) == (1, 3)
+    assert row_and_col("ab\ncd\x03", 4) == (2, 2)
+    assert row_and_col("ab\ncd\x03", 5) == (2, 3)
+
+
 def test_any():
     r = p.Any
     assert r.test("a") == "a"
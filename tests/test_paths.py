@@ -25,6 +25,12 @@ def test_normalize():
     with nose.tools.assert_raises(ValueError):
         _ = paths.normalize_abs("a/b/c")
 
+    assert paths.normalize("a/b") == "a/b"
+    assert paths.normalize("./a") == "a"
+    assert paths.normalize("/a/.b/c") == "/a/.b/c"
+    assert paths.normalize("/a/..b/c") == "/a/..b/c"
+    assert paths.normalize("/a/b.txt") == "/a/b.txt"
+
     assert paths.normalize("/../a") == "/a"
     assert paths.normalize("/a/b/../../..") == "/"
 
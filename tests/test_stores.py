@@ -100,3 +100,57 @@ def test_missing():
         assert not store.exists("/a.txt")
         with nose.tools.assert_raises(stores.ResourceNotFoundError):
             store.last_modified("/a.txt")
+
+
+def test_scan_dir():
+    with TempDir() as dirpath, TempDir() as dirpath2:
+        fs = stores.FileStore(dirpath)
+        fs.make_dir("/a")
+        with fs.open("/b.txt", "wb") as f:
+            f.write(b"bravo")
+        with fs.open("/.hidden", "wb") as f:
+            f.write(b"x")
+
+        fs2 = stores.FileStore(dirpath2)
+        with fs2.open("/b.txt", "wb") as f:
+            f.write(b"other")
+        with fs2.open("/c.txt", "wb") as f:
+            f.write(b"charlie")
+        overlay = stores.OverlayStore(fs, fs2)
+
+        for store in (fs, overlay):
+            expected = []
+            for name in store.list_dir("/"):
+                path = "/" + name
+                if store.is_dir(path):
+                    expected.append((name, True, -1, -1))
+                else:
+                    expected.append((name, False, store.size(path),
+                                     store.last_modified(path)))
+            assert sorted(store.scan_dir("/")) == sorted(expected)
+
+        assert [entry[:3] for entry in overlay.scan_dir("/")] == [
+            ("a", True, -1), ("b.txt", False, 5), ("c.txt", False, 7)
+        ]
+
+
+def test_stat():
+    with TempDir() as dirpath, TempDir() as dirpath2:
+        fs = stores.FileStore(dirpath)
+        fs.make_dir("/a")
+        with fs.open("/b.txt", "wb") as f:
+            f.write(b"bravo")
+
+        fs2 = stores.FileStore(dirpath2)
+        with fs2.open("/c.txt", "wb") as f:
+            f.write(b"charlie")
+        overlay = stores.OverlayStore(fs, stores.MountStore(fs2, "/m"))
+
+        assert fs.stat("/a") == (True, -1, -1)
+        assert fs.stat("/b.txt") == (False, 5, fs.last_modified("/b.txt"))
+        assert fs.stat("/nothere") is None
+        assert fs.stat("/b.txt/x") is None
+
+        assert overlay.stat("/b.txt")[:2] == (False, 5)
+        assert overlay.stat("/m/c.txt")[:2] == (False, 7)
+        assert overlay.stat("/c.txt") is None